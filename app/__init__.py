@@ -1,6 +1,7 @@
 from flask import Flask
 from app.config import config
 from app.websockets import register_socket_events
+from app.websockets.message_queue import create_client_manager
 from app.extensions import db,socketio,cache,login_manager,migrate
 def create_app(config_name="default"):
     """ Applicaion factory function 
@@ -12,19 +13,30 @@ def create_app(config_name="default"):
     app=Flask(__name__)
     app.config.from_object(config[config_name])
     db.init_app(app)
+    from app.database import init_sqlite_pragmas
+    init_sqlite_pragmas(app)
     migrate.init_app(app,db)
-    socketio.init_app(app)
+    socketio.init_app(app,client_manager=create_client_manager(
+        app.config.get('SOCKETIO_MESSAGE_QUEUE'),
+        channel=app.config.get('SOCKETIO_CHANNEL','flask-socketio'),
+        app=app
+    ))
     register_socket_events(socketio)
     cache.init_app(app)
+    from app.middleware.query_counter import init_query_counter
+    init_query_counter(app)
     # login_manager.init_app(app)
     from app.routes import register_blueprints
     register_blueprints(app)
+    from app.commands import register_commands
+    register_commands(app)
     # from .middleware.error_handlers import register_error_handlers
     # register_error_handlers(app)
     with app.app_context():
         from app.models import (
             Team, Player, Match, Inning, Ball,
-            BattingScorecard, BowlingScorecard, Partnership
+            BattingScorecard, BowlingScorecard, Partnership, Over,
+            PlayerCareerStats
         )
         if config_name=="development":
             db.create_all()
@@ -0,0 +1,82 @@
+import click
+from app.extensions import db
+def register_commands(app):
+    """
+    Attach maintenance commands to the `flask` CLI
+    Usage: flask --app run rebuild-overs [--innings-id 12]
+           flask --app run rebuild-career-stats
+           flask --app run archive-matches
+           flask --app run create-indexes
+           flask --app run export-balls [--match-id 7] [--gzip] -o balls.ndjson
+           flask --app run export-columnar -o analytics/ [--season 2025]
+    All call db.create_all() first so databases that predate the
+    aggregate tables get them created.
+    """
+    @app.cli.command('rebuild-overs')
+    @click.option('--innings-id',type=int,default=None,help='Only rebuild this innings')
+    def rebuild_overs(innings_id):
+        """Recompute the per-over aggregates from the ball log"""
+        from app.services import BallService
+        db.create_all()
+        count=BallService.rebuild_overs(innings_id)
+        click.echo(f"Rebuilt {count} overs")
+    @app.cli.command('rebuild-career-stats')
+    def rebuild_career_stats():
+        """Recompute the player career totals from the ball log"""
+        from app.services import StatisticsService
+        db.create_all()
+        count=StatisticsService.rebuild_career_stats()
+        click.echo(f"Rebuilt career stats for {count} players")
+    @app.cli.command('archive-matches')
+    def archive_matches():
+        """Freeze every completed match that has no archive yet"""
+        from app.services import ArchiveService
+        db.create_all()
+        count=ArchiveService.archive_completed()
+        click.echo(f"Archived {count} matches")
+    @app.cli.command('create-indexes')
+    def create_indexes():
+        """Create model indexes missing from tables that predate them"""
+        db.create_all()
+        created=0
+        for table in db.metadata.sorted_tables:
+            existing={index['name'] for index in db.inspect(db.engine).get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(db.engine)
+                    created+=1
+        click.echo(f"Created {created} indexes")
+    @app.cli.command('export-balls')
+    @click.option('--match-id',type=int,default=None,help='Only this match')
+    @click.option('--team-id',type=int,default=None,help='Only matches this team played')
+    @click.option('--status',default=None,help='Only matches with this status')
+    @click.option('--date-from',type=click.DateTime(),default=None,help='Matches on or after this date')
+    @click.option('--date-to',type=click.DateTime(),default=None,help='Matches before this date')
+    @click.option('--gzip','compress',is_flag=True,help='Gzip the output')
+    @click.option('-o','--output',type=click.File('wb'),default='-',help='Output file (default stdout)')
+    def export_balls(match_id,team_id,status,date_from,date_to,compress,output):
+        """Stream the ball-by-ball data as NDJSON"""
+        from app.models import Match
+        from app.services import ExportService,MatchService
+        db.create_all()
+        matches=MatchService.query_matches(status=status,team_id=team_id,date_from=date_from,date_to=date_to)
+        if match_id:
+            matches=matches.filter(Match.id==match_id)
+        chunks=ExportService.ndjson(matches)
+        if compress:
+            chunks=ExportService.gzipped(chunks)
+        for chunk in chunks:
+            output.write(chunk)
+    @app.cli.command('export-columnar')
+    @click.option('-o','--output',required=True,type=click.Path(file_okay=False),help='Store directory')
+    @click.option('--season',type=int,default=None,help='Only this season (year)')
+    def export_columnar(output,season):
+        """Write the ball table as memory-mappable .npy columns, one partition per season"""
+        from datetime import datetime
+        from app.services import ColumnarStore,MatchService
+        db.create_all()
+        matches=None
+        if season:
+            matches=MatchService.query_matches(date_from=datetime(season,1,1),date_to=datetime(season+1,1,1))
+        for year,rows in ColumnarStore.export(output,matches).items():
+            click.echo(f"season={year}: {rows} balls")
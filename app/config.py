@@ -16,18 +16,56 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///cricket.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = False  # Set to True to see SQL queries (useful for debugging)
+    # Applied to every SQLite connection (app/database.py); {} = SQLite defaults
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,         # ms
+        'cache_size': -32768,         # KiB (32 MB)
+        'mmap_size': 268435456,       # 256 MB
+        'temp_store': 'MEMORY',
+    }
     
-    # Redis configuration (for caching - we'll use this later)
-    CACHE_TYPE = 'redis'
+    # Response cache for the read API (app/services/response_cache.py)
+    CACHE_TYPE = 'RedisCache'
     CACHE_REDIS_URL = os.environ.get('REDIS_URL') or 'redis://localhost:6379/0'
     CACHE_DEFAULT_TIMEOUT = 300  # 5 minutes
     
     # SocketIO configuration (for real-time updates)
     SOCKETIO_ASYNC_MODE = 'eventlet'
+    # Shared pub/sub for room broadcasts across workers, e.g. redis://localhost:6379/1
+    # (see app/websockets/message_queue.py). Unset = single worker.
+    SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE')
+    SOCKETIO_CHANNEL = 'cricket-live'
+    # At most one match_update frame per room every this many seconds
+    MATCH_EMIT_INTERVAL = 0.25
+    # Max age (seconds) of a cached join_match snapshot (app/websockets/snapshots.py)
+    MATCH_SNAPSHOT_TTL = 30
+    # Deliveries kept in memory per live match for join/reconnect
+    LIVE_FEED_SIZE = 120
+    # A viewer with more packets than this waiting in its socket is skipped
+    # by room frames until it drains (0 disables the check)
+    WS_CLIENT_QUEUE_LIMIT = 32
+    # Ball/lifecycle events held back for a skipped viewer before it gets a
+    # fresh match_joined snapshot instead
+    WS_CLIENT_BACKLOG_LIMIT = 60
+    # Seconds between checks of every viewer in a room for a full queue;
+    # frames in between only re-check viewers already found slow
+    WS_SLOW_SCAN_INTERVAL = 1.0
     
     # Pagination
     ITEMS_PER_PAGE = 20
     
+    # SQL accounting per request / Socket.IO event (app/middleware/query_counter.py):
+    # log a warning above this many queries, seconds of SQL, or runs of one statement
+    QUERY_STATS_ENABLED = True
+    QUERY_COUNT_WARN = 50
+    QUERY_TIME_WARN = 0.5
+    QUERY_REPEAT_WARN = 10
+    
+    # Largest offline batch accepted by POST /api/v1/balls/record/batch
+    BALL_BATCH_MAX = 120
+    
     # API rate limiting (requests per minute)
     RATELIMIT_ENABLED = True
     RATELIMIT_DEFAULT = "100/minute"
@@ -43,12 +81,24 @@ class ProductionConfig(Config):
     SQLALCHEMY_ECHO = False
     # Override with production database URL
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
+    # Connection pool per worker process (Postgres). Keep
+    # workers * (pool_size + max_overflow) below the server's max_connections
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': 10,        # s to wait for a free connection before erroring
+        'pool_recycle': 1800,      # s; drop connections before server/proxy idle timeouts do
+        'pool_pre_ping': True,     # replace connections the server closed (failover, restarts)
+        'pool_use_lifo': True,     # reuse warm connections, let the extra ones idle out
+    }
 
 class TestingConfig(Config):
     """Testing environment configuration"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'  # In-memory database for tests
-    CACHE_TYPE = 'simple'  # Don't need Redis for tests
+    CACHE_TYPE = 'SimpleCache'  # Don't need Redis for tests
+    SOCKETIO_MESSAGE_QUEUE = None  # the Socket.IO test client refuses a message queue
+    MATCH_EMIT_INTERVAL = 0  # send frames immediately, no background flush
 
 # Configuration dictionary
 config = {
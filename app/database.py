@@ -0,0 +1,56 @@
+# app/database.py
+"""
+Per-connection SQLite tuning (SQLITE_PRAGMAS), applied from the engine's
+connect event so every pooled connection gets it.
+
+With the default rollback journal a writer locks the whole file while it
+commits: page views and socket handlers reading the score wait behind
+every ball (or fail with "database is locked"). The profile in Config:
+
+    journal_mode=WAL        readers see the last commit while a write is
+                            in progress; one writer at a time, as before
+    synchronous=NORMAL      fsync at checkpoints rather than every commit
+                            (a power cut can lose the last commits, never
+                            corrupt the file)
+    busy_timeout            ms a connection waits for the write lock
+                            before raising "database is locked"
+    cache_size              page cache per connection (negative: KiB)
+    mmap_size               bytes of the file read through mmap
+    temp_store=MEMORY       sorts and temp tables off disk
+
+SQLITE_PRAGMAS = {} leaves SQLite's defaults. Other databases ignore it;
+their pool is configured with SQLALCHEMY_ENGINE_OPTIONS (ProductionConfig).
+"""
+
+from sqlalchemy import event
+
+from app.extensions import db
+
+
+def _apply_pragmas(pragmas):
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+    return on_connect
+
+
+def init_sqlite_pragmas(app):
+    """Register SQLITE_PRAGMAS on the app's SQLite engines."""
+    pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+    if not pragmas:
+        return
+    with app.app_context():
+        engines = db.engines.values()
+    for engine in engines:
+        if engine.dialect.name != 'sqlite':
+            continue
+        if engine.url.database in (None, '', ':memory:'):
+            # No file, no journal: only the cache settings apply
+            engine_pragmas = {k: v for k, v in pragmas.items() if k not in ('journal_mode', 'synchronous', 'mmap_size')}
+        else:
+            engine_pragmas = pragmas
+        event.listen(engine, 'connect', _apply_pragmas(engine_pragmas))
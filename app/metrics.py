@@ -0,0 +1,217 @@
+# app/metrics.py
+"""
+Process-local metrics registry, exposed in the Prometheus text format at
+GET /metrics (app/routes/metrics.py).
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+RECORDING
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Counters and histograms are updated inline by the code they measure:
+an uncontended lock and an add (plus a bisect for histograms), a
+microsecond, nothing allocated per observation. Everything that
+is a *state* rather than an event (room sizes, DB pool, socket queues) is
+read at scrape time by collectors, so the hot paths pay nothing for it.
+
+    DELIVERIES.inc(len(balls))
+    with BALL_RECORD_SECONDS.time(): ...
+    CACHE_REQUESTS.labels('response', 'hit').inc()
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+SCRAPING
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Values are per worker process: scrape each worker (or add a `worker`
+label in the scrape config). Rates are left to PromQL, e.g.
+  deliveries per second   rate(cricket_deliveries_total[1m])
+  response cache hits     sum by (cache) (rate(cricket_cache_requests_total{result="hit"}[5m]))
+                          / sum by (cache) (rate(cricket_cache_requests_total[5m]))
+"""
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+
+_registry = []      # metrics, in registration order
+_collectors = []    # callables returning [(name, type, help, [(labels, value), ...])]
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class _Metric:
+    type = None
+
+    def __init__(self, name: str, help: str, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children = {}
+        # Unlabelled metrics have a single child, created now so it is
+        # exported as 0 before the first observation
+        self._single = self.labels() if not self.labelnames else None
+        _registry.append(self)
+
+    def labels(self, *values):
+        """The child for these label values (cache it on hot paths)."""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._child())
+        return child
+
+    def samples(self):
+        with self._lock:
+            children = list(self._children.items())
+        for values, child in children:
+            yield from child.samples(dict(zip(self.labelnames, values)))
+
+
+class _CounterChild:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def samples(self, labels):
+        yield '_total', labels, self.value
+
+
+class Counter(_Metric):
+    type = 'counter'
+    _child = _CounterChild
+
+    def inc(self, amount=1):
+        self._single.inc(amount)
+
+
+class _HistogramChild:
+    def __init__(self, buckets):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # last slot: above the top bucket
+        self.sum = 0.0
+
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def samples(self, labels):
+        with self._lock:
+            counts, total = list(self.counts), self.sum
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            yield '_bucket', dict(labels, le=_format(bound)), cumulative
+        yield '_sum', labels, total
+        yield '_count', labels, cumulative
+
+
+class Histogram(_Metric):
+    type = 'histogram'
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        super().__init__(name, help, labelnames)
+
+    def _child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        self._single.observe(value)
+
+    def time(self):
+        return self._single.time()
+
+
+def register_collector(collect):
+    """Add a scrape-time callable returning [(name, type, help, [(labels, value), ...])]."""
+    _collectors.append(collect)
+    return collect
+
+
+# ───────────────────────────────────────────
+# EXPOSITION
+# ───────────────────────────────────────────
+
+def _format(value) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _line(name: str, labels: dict, value) -> str:
+    if labels:
+        pairs = ','.join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+        return f'{name}{{{pairs}}} {_format(value)}'
+    return f'{name} {_format(value)}'
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format (0.0.4)."""
+    lines = []
+    for metric in _registry:
+        family = metric.name + '_total' if metric.type == 'counter' else metric.name
+        lines.append(f'# HELP {family} {metric.help}')
+        lines.append(f'# TYPE {family} {metric.type}')
+        for suffix, labels, value in metric.samples():
+            lines.append(_line(metric.name + suffix, labels, value))
+    for collect in _collectors:
+        for name, kind, help, samples in collect():
+            lines.append(f'# HELP {name} {help}')
+            lines.append(f'# TYPE {name} {kind}')
+            lines.extend(_line(name, labels, value) for labels, value in samples)
+    return '\n'.join(lines) + '\n'
+
+
+# ───────────────────────────────────────────
+# HOT-PATH METRICS
+# ───────────────────────────────────────────
+
+BALL_RECORD_SECONDS = Histogram(
+    'cricket_ball_record_seconds', 'Time to record a batch of deliveries (BallService.record_balls)')
+DELIVERIES = Counter(
+    'cricket_deliveries', 'Deliveries recorded')
+EMIT_SECONDS = Histogram(
+    'cricket_emit_seconds', 'Time to send one match_update frame to a match room and its ticker line')
+CACHE_REQUESTS = Counter(
+    'cricket_cache_requests', 'Cache lookups by cache and result (hit, miss, not_modified)', ('cache', 'result'))
+DB_QUERIES = Counter(
+    'cricket_db_queries', 'SQL statements run by HTTP requests and Socket.IO events')
+DB_QUERY_SECONDS = Counter(
+    'cricket_db_query_seconds', 'Time spent in SQL by HTTP requests and Socket.IO events')
+
+
+@register_collector
+def _db_pool():
+    """Connection pool of the current app's engine (QueuePool; others report nothing)."""
+    from app.extensions import db
+    pool = db.engine.pool
+    if not hasattr(pool, 'checkedout'):
+        return []
+    return [
+        ('cricket_db_pool_size', 'gauge', 'Configured pool size', [({}, pool.size())]),
+        ('cricket_db_pool_checked_out', 'gauge', 'Connections in use', [({}, pool.checkedout())]),
+        ('cricket_db_pool_checked_in', 'gauge', 'Idle connections in the pool', [({}, pool.checkedin())]),
+        ('cricket_db_pool_overflow', 'gauge', 'Connections above pool_size (negative: not yet opened)', [({}, pool.overflow())]),
+    ]
@@ -0,0 +1,206 @@
+# app/middleware/query_counter.py
+"""
+SQL query accounting per HTTP request and per Socket.IO event.
+
+Every statement SQLAlchemy sends is counted against the request (or
+Socket.IO event: Flask-SocketIO gives each event its own request context)
+that issued it: number of queries, total time in the driver, and how often
+each statement *shape* ran. The shape (fingerprint) is the SQL with
+literals and placeholder lists collapsed, so the 20 "SELECT … FROM ball
+WHERE inning_id = ?" of a loop are one fingerprint run 20 times — the N+1
+signature.
+
+When a unit of work finishes above a threshold, a warning is logged with
+the worst repeated statement:
+
+    QUERY_COUNT_WARN    queries per request/event (0 disables)
+    QUERY_TIME_WARN     seconds of SQL per request/event
+    QUERY_REPEAT_WARN   runs of one fingerprint per request/event
+
+HTTP responses carry the totals in a Server-Timing header (db;dur=…).
+
+Tests and scripts measure any block with count_queries() and enforce a
+budget with assert_max_queries(n):
+
+    with assert_max_queries(12):
+        BallService.record_ball(...)
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from flask import current_app, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.metrics import DB_QUERIES, DB_QUERY_SECONDS
+
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LISTS = re.compile(r"\((?:\s*(?:\?|%s|:\w+)\s*,)+\s*(?:\?|%s|:\w+)\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+_listening = False
+_listen_lock = threading.Lock()
+_local = threading.local()   # explicit count_queries() blocks of this thread
+
+
+def fingerprint(statement: str) -> str:
+    """Statement with literals and IN-lists collapsed, for grouping repeats."""
+    statement = _LITERALS.sub('?', statement)
+    statement = _PLACEHOLDER_LISTS.sub('(?)', statement)
+    return _WHITESPACE.sub(' ', statement).strip()
+
+
+class QueryStats:
+    """Queries of one unit of work."""
+
+    def __init__(self, label=None):
+        self.label = label
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()   # fingerprint -> runs
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        self.statements[fingerprint(statement)] += 1
+
+    def most_repeated(self):
+        """(fingerprint, runs) of the statement run most often, or (None, 0)."""
+        if not self.statements:
+            return None, 0
+        return self.statements.most_common(1)[0]
+
+    def __repr__(self):
+        return f"<QueryStats {self.label} queries={self.count} ms={self.seconds * 1000:.1f}>"
+
+
+# ───────────────────────────────────────────
+# ENGINE HOOKS
+# ───────────────────────────────────────────
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info['query_start'].pop()
+    elapsed = time.perf_counter() - started
+    for stats in getattr(_local, 'blocks', ()):
+        stats.record(statement, elapsed)
+    stats = _request_stats()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+def _handle_error(exception_context):
+    starts = exception_context.connection.info.get('query_start') if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def _request_stats():
+    """Stats of the current request/event; None outside one or when disabled."""
+    if not has_request_context() or 'query_counter' not in current_app.extensions:
+        return None
+    current = request._get_current_object()
+    stats = getattr(current, '_query_stats', None)
+    if stats is None:
+        stats = current._query_stats = QueryStats()
+    return stats
+
+
+def _listen():
+    # Engine-class listeners see every engine, including the ones created
+    # lazily per app by Flask-SQLAlchemy; register them once per process
+    global _listening
+    with _listen_lock:
+        if not _listening:
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+            event.listen(Engine, 'handle_error', _handle_error)
+            _listening = True
+
+
+# ───────────────────────────────────────────
+# REQUEST HOOKS
+# ───────────────────────────────────────────
+
+def _label() -> str:
+    socket_event = getattr(request, 'event', None)
+    if socket_event is not None:
+        return f"socket {socket_event['message']}"
+    return f"{request.method} {request.endpoint or request.path}"
+
+
+def _server_timing(response):
+    stats = getattr(request._get_current_object(), '_query_stats', None)
+    if stats is not None:
+        response.headers.add('Server-Timing', f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"')
+    return response
+
+
+def _report(exc=None):
+    stats = getattr(request._get_current_object(), '_query_stats', None)
+    if stats is None:
+        return
+    stats.label = _label()
+    DB_QUERIES.inc(stats.count)
+    DB_QUERY_SECONDS.inc(stats.seconds)
+    config = current_app.config
+    statement, runs = stats.most_repeated()
+    problems = []
+    if config.get('QUERY_COUNT_WARN') and stats.count > config['QUERY_COUNT_WARN']:
+        problems.append(f"more than {config['QUERY_COUNT_WARN']} queries")
+    if config.get('QUERY_TIME_WARN') and stats.seconds > config['QUERY_TIME_WARN']:
+        problems.append(f"more than {config['QUERY_TIME_WARN'] * 1000:.0f} ms of SQL")
+    if config.get('QUERY_REPEAT_WARN') and runs > config['QUERY_REPEAT_WARN']:
+        problems.append(f"a statement repeated more than {config['QUERY_REPEAT_WARN']} times (N+1?)")
+    if problems:
+        current_app.logger.warning(
+            "%s: %s. %d queries, %.1f ms; most repeated (%dx): %s",
+            stats.label, ", ".join(problems), stats.count, stats.seconds * 1000, runs, statement,
+        )
+
+
+def init_query_counter(app):
+    """Count queries per request/event for this app (QUERY_STATS_ENABLED)."""
+    if not app.config.get('QUERY_STATS_ENABLED', True):
+        return
+    app.extensions['query_counter'] = True
+    _listen()
+    app.after_request(_server_timing)
+    app.teardown_request(_report)
+
+
+# ───────────────────────────────────────────
+# EXPLICIT MEASUREMENT (tests, scripts)
+# ───────────────────────────────────────────
+
+@contextmanager
+def count_queries(label=None):
+    """Count the queries this thread runs inside the block; yields QueryStats."""
+    _listen()
+    stats = QueryStats(label)
+    blocks = _local.__dict__.setdefault('blocks', [])
+    blocks.append(stats)
+    try:
+        yield stats
+    finally:
+        blocks.remove(stats)
+
+
+@contextmanager
+def assert_max_queries(budget: int, label=None):
+    """Fail with the statements run if the block runs more than `budget` queries."""
+    with count_queries(label) as stats:
+        yield stats
+    if stats.count > budget:
+        statements = "\n".join(f"  {runs}x {statement}" for statement, runs in stats.statements.most_common())
+        raise AssertionError(
+            f"{label or 'block'} ran {stats.count} queries, budget is {budget}:\n{statements}"
+        )
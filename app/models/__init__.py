@@ -10,4 +10,7 @@ from .innings import Inning
 from .scorecard import BattingScorecard,BowlingScorecard
 # from .tournament import Tournament
 from .patnership import Partnership
-__all__=['Team','Match','Tournament','Player','Ball','Commentary','Highlights','Inning','BattingScorecard','BowlingScorecard','Partnership']
\ No newline at end of file
+from .over import Over
+from .career_stats import PlayerCareerStats
+from .match_archive import MatchArchive
+__all__=['Team','Match','Tournament','Player','Ball','Commentary','Highlights','Inning','BattingScorecard','BowlingScorecard','Partnership','Over','PlayerCareerStats','MatchArchive']
\ No newline at end of file
@@ -21,7 +21,7 @@ class Ball(db.Model):
     fielder_id=db.Column(db.Integer,db.ForeignKey('player.id'),comment="Fielder involved in the dismissal (if applicable)")
     created_at=db.Column(db.DateTime,default=datetime.utcnow,nullable=False,comment="Record Creation Timestamp")
     is_legal_delivery=db.Column(db.Boolean,default=True,nullable=False,comment="Whether the delivery is legal (not a wide or no ball)")
-    __table_args__=(db.Index('idx_ball_inning_over_ball', 'inning_id','over_number','ball_number'),db.Index('idx_ball_batsman', 'batsman_id'),db.Index('idx_ball_bowler', 'bowler_id'))
+    __table_args__=(db.Index('idx_ball_inning_over_ball', 'inning_id','over_number','ball_number'),db.Index('idx_ball_batsman', 'batsman_id'),db.Index('idx_ball_bowler', 'bowler_id'),db.Index('idx_ball_dismissed', 'dismissed_player_id'))
     def __repr__(self):
         return f"<Ball Inning:{self.inning_id} Over:{self.over_number}.{self.ball_number} Runs:{self.runs_scored} Wicket:{self.is_wicket}>"
     def to_dict(self):
@@ -0,0 +1,81 @@
+from datetime import datetime
+from sqlalchemy import update,insert
+from app.extensions import db
+class PlayerCareerStats(db.Model):
+    """
+    Represent a player's career totals across all matches.
+    Materialized from the ball log: incremented by the ball path in the same
+    transaction as each delivery, and rebuilt in bulk with
+    `flask rebuild-career-stats`.
+    """
+    __tablename__='player_career_stats'
+    COUNTERS=('runs','balls_faced','dismissals','fours','sixes','wickets','runs_conceded','balls_bowled')
+    player_id=db.Column(db.Integer,db.ForeignKey('player.id',ondelete='CASCADE'),primary_key=True)
+    # Batting
+    runs=db.Column(db.Integer,default=0,nullable=False,comment="Runs scored off the bat")
+    balls_faced=db.Column(db.Integer,default=0,nullable=False,comment="Legal deliveries faced")
+    dismissals=db.Column(db.Integer,default=0,nullable=False,comment="Times dismissed")
+    fours=db.Column(db.Integer,default=0,nullable=False,comment="Number of fours")
+    sixes=db.Column(db.Integer,default=0,nullable=False,comment="Number of sixes")
+    # Bowling
+    wickets=db.Column(db.Integer,default=0,nullable=False,comment="Wickets credited to the bowler (run outs excluded)")
+    runs_conceded=db.Column(db.Integer,default=0,nullable=False,comment="Runs conceded, extras included")
+    balls_bowled=db.Column(db.Integer,default=0,nullable=False,comment="Legal deliveries bowled")
+    updated_at=db.Column(db.DateTime,default=datetime.utcnow,onupdate=datetime.utcnow,nullable=False,comment="Record Update Timestamp")
+    def __repr__(self):
+        return f"<PlayerCareerStats Player:{self.player_id} Runs:{self.runs} Wickets:{self.wickets}>"
+    def to_dict(self):
+        """Convert PlayerCareerStats object to dictionary"""
+        return {
+            'player_id':self.player_id,
+            'runs':self.runs,
+            'balls_faced':self.balls_faced,
+            'dismissals':self.dismissals,
+            'fours':self.fours,
+            'sixes':self.sixes,
+            'wickets':self.wickets,
+            'runs_conceded':self.runs_conceded,
+            'balls_bowled':self.balls_bowled,
+            'updated_at':self.updated_at.isoformat()
+        }
+    @staticmethod
+    def deltas_for(ball):
+        """Counter increments a delivery contributes, as {player_id: {counter: n}}"""
+        deltas={}
+        def add(player_id,counter,value):
+            if player_id is not None and value:
+                row=deltas.setdefault(player_id,{})
+                row[counter]=row.get(counter,0)+value
+        legal=1 if ball.is_legal_delivery else 0
+        add(ball.batsman_id,'runs',ball.runs_scored)
+        add(ball.batsman_id,'balls_faced',legal)
+        add(ball.batsman_id,'fours',1 if ball.runs_scored==4 else 0)
+        add(ball.batsman_id,'sixes',1 if ball.runs_scored==6 else 0)
+        if ball.is_wicket:
+            add(ball.dismissed_player_id,'dismissals',1)
+            add(ball.bowler_id,'wickets',1 if ball.wicket_type!='run-out' else 0)
+        add(ball.bowler_id,'runs_conceded',ball.runs_scored+ball.extra_runs)
+        add(ball.bowler_id,'balls_bowled',legal)
+        return deltas
+    @classmethod
+    def increment(cls,deltas,backfill=None):
+        """
+        Add {player_id: {counter: n}} to the stored totals inside the current transaction.
+        Uses atomic `col = col + n` updates so concurrent innings never lose increments.
+        :param backfill: callable(player_id) -> counters of the player's whole ball log.
+            A player without a row gets one from it rather than from these deltas
+            alone, so a table that was never rebuilt doesn't restart careers at the
+            current ball. The ball log already holds the deliveries being counted
+            (they are flushed first), so the deltas are not added on top.
+        """
+        now=datetime.utcnow()
+        db.session.flush()
+        for player_id,counters in deltas.items():
+            values={name:getattr(cls,name)+n for name,n in counters.items()}
+            result=db.session.execute(
+                update(cls).where(cls.player_id==player_id).values(updated_at=now,**values)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount==0:
+                row=backfill(player_id) if backfill else {name:counters.get(name,0) for name in cls.COUNTERS}
+                db.session.execute(insert(cls).values(player_id=player_id,updated_at=now,**row))
@@ -25,6 +25,7 @@ class Inning(db.Model):
     bowling_scorecards=db.relationship("BowlingScorecard",backref="inning",lazy='dynamic',cascade='all,delete-orphan')
     partnerships=db.relationship("Partnership",backref="inning",lazy='dynamic',cascade='all,delete-orphan')
     balls=db.relationship("Ball",backref="inning",lazy='dynamic',cascade='all,delete-orphan',order_by='Ball.id')
+    overs=db.relationship("Over",backref="inning",lazy='dynamic',cascade='all,delete-orphan',order_by='Over.over_number')
     __table_args__=((db.UniqueConstraint('match_id','innings_number',name='uix_match_innings_number')),db.Index('idx_inning_match_id', 'match_id','batting_team_id'))
     def __repr__(self):
         return f"<Inning {self.innings_number} of Match {self.match_id}>"
@@ -23,6 +23,8 @@ class Match(db.Model):
     winner_id=db.Column(db.Integer,db.ForeignKey('team.id'),comment="Team ID who won the match")
     win_margin=db.Column(db.String(50),comment="Margin of Victory (runs/wickets)")
     man_of_the_match=db.Column(db.Integer,db.ForeignKey('player.id'),comment="PlayerID awarded Man of the Match")
+    # Keyset pagination order of the match lists (newest first), with and without a status filter
+    __table_args__=(db.Index('idx_match_date_id','match_date','id'),db.Index('idx_match_status_date_id','status','match_date','id'))
     def __init__(self,**kwargs):
         super(Match,self).__init__(**kwargs)
         if self.team_1_id and self.team_2_id and self.team_1_id==self.team_2_id:
@@ -0,0 +1,18 @@
+from datetime import datetime
+from app.extensions import db
+class MatchArchive(db.Model):
+    """
+    Represent the frozen summary of a completed match.
+    Written once by ArchiveService.freeze when the match completes and never
+    updated: a gzip-compressed JSON document holding the match summary and
+    every innings summary (scorecards, partnerships), served as-is by the
+    read paths instead of recomputing them.
+    """
+    __tablename__='match_archive'
+    match_id=db.Column(db.Integer,db.ForeignKey('match.id',ondelete='CASCADE'),primary_key=True)
+    payload=db.Column(db.LargeBinary,nullable=False,comment="gzip-compressed JSON summary")
+    digest=db.Column(db.String(64),nullable=False,comment="sha256 of payload, used as ETag")
+    size=db.Column(db.Integer,nullable=False,comment="Uncompressed size in bytes")
+    created_at=db.Column(db.DateTime,default=datetime.utcnow,nullable=False,comment="Record Creation Timestamp")
+    def __repr__(self):
+        return f"<MatchArchive Match:{self.match_id} {len(self.payload)}/{self.size} bytes>"
@@ -0,0 +1,56 @@
+from app.extensions import db
+class Over(db.Model):
+    """
+    Represent one over of an innings.
+    Aggregate of its deliveries, updated by the ball path as each ball is
+    recorded so maidens, over summaries and per-over charts never scan balls.
+    """
+    __tablename__='over'
+    id=db.Column(db.Integer,primary_key=True)
+    inning_id=db.Column(db.Integer,db.ForeignKey('inning.id',ondelete='CASCADE'),nullable=False,comment="Inning ID")
+    over_number=db.Column(db.Integer,nullable=False,comment="Over Number (0-based, same as Ball.over_number)")
+    bowler_id=db.Column(db.Integer,db.ForeignKey('player.id'),nullable=False,comment="Bowler who started the over")
+    runs=db.Column(db.Integer,default=0,nullable=False,comment="Total runs in the over, extras included")
+    runs_conceded=db.Column(db.Integer,default=0,nullable=False,comment="Runs charged to the bowler (off the bat, wides, no balls)")
+    extras=db.Column(db.Integer,default=0,nullable=False,comment="Extra runs in the over")
+    wickets=db.Column(db.Integer,default=0,nullable=False,comment="Wickets fallen in the over")
+    legal_balls=db.Column(db.Integer,default=0,nullable=False,comment="Legal deliveries bowled (6 = over complete)")
+    is_maiden=db.Column(db.Boolean,default=False,nullable=False,comment="Completed with no runs charged to the bowler")
+    __table_args__=(db.UniqueConstraint('inning_id','over_number',name='uix_inning_over_number'),)
+    def __repr__(self):
+        return f"<Over Inning:{self.inning_id} Over:{self.over_number} Runs:{self.runs} Wickets:{self.wickets}>"
+    def to_dict(self):
+        """Convert Over object to dictionary"""
+        return {
+            'id':self.id,
+            'inning_id':self.inning_id,
+            'over_number':self.over_number,
+            'bowler_id':self.bowler_id,
+            'runs':self.runs,
+            'runs_conceded':self.runs_conceded,
+            'extras':self.extras,
+            'wickets':self.wickets,
+            'legal_balls':self.legal_balls,
+            'is_maiden':self.is_maiden,
+            'is_complete':self.is_complete
+        }
+    @property
+    def is_complete(self):
+        return (self.legal_balls or 0)>=6
+    def update_stats(self,ball):
+        """Update the over aggregate based on a new ball delivery"""
+        # Defensive defaults for rows that have not been flushed yet
+        self.runs = self.runs or 0
+        self.runs_conceded = self.runs_conceded or 0
+        self.extras = self.extras or 0
+        self.wickets = self.wickets or 0
+        self.legal_balls = self.legal_balls or 0
+        self.runs += ball.runs_scored + ball.extra_runs
+        self.extras += ball.extra_runs
+        # Byes and leg byes are not charged to the bowler
+        self.runs_conceded += ball.runs_scored + (0 if ball.is_legal_delivery else ball.extra_runs)
+        if ball.is_wicket:
+            self.wickets += 1
+        if ball.is_legal_delivery:
+            self.legal_balls += 1
+        self.is_maiden = self.is_complete and self.runs_conceded == 0
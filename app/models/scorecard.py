@@ -120,8 +120,11 @@ class BowlingScorecard(db.Model):
             'bowling_average':self.bowling_average,
             'strike_rate':self.strike_rate
         }
-    def update_stats(self,ball):
-        """Update bowling statistics based on a new ball delivery"""
+    def update_stats(self,ball,over=None):
+        """
+        Update bowling statistics based on a new ball delivery
+        over: the Over aggregate this ball belongs to, already updated with it
+        """
         if ball.bowler_id != self.player_id:
             return  # Not the bowler for this scorecard
         # Defensive defaults for nullable legacy rows
@@ -139,11 +142,9 @@ class BowlingScorecard(db.Model):
             self.balls_bowled += 1
             # Update overs bowled
             self.overs_bowled = self.balls_bowled // 6 + (self.balls_bowled % 6) / 10.0
-            if self.balls_bowled % 6 == 0:
-                # Check for maiden over
-                last_over_balls = [b for b in ball.inning.balls if b.over_number == (self.overs_bowled - 1) * 6]
-                if all(b.runs_scored == 0 and not b.is_wicket for b in last_over_balls):
-                    self.maidens += 1
+            if over is not None and over.legal_balls == 6 and over.is_maiden:
+                # This ball completed a maiden over
+                self.maidens += 1
         # Update runs conceded
         self.runs_conceded += ball.runs_scored + ball.extra_runs
         # Update extras conceded
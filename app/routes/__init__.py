@@ -1,7 +1,9 @@
 # from .main import main_bp
 from .api import api_bp
 from .pages import pages_bp
+from .metrics import metrics_bp
 def register_blueprints(app):
     # app.register_blueprint(main_bp)
     app.register_blueprint(api_bp, url_prefix='/api/v1')
-    app.register_blueprint(pages_bp)
\ No newline at end of file
+    app.register_blueprint(pages_bp)
+    app.register_blueprint(metrics_bp)
\ No newline at end of file
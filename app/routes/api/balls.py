@@ -1,9 +1,29 @@
-from flask import Blueprint,request,jsonify
+from flask import Blueprint,request,jsonify,current_app
+from app.extensions import socketio,db
+from app.models import Inning
 from app.services import BallService
-from app.validators import BallRecordSchema,InningsStartSchema
+from app.validators import BallRecordSchema,BallBatchSchema,InningsStartSchema
 from marshmallow import ValidationError
-from app.websockets.match_socket import (emit_ball_update,emit_score_update,emit_innings_complete,emit_match_status_change)
+from app.websockets.match_socket import (coalesce,emit_ball_update,emit_balls_update,emit_score_update,emit_innings_complete,emit_match_status_change,emit_ticker_line)
+from app.websockets.snapshots import MatchSnapshots
 balls_bp=Blueprint("balls",__name__)
+def _inning_summary(inning):
+    """Score header of the response (InningsState.summary() shape) from the row the route already loaded;
+    the live state of an innings that just ended is evicted and must not be rebuilt for it"""
+    return {
+        'total_runs':inning.total_runs,
+        'total_wickets':inning.total_wickets,
+        'total_overs':inning.total_overs,
+        'run_rate':inning.run_rate
+    }
+def _announce_innings_end(inning):
+    """A delivery that ended the innings (all out, overs bowled, target reached) closes it for live viewers"""
+    if inning.is_completed:
+        emit_innings_complete(socketio,inning.match_id,inning.innings_number,{
+            'runs':inning.total_runs,
+            'wickets':inning.total_wickets,
+            'overs':inning.total_overs
+        })
 @balls_bp.route('/record', methods=['POST'])
 def record_ball():
     try :
@@ -15,18 +35,82 @@ def record_ball():
                 'error':'wicket_type is required when is_wicket is true'
             }),400
         ball=BallService.record_ball(**data)
-        from app.models import Inning
-        innings=Inning.query.get(data['innings_id'])
+        inning=db.session.get(Inning,data['innings_id'])
+        with coalesce(socketio,inning.match_id):
+            emit_ball_update(socketio,inning.match_id,ball)
+            emit_score_update(socketio,inning.match_id,inning)
+            _announce_innings_end(inning)
         return jsonify({
             'success':True,
             'message':'Ball recorded successfully',
             'ball':ball.to_dict(),
-            'inning_summary':{
-                  'total_runs': innings.total_runs,
-                'total_wickets': innings.total_wickets,
-                'total_overs': innings.total_overs,
-                'run_rate': innings.run_rate
-            }
+            'inning_summary':_inning_summary(inning)
+        }),201
+    except ValidationError as e:
+        return jsonify({
+            'success':False,
+            'errors':e.messages
+        }),400
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Internal server error: {str(e)}'
+        }), 500
+@balls_bp.route('/record/batch', methods=['POST'])
+def record_balls():
+    """
+    Record deliveries replayed by an offline scorer in one transaction.
+    Body: { "innings_id": 12, "balls": [ {BallRecordSchema fields}, ... ] }
+    innings_id may be omitted from each ball.
+    """
+    try :
+        payload=request.get_json(silent=True)
+        if not isinstance(payload,dict):
+            return jsonify({
+                'success':False,
+                'error':'request body must be a JSON object'
+            }),400
+        envelope=BallBatchSchema().load(payload)
+        innings_id=envelope['innings_id']
+        deliveries=envelope['balls']
+        if not isinstance(deliveries,list) or not deliveries:
+            return jsonify({
+                'success':False,
+                'error':'balls must be a non-empty list'
+            }),400
+        max_batch=current_app.config.get('BALL_BATCH_MAX',120)
+        if len(deliveries)>max_batch:
+            return jsonify({
+                'success':False,
+                'error':f'at most {max_batch} balls can be recorded in one batch'
+            }),400
+        for delivery in deliveries:
+            if isinstance(delivery,dict) and innings_id is not None:
+                delivery.setdefault('innings_id',innings_id)
+        schema=BallRecordSchema(many=True)
+        data=schema.load(deliveries)
+        for index,delivery in enumerate(data):
+            if delivery.get('is_wicket') and not delivery.get('wicket_type'):
+                return jsonify({
+                    'success':False,
+                    'error':f'ball {index}: wicket_type is required when is_wicket is true'
+                }),400
+        innings_id=innings_id if innings_id is not None else data[0]['innings_id']
+        balls=BallService.record_balls(innings_id,data)
+        inning=db.session.get(Inning,innings_id)
+        with coalesce(socketio,inning.match_id):
+            emit_balls_update(socketio,inning.match_id,balls,inning.to_dict())
+            _announce_innings_end(inning)
+        return jsonify({
+            'success':True,
+            'message':f'{len(balls)} balls recorded successfully',
+            'balls':[ball.to_dict() for ball in balls],
+            'inning_summary':_inning_summary(inning)
         }),201
     except ValidationError as e:
         return jsonify({
@@ -50,6 +134,8 @@ def start_innings():
         schema=InningsStartSchema()
         data=schema.load(request.get_json())
         innings=InningsService.start_innings(**data)
+        MatchSnapshots.invalidate(innings.match_id)
+        emit_ticker_line(socketio,innings.match_id)
         return jsonify({
             'success':True,
             'message':'Innings started successfully',
@@ -64,6 +150,12 @@ def start_innings():
         return jsonify({'success':False,'error':str(e)}),400
 @balls_bp.route('/over/<int:innings_id>/<int:over_number>',methods=['GET'])
 def get_over_summary(innings_id,over_number):
-    summary=BallService.get_over_summary(innings_id,over_number)
+    include_balls=request.args.get('balls','true').lower()!='false'
+    summary=BallService.get_over_summary(innings_id,over_number,include_balls=include_balls)
     return jsonify({'success':True,'over_summary':summary}),200
+@balls_bp.route('/overs/<int:innings_id>',methods=['GET'])
+def get_over_progression(innings_id):
+    from app.services import StatisticsService
+    overs=StatisticsService.get_over_progression(innings_id)
+    return jsonify({'success':True,'count':len(overs),'overs':overs}),200
         
@@ -1,22 +1,86 @@
-from flask import Blueprint,request,jsonify
-from app.services import MatchService
+from flask import Blueprint,request,jsonify,current_app,stream_with_context
+from datetime import datetime,timedelta
+from app.services import MatchService,ResponseCache,StatisticsService,ArchiveService,KeysetPaginator,ExportService
+from app.services.response_cache import IMMUTABLE
 from app.validators import MatchCreateSchema,TossRecordSchema
+from app.websockets.snapshots import MatchSnapshots
 from marshmallow import ValidationError
 matches_bp=Blueprint('matches',__name__)
 @matches_bp.route('',methods=['GET'])
+@ResponseCache.cached('matches')
 def get_all_matches():
+    """
+    Newest first, one page at a time.
+    Query: status, team_id, date_from, date_to (ISO dates; date_to is
+    inclusive when it has no time), limit (<= ITEMS_PER_PAGE), cursor
+    (next_cursor of the previous page).
+    """
     from app.models import Match
-    status=request.args.get('status')
-    query=Match.query
-    if status:
-        query=query.filter_by(status=status)
-    matches=query.order_by(Match.match_date.desc()).all()
+    try:
+        query=MatchService.query_matches(
+            status=request.args.get('status'),
+            team_id=request.args.get('team_id',type=int),
+            date_from=_date_arg('date_from'),
+            date_to=_date_arg('date_to',upper=True),
+        )
+        matches,next_cursor=KeysetPaginator.page(
+            query,[Match.match_date,Match.id],
+            cursor=request.args.get('cursor'),
+            limit=request.args.get('limit',type=int),
+            descending=True,
+        )
+    except ValueError as e:
+        return jsonify({'success':False,'error':str(e)}),400
     return jsonify({
         'success':True,
         'count':len(matches),
-        'matches':[match.to_dict() for match in matches]
+        'matches':[match.to_dict() for match in matches],
+        'next_cursor':next_cursor
     }),200
+def _date_arg(name,upper=False):
+    value=request.args.get(name)
+    if not value:
+        return None
+    try:
+        parsed=datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO date or datetime")
+    if upper and len(value)==10:
+        parsed+=timedelta(days=1)  # a bare date covers the whole day
+    return parsed
+@matches_bp.route('/export/balls',methods=['GET'])
+def export_balls():
+    """
+    Ball-by-ball dump as NDJSON, streamed (see ExportService).
+    Query: match_id, or the list filters (status, team_id, date_from,
+    date_to); gzip=1 to download it gzip-compressed.
+    """
+    from app.models import Match
+    try:
+        matches=MatchService.query_matches(
+            status=request.args.get('status'),
+            team_id=request.args.get('team_id',type=int),
+            date_from=_date_arg('date_from'),
+            date_to=_date_arg('date_to',upper=True),
+        )
+    except ValueError as e:
+        return jsonify({'success':False,'error':str(e)}),400
+    match_id=request.args.get('match_id',type=int)
+    if match_id:
+        matches=matches.filter(Match.id==match_id)
+    chunks=ExportService.ndjson(matches)
+    filename='balls.ndjson'
+    if request.args.get('gzip',type=int):
+        chunks=ExportService.gzipped(chunks)
+        filename+='.gz'
+    response=current_app.response_class(
+        stream_with_context(chunks),
+        mimetype='application/gzip' if filename.endswith('.gz') else 'application/x-ndjson',
+    )
+    response.headers['Content-Disposition']=f'attachment; filename="{filename}"'
+    return response
 @matches_bp.route('/<int:match_id>',methods=['GET'])
+@ResponseCache.cached('match:{match_id}',forever=lambda data:data['match']['status']=='completed')
 def get_match(match_id):
     summary=MatchService.get_match_summary(match_id)
     if not summary:
@@ -45,12 +109,68 @@ def create_match():
             'success':False,
             'error':str(e)
         }),400
+@matches_bp.route('/<int:match_id>/scorecard',methods=['GET'])
+@ResponseCache.cached('match:{match_id}','players',forever=lambda data:data['status']=='completed')
+def get_match_scorecard(match_id):
+    from app.models import Match,Inning
+    archived=ArchiveService.load(match_id)
+    if archived:
+        return jsonify({
+            'success':True,
+            'match_id':match_id,
+            'status':archived['summary']['status'],
+            'innings':[{
+                'innings':i['innings_details'],
+                'batting':i['batting_scorecard'],
+                'bowling':i['bowling_scorecard']
+            } for i in archived['innings']]
+        }),200
+    match=Match.query.get(match_id)
+    if not match:
+        return jsonify({'success':False,'error':'Match not found'}),404
+    innings=Inning.query.filter_by(match_id=match_id).order_by(Inning.innings_number).all()
+    return jsonify({
+        'success':True,
+        'match_id':match_id,
+        'status':match.status,
+        'innings':[{
+            'innings':i.to_dict(),
+            'batting':StatisticsService.get_batting_scorecard(i.id),
+            'bowling':StatisticsService.get_bowling_scorecard(i.id)
+        } for i in innings]
+    }),200
+@matches_bp.route('/<int:match_id>/archive',methods=['GET'])
+def get_match_archive(match_id):
+    """
+    The frozen summary of a completed match, as stored: gzip bytes go out
+    untouched to clients that accept gzip.
+    """
+    from app.models import MatchArchive
+    from app.extensions import db
+    import gzip
+    archive=db.session.get(MatchArchive,match_id)
+    if not archive:
+        return jsonify({'success':False,'error':'Match not archived'}),404
+    response=current_app.response_class(mimetype='application/json')
+    response.set_etag(archive.digest)
+    response.headers['Cache-Control']=IMMUTABLE
+    if archive.digest in request.if_none_match:
+        response.status_code=304
+        return response
+    if 'gzip' in request.accept_encodings:
+        response.set_data(archive.payload)
+        response.headers['Content-Encoding']='gzip'
+    else:
+        response.set_data(gzip.decompress(archive.payload))
+    response.headers['Vary']='Accept-Encoding'
+    return response
 @matches_bp.route('/<int:match_id>/toss',methods=['POST'])
 def record_toss(match_id):
     try :
         schema=TossRecordSchema()
         data=schema.load(request.get_json())
         match=MatchService.record_toss(match_id,**data)
+        MatchSnapshots.invalidate(match_id)
         return jsonify({
             'success':True,
             'message':'toss recorded successfully',
@@ -61,6 +181,7 @@ def record_toss(match_id):
     except Exception as e:
         return jsonify({'success':False,'error':str(e)}),400
 @matches_bp.route('/live',methods=['GET'])
+@ResponseCache.cached('matches')
 def get_live_matches():
     matches=MatchService.get_live_matches()
     return jsonify({
@@ -68,3 +189,11 @@ def get_live_matches():
         'count':len(matches),
         'matches':[m.to_dict() for m in matches]
     }),200
+@matches_bp.route('/live/connections',methods=['GET'])
+def get_live_connections():
+    from app.extensions import socketio
+    from app.websockets.match_socket import live_socket_stats
+    return jsonify({
+        'success':True,
+        'connections':live_socket_stats(socketio.server)
+    }),200
@@ -2,19 +2,34 @@ from flask import Blueprint,request,jsonify
 from app.models import Player 
 from app.extensions import db
 from app.validators import PlayerCreateSchema,PlayerUpdateSchema
+from app.services import ResponseCache,KeysetPaginator
 from marshmallow import ValidationError
 player_bp=Blueprint('palyer',__name__)
 @player_bp.route('',methods=['GET'])
+@ResponseCache.cached('players')
 def get_all_players():
+    """Players by name, one page at a time. Query: team_id, role, limit, cursor"""
     query=Player.query
     team_id=request.args.get('team_id',type=int)
     if team_id:
-        query=query.filter(team_id=team_id)
-    players=query.all()
+        query=query.filter(Player.team_id==team_id)
+    role=request.args.get('role')
+    if role:
+        query=query.filter(Player.role==role)
+    try:
+        players,next_cursor=KeysetPaginator.page(
+            query,[Player.name,Player.id],
+            cursor=request.args.get('cursor'),
+            limit=request.args.get('limit',type=int),
+        )
+    except ValueError as e:
+        return jsonify({'success':False,'error':str(e)}),400
     return jsonify({
-        'success':True,'count':len(players),'players':[player.to_dict() for player in players]
+        'success':True,'count':len(players),'players':[player.to_dict() for player in players],
+        'next_cursor':next_cursor
     }),200
 @player_bp.route('/<int:player_id>',methods=['GET'])
+@ResponseCache.cached('players')
 def get_player(player_id):
     player=Player.query.get(player_id)
     if not player:
@@ -32,6 +47,7 @@ def create_player():
         player=Player(**data)
         db.session.add(player)
         db.session.commit()
+        ResponseCache.bump('players')
         return jsonify({
             'success':True,'message':'Player created successfully','player':player.to_dict()
         }),201
@@ -58,6 +74,7 @@ def update_player(player_id):
         for key,val in data.items():
             setattr(player,key,val)
         db.session.commit()
+        ResponseCache.bump('players')
         return jsonify({
             'success':True,
             'message':'Palyer updated successfully',
@@ -72,6 +89,7 @@ def delete_player(player_id):
         return jsonify({'success':False,'error':'Player not found'}),404
     db.session.delete(Player)
     db.session.commit()
+    ResponseCache.bump('players')
     return jsonify({
         'success':True,
         'message':'Player deleted successfully'
@@ -2,15 +2,26 @@ from flask import Blueprint,request,jsonify
 from app.models import Team
 from app.extensions import db
 from app.validators import TeamCreateSchema,TeamUpdateSchema
+from app.services import ResponseCache,KeysetPaginator
 from marshmallow import ValidationError
 teams_bp=Blueprint('team',__name__)
 
 @teams_bp.route('', methods=['GET'])
+@ResponseCache.cached('teams')
 def get_all_teams():
-    team=Team.query.all()
+    """Teams by name, one page at a time (?limit=, ?cursor=)"""
+    try:
+        team,next_cursor=KeysetPaginator.page(
+            Team.query,[Team.name,Team.id],
+            cursor=request.args.get('cursor'),
+            limit=request.args.get('limit',type=int),
+        )
+    except ValueError as e:
+        return jsonify({'success':False,'error':str(e)}),400
     return jsonify( 
-        {"success":True,"count":len(team),"teams":[t.to_dict() for t in team]}),200
+        {"success":True,"count":len(team),"teams":[t.to_dict() for t in team],"next_cursor":next_cursor}),200
 @teams_bp.route('/<int:team_id>', methods=['GET'])
+@ResponseCache.cached('team:{team_id}')
 def get_team(team_id):
     team=Team.query.get(team_id)
     if not team:
@@ -29,6 +40,7 @@ def create_team():
         team=Team(**data)
         db.session.add(team)
         db.session.commit()
+        ResponseCache.bump('teams')
         return jsonify({
         'success':True,
         'team':team.to_dict()
@@ -57,6 +69,7 @@ def update_team(team_id):
         for key,value in data.items():
             setattr(team,key,value)
         db.session.commit()
+        ResponseCache.bump('teams',f'team:{team_id}')
         return jsonify({
             'success':True,
             'team':team.to_dict()
@@ -83,6 +96,7 @@ def delete_team(team_id):
     try:
         db.session.delete(team)
         db.session.commit()
+        ResponseCache.bump('teams',f'team:{team_id}')
         return jsonify({
             'success':True,
             'message':'Team deleted successfully'
@@ -0,0 +1,9 @@
+from flask import Blueprint,current_app
+from app.metrics import render
+metrics_bp=Blueprint('metrics',__name__)
+@metrics_bp.route('/metrics',methods=['GET'])
+def metrics():
+    """Prometheus scrape endpoint (this worker's metrics, see app/metrics.py)"""
+    response=current_app.response_class(render(),mimetype='text/plain')
+    response.headers['Content-Type']='text/plain; version=0.0.4; charset=utf-8'
+    return response
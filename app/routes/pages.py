@@ -1,6 +1,8 @@
-from flask import Blueprint, render_template
+from datetime import datetime
+from flask import Blueprint, render_template, make_response, request, abort, current_app
 from app.models import Match, Team, Player, Inning
-from app.services import StatisticsService
+from app.services import StatisticsService, ArchiveService, KeysetPaginator
+from app.services.response_cache import IMMUTABLE
 
 pages_bp = Blueprint('pages', __name__)
 
@@ -9,7 +11,7 @@ pages_bp = Blueprint('pages', __name__)
 def home():
     """Dashboard-Home Page"""
     matches = Match.query.order_by(Match.match_date.desc()).limit(5).all()
-    team = Team.query.all()
+    team = Team.query.order_by(Team.name, Team.id).limit(current_app.config.get('ITEMS_PER_PAGE', 20)).all()
     players = Player.query.limit(10).all()
     live_count = Match.query.filter_by(status='live').count()
     return render_template('home.html', matches=matches, teams=team, players=players, live_count=live_count)
@@ -17,6 +19,9 @@ def home():
 
 @pages_bp.route('/match/<int:match_id>')
 def match_details(match_id):
+    archived = ArchiveService.load(match_id)
+    if archived:
+        return _archived_match_details(archived)
     match = Match.query.get_or_404(match_id)
     innings_list = Inning.query.filter_by(match_id=match_id).order_by(Inning.innings_number).all()
     innings_1 = innings_list[0] if len(innings_list) > 0 else None
@@ -37,9 +42,28 @@ def match_details(match_id):
     )
 
 
+def _archived_match_details(archived):
+    """Match page of a completed match, rendered from its frozen summary"""
+    details = archived['summary']['match_details']
+    match = dict(details, match_date=datetime.fromisoformat(details['match_date']))
+    innings_list = [i['innings_details'] for i in archived['innings']]
+    first = archived['innings'][0] if archived['innings'] else None
+    response = make_response(render_template(
+        'match_details.html',
+        match=match,
+        innings_1=innings_list[0] if len(innings_list) > 0 else None,
+        innings_2=innings_list[1] if len(innings_list) > 1 else None,
+        batting_scorecard_1=first['batting_scorecard'] if first else [],
+        bowling_scorecard_1=first['bowling_scorecard'] if first else [],
+    ))
+    response.headers['Cache-Control'] = IMMUTABLE
+    return response
+
+
 @pages_bp.route('/player/<int:player_id>')
 def player_profile(player_id):
     player = Player.query.get_or_404(player_id)
+    # Primary-key read of the materialized PlayerCareerStats row
     stats = StatisticsService.get_player_career_stats(player_id)
     return render_template('player_profile.html', player=player, stats=stats)
 
@@ -58,19 +82,28 @@ def team_detail(team_id):
     return render_template('team_details.html', team=team, players=players, matches=matches, players_by_role=players_by_role)
 
 
+def _page(query, columns, descending=False):
+    """One page of a list view from ?cursor=; a bad cursor is a 400"""
+    try:
+        return KeysetPaginator.page(query, columns, cursor=request.args.get('cursor'),
+                                    limit=request.args.get('limit', type=int), descending=descending)
+    except ValueError:
+        abort(400)
+
+
 @pages_bp.route('/teams')
 def teams_list():
-    teams = Team.query.all()
-    return render_template('teams_list.html', teams=teams)
+    teams, next_cursor = _page(Team.query, [Team.name, Team.id])
+    return render_template('teams_list.html', teams=teams, next_cursor=next_cursor)
 
 
 @pages_bp.route('/players')
 def players_list():
-    players = Player.query.all()
-    return render_template('players_list.html', players=players)
+    players, next_cursor = _page(Player.query, [Player.name, Player.id])
+    return render_template('players_list.html', players=players, next_cursor=next_cursor)
 
 
 @pages_bp.route('/matches')
 def matches_list():
-    matches = Match.query.order_by(Match.match_date.desc()).all()
-    return render_template('matches_list.html', matches=matches)
\ No newline at end of file
+    matches, next_cursor = _page(Match.query, [Match.match_date, Match.id], descending=True)
+    return render_template('matches_list.html', matches=matches, next_cursor=next_cursor)
\ No newline at end of file
@@ -2,4 +2,9 @@ from .ball_service import BallService
 from .innings_service import InningsService
 from .statistics_service import StatisticsService
 from .match_service import MatchService
-__all__=['BallService','InningsService','StatisticsService','MatchService']
\ No newline at end of file
+from .response_cache import ResponseCache
+from .archive_service import ArchiveService
+from .pagination import KeysetPaginator
+from .export_service import ExportService
+from .columnar_store import ColumnarStore
+__all__=['BallService','InningsService','StatisticsService','MatchService','ResponseCache','ArchiveService','KeysetPaginator','ExportService','ColumnarStore']
\ No newline at end of file
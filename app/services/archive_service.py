@@ -0,0 +1,132 @@
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from app.extensions import db
+from app.models import Match,Inning,MatchArchive
+class ArchiveService:
+    '''
+    Freezes completed matches into one immutable blob (MatchArchive).
+
+    Responsibilities:
+    - Render a completed match's summary and every innings summary once
+    - Serve them to the read paths (match/innings summaries, scorecard API,
+      match page) without touching the scorecard tables again
+
+    Blob layout (gzip-compressed JSON):
+      { "summary": <MatchService.get_match_summary>,
+        "innings": [ <InningsService.get_innings_summary>, ... ] }
+
+    Decoded blobs are memoised per process (MEMO_SIZE most recent, in
+    current_app.extensions['match_archives']); they never change, so the
+    memo needs no invalidation. Matches that aren't archived are not
+    memoised, so a freeze is seen immediately.
+    '''
+    MEMO_SIZE=256
+    _memo_lock=threading.Lock()
+    @staticmethod
+    def _memo():
+        memo=current_app.extensions.get('match_archives')
+        if memo is None:
+            with ArchiveService._memo_lock:
+                # match_id -> decoded blob, and innings_id -> match_id for those blobs
+                memo=current_app.extensions.setdefault('match_archives',{'blobs':OrderedDict(),'innings':{}})
+        return memo
+    @staticmethod
+    def freeze(match_id):
+        '''
+        Archive a completed match; a no-op if it is already archived or not completed.
+        Returns the MatchArchive row or None.
+        '''
+        archive=db.session.get(MatchArchive,match_id)
+        if archive:
+            return archive
+        match=db.session.get(Match,match_id)
+        if not match or match.status!='completed':
+            return None
+        from app.services.match_service import MatchService
+        from app.services.innings_service import InningsService
+        innings_ids=[i for (i,) in db.session.query(Inning.id).filter_by(match_id=match_id).order_by(Inning.innings_number)]
+        document={
+            'summary':MatchService.get_match_summary(match_id),
+            'innings':[InningsService.get_innings_summary(innings_id) for innings_id in innings_ids],
+        }
+        raw=json.dumps(document,separators=(',',':')).encode()
+        # mtime=0 keeps the bytes (and the digest) a pure function of the content
+        payload=gzip.compress(raw,compresslevel=9,mtime=0)
+        archive=MatchArchive(match_id=match_id,payload=payload,digest=hashlib.sha256(payload).hexdigest(),size=len(raw))
+        try:
+            db.session.add(archive)
+            db.session.commit()
+        except IntegrityError:
+            # Frozen concurrently by another request; theirs is identical
+            db.session.rollback()
+            archive=db.session.get(MatchArchive,match_id)
+        return archive
+    @staticmethod
+    def discard(match_id):
+        '''
+        Drop the archive of a match that is no longer completed (status corrected
+        by hand). Other workers keep a memoised copy until they restart.
+        '''
+        MatchArchive.query.filter_by(match_id=match_id).delete()
+        db.session.commit()
+        memo=ArchiveService._memo()
+        with ArchiveService._memo_lock:
+            ArchiveService._forget(memo,match_id)
+    @staticmethod
+    def load(match_id):
+        '''Decoded blob of an archived match, or None'''
+        memo=ArchiveService._memo()
+        with ArchiveService._memo_lock:
+            document=memo['blobs'].get(match_id)
+            if document is not None:
+                memo['blobs'].move_to_end(match_id)
+                return document
+        archive=db.session.get(MatchArchive,match_id)
+        if not archive:
+            return None
+        document=json.loads(gzip.decompress(archive.payload))
+        with ArchiveService._memo_lock:
+            memo['blobs'][match_id]=document
+            for innings in document['innings']:
+                memo['innings'][innings['innings_details']['id']]=match_id
+            while len(memo['blobs'])>ArchiveService.MEMO_SIZE:
+                ArchiveService._forget(memo,next(iter(memo['blobs'])))
+        return document
+    @staticmethod
+    def load_innings(innings_id,match_id=None):
+        '''
+        Archived summary of one innings, or None if its match isn't archived.
+        Without match_id only memoised blobs are consulted (no query).
+        '''
+        memo=ArchiveService._memo()
+        with ArchiveService._memo_lock:
+            match_id=memo['innings'].get(innings_id,match_id)
+        if match_id is None:
+            return None
+        document=ArchiveService.load(match_id)
+        if document is None:
+            return None
+        return next((i for i in document['innings'] if i['innings_details']['id']==innings_id),None)
+    @staticmethod
+    def archive_completed():
+        '''Freeze every completed match that has no archive yet; returns how many were frozen'''
+        pending=(
+            db.session.query(Match.id)
+            .outerjoin(MatchArchive,MatchArchive.match_id==Match.id)
+            .filter(Match.status=='completed',MatchArchive.match_id.is_(None))
+            .all()
+        )
+        for (match_id,) in pending:
+            ArchiveService.freeze(match_id)
+        return len(pending)
+    @staticmethod
+    def _forget(memo,match_id):
+        document=memo['blobs'].pop(match_id,None)
+        if document is not None:
+            for innings in document['innings']:
+                memo['innings'].pop(innings['innings_details']['id'],None)
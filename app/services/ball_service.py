@@ -1,16 +1,21 @@
+import time
 from app.extensions import db 
-from app.models import Ball,Inning,BattingScorecard,BowlingScorecard,Partnership
+from app.metrics import BALL_RECORD_SECONDS,DELIVERIES
+from app.models import Ball,BattingScorecard,BowlingScorecard,Partnership,Over,PlayerCareerStats
+from sqlalchemy import func,case,select
 from sqlalchemy.exc import SQLAlchemyError
+from app.services.innings_state import InningsState
+from app.services.response_cache import ResponseCache
 class BallService:
     '''
     Docstring for BallService
     handles all the ball recordings logic with cricket rules 
     Responsibilities:
-    -Record a ball with validation 
+    -Record a ball (or an offline batch of balls) with validation 
     -auto-increment over/ball numbers
     -Rotate strikers on odd runs
     -Swap strikers at over completion
-    -Updateall aggregation tables 
+    -Updateall aggregation tables (scorecards, overs, career totals)
     -handle extras (wide,no-ball)
     '''
     @staticmethod
@@ -18,96 +23,153 @@ class BallService:
         """      
         record a single ball 
         """
+        delivery=dict(
+            striker_id=striker_id,
+            non_striker_id=non_striker_id,
+            bowler_id=bowler_id,
+            runs=runs,
+            extras=extras,
+            extra_type=extra_type,
+            is_wicket=is_wicket,
+            wicket_type=wicket_type,
+            dismissed_player_id=dismissed_player_id,
+            fielder_id=fielder_id,
+            **kwargs
+        )
+        return BallService.record_balls(innings_id,[delivery])[0]
+    @staticmethod
+    def record_balls(innings_id,deliveries):
+        """
+        record several deliveries of one innings, in order, in a single transaction
+        Position, totals and the current scorecard/partnership rows come from
+        the innings live state, so no reads are issued while applying them.
+        The Ball rows are inserted together and each touched scorecard and
+        partnership row is written once. Either every delivery is recorded
+        or none is.
+        :param deliveries: list of dicts with the record_ball keyword arguments
+        """
+        started=time.perf_counter()
         try:
-            if runs < 0 or runs > 7:
-                raise ValueError("Runs must be between 0 and 7")
-            if extras < 0:
-                raise ValueError("Extras must be 0 or more")
-            innings=Inning.query.get(innings_id)
-            if not innings:
-                raise ValueError(f"Inning {innings_id} not found")
-            if innings.is_completed:
-                raise ValueError("cannot record ball in completed innings")
-            last_ball=Ball.query.filter_by(inning_id=innings_id)\
-                .order_by(Ball.id.desc())\
-                .first()
-            is_legal_delivery = extra_type not in ['wide','no-ball']
-            if not last_ball:
-                over_number=0
-                ball_number=1
-            else:
-                over_number=last_ball.over_number
-                ball_number=last_ball.ball_number
-                current_striker=last_ball.batsman_id
-                current_non_striker=last_ball.non_striker_id
-                if last_ball.is_legal_delivery:
-                    if ball_number==6:
-                        over_number+=1
-                        ball_number=1
-                        current_striker,current_non_striker=current_non_striker,current_striker
-                    else:
-                        ball_number+=1
-            if dismissed_player_id is None:
-                dismissed_player_id = kwargs.pop("dismissed_palyer_id", None)
-            ball=Ball(
-                inning_id=innings_id,
-                over_number=over_number,
-                ball_number=ball_number,
-                batsman_id=striker_id,
-                non_striker_id=non_striker_id,
-                bowler_id=bowler_id,
-                runs_scored=runs,
-                extra_runs=extras,
-                extra_type=extra_type,
-                is_wicket=is_wicket,
-                wicket_type=wicket_type,
-                dismissed_player_id=dismissed_player_id,
-                fielder_id=fielder_id,
-                is_legal_delivery=is_legal_delivery,
-            )
-            db.session.add(ball)
-            BallService._update_batting_scorecard(ball)
-            BallService._update_bowling_scorecard(ball)
-            BallService._update_partnership(ball)
-            BallService._update_innings(ball)
-            if is_wicket:
-                BallService._handle_wicket(ball)
-            db.session.commit()
-            return ball
+            # A stale state (innings scored elsewhere) is rebuilt once and the batch replayed
+            for attempt in range(2):
+                state=InningsState.get(innings_id)
+                if not state:
+                    raise ValueError(f"Inning {innings_id} not found")
+                with state.lock:
+                    # Rejected requests leave the state as it is
+                    if state.is_completed:
+                        raise ValueError("cannot record ball in completed innings")
+                    for delivery in deliveries:
+                        BallService._check(state,**delivery)
+                    try:
+                        balls=[]
+                        for delivery in deliveries:
+                            if state.is_completed:
+                                raise ValueError("cannot record ball in completed innings")
+                            ball=BallService._build_ball(state,**delivery)
+                            BallService._apply(state,ball)
+                            balls.append(ball)
+                        persisted=state.persist(balls)
+                    except Exception:
+                        InningsState.evict(innings_id)
+                        raise
+                    if persisted:
+                        ResponseCache.bump(f'match:{state.match_id}')
+                        BALL_RECORD_SECONDS.observe(time.perf_counter()-started)
+                        DELIVERIES.inc(len(balls))
+                        return balls
+                InningsState.evict(innings_id)
+            raise ValueError(f"Inning {innings_id} is being scored concurrently, retry the ball")
         except SQLAlchemyError as e:
             db.session.rollback()
+            InningsState.evict(innings_id)
             raise ValueError(f"DataBase error:{str(e)}")
     @staticmethod
-    def _update_batting_scorecard(ball):
-        scorecard=BattingScorecard.query.filter_by(innings_id=ball.inning_id,player_id=ball.batsman_id).first()
+    def _check(state,runs=0,extras=0,innings_id=None,**kwargs):
+        """Validate one delivery before anything is applied to the live state"""
+        if runs < 0 or runs > 7:
+            raise ValueError("Runs must be between 0 and 7")
+        if extras < 0:
+            raise ValueError("Extras must be 0 or more")
+        if innings_id is not None and innings_id!=state.innings_id:
+            raise ValueError(f"Ball for inning {innings_id} sent to inning {state.innings_id}")
+    @staticmethod
+    def _build_ball(state,striker_id,non_striker_id,bowler_id,runs=0,extras=0,extra_type=None,is_wicket=False,wicket_type=None,dismissed_player_id=None,fielder_id=None,**kwargs):
+        """Create the Ball of a checked delivery at the next position of the innings"""
+        kwargs.pop("innings_id",None)
+        if dismissed_player_id is None:
+            dismissed_player_id = kwargs.pop("dismissed_palyer_id", None)
+        # BallRecordSchema names the field extras_type
+        if extra_type is None:
+            extra_type = kwargs.pop("extras_type", None)
+        over_number,ball_number=state.next_position()
+        return Ball(
+            inning_id=state.innings_id,
+            over_number=over_number,
+            ball_number=ball_number,
+            batsman_id=striker_id,
+            non_striker_id=non_striker_id,
+            bowler_id=bowler_id,
+            runs_scored=runs,
+            extra_runs=extras,
+            extra_type=extra_type,
+            is_wicket=is_wicket,
+            wicket_type=wicket_type,
+            dismissed_player_id=dismissed_player_id,
+            fielder_id=fielder_id,
+            is_legal_delivery=extra_type not in ['wide','no-ball'],
+        )
+    @staticmethod
+    def _apply(state,ball):
+        """Apply a delivery to the live state (O(1), no queries)"""
+        BallService._update_batting_scorecard(state,ball)
+        BallService._update_over(state,ball)
+        BallService._update_bowling_scorecard(state,ball)
+        BallService._update_partnership(state,ball)
+        BallService._update_innings(state,ball)
+        state.add_career(PlayerCareerStats.deltas_for(ball))
+        if ball.is_wicket:
+            BallService._handle_wicket(ball)
+        state.advance(ball)
+    @staticmethod
+    def _update_batting_scorecard(state,ball):
+        scorecard=state.batting.get(ball.batsman_id)
         if not scorecard:
-            existing_batsmen=BattingScorecard.query.filter_by(innings_id=ball.inning_id).count()
-            scorecard=BattingScorecard(innings_id=ball.inning_id,player_id=ball.batsman_id,batting_position=existing_batsmen+1)
-            db.session.add(scorecard)
+            scorecard=BattingScorecard(innings_id=ball.inning_id,player_id=ball.batsman_id,batting_position=len(state.batting)+1)
+            state.batting[ball.batsman_id]=scorecard
         scorecard.update_stats(ball)
+        state.mark_dirty(scorecard)
+    @staticmethod
+    def _update_over(state,ball):
+        over=state.over
+        if not over or over.over_number!=ball.over_number:
+            over=Over(inning_id=ball.inning_id,over_number=ball.over_number,bowler_id=ball.bowler_id)
+            state.over=over
+        over.update_stats(ball)
+        state.mark_dirty(over)
     @staticmethod
-    def _update_bowling_scorecard(ball):
-        scorecard = BowlingScorecard.query.filter_by(innings_id=ball.inning_id,player_id=ball.bowler_id).first()
+    def _update_bowling_scorecard(state,ball):
+        scorecard=state.bowling.get(ball.bowler_id)
         if not scorecard:
-            scorecard = BowlingScorecard(innings_id=ball.inning_id,player_id=ball.bowler_id)
-            db.session.add(scorecard)
-        
-        scorecard.update_stats(ball)
+            scorecard=BowlingScorecard(innings_id=ball.inning_id,player_id=ball.bowler_id)
+            state.bowling[ball.bowler_id]=scorecard
+        scorecard.update_stats(ball,over=state.over)
+        state.mark_dirty(scorecard)
     @staticmethod
-    def _update_partnership(ball):
-        partnership=Partnership.query.filter_by(inning_id=ball.inning_id,is_active=True).first()
+    def _update_partnership(state,ball):
+        partnership=state.partnership
         if not partnership:
-            wickets_fallen=Partnership.query.filter_by(inning_id=ball.inning_id).count()
             partnership=Partnership(
                 inning_id=ball.inning_id,
                 batsman1_id=ball.batsman_id,
                 batsman2_id=ball.non_striker_id,
-                wickets_fallen=wickets_fallen,
+                wickets_fallen=state.partnership_count,
                 runs_scored=0,
                 balls_faced=0,
                 is_active=True,
             )
-            db.session.add(partnership)
+            state.partnership=partnership
+            state.partnership_count+=1
         # Defensive defaults for nullable legacy rows
         partnership.runs_scored = partnership.runs_scored or 0
         partnership.balls_faced = partnership.balls_faced or 0
@@ -117,24 +179,23 @@ class BallService:
             partnership.balls_faced+=1
         if ball.is_wicket:
             partnership.is_active=False
+            state.partnership=None
+        state.mark_dirty(partnership)
     
     @staticmethod
-    def _update_innings(ball):
-        innings=Inning.query.get(ball.inning_id)
-        innings.total_runs+=(ball.runs_scored+ball.extra_runs)
-        innings.extras+=ball.extra_runs
+    def _update_innings(state,ball):
+        state.total_runs+=(ball.runs_scored+ball.extra_runs)
+        state.extras+=ball.extra_runs
         if ball.is_wicket:
-            innings.total_wickets+=1
+            state.total_wickets+=1
         if ball.is_legal_delivery:
-            total_balls=Ball.query.filter_by(inning_id=ball.inning_id,is_legal_delivery=True).count()
-            innings.total_overs=total_balls//6 +(total_balls%6)/10
-        match=innings.match
-        if innings.total_wickets>=10:
-            innings.is_completed=True
-        elif match.over_limit is not None and innings.total_overs>=match.over_limit:
-            innings.is_completed=True
-        elif innings.target is not None and innings.total_runs>=innings.target:
-            innings.is_completed=True
+            state.legal_balls+=1
+        if state.total_wickets>=10:
+            state.is_completed=True
+        elif state.over_limit is not None and state.total_overs>=state.over_limit:
+            state.is_completed=True
+        elif state.target is not None and state.total_runs>=state.target:
+            state.is_completed=True
     @staticmethod
     def _handle_wicket(ball):
         """Handle wicket-specific logic"""
@@ -148,13 +209,66 @@ class BallService:
             return None,None
         return last_ball.batsman_id,last_ball.non_striker_id
     @staticmethod
-    def get_over_summary(innings_id,over_number):
-        balls=Ball.query.filter_by(inning_id=innings_id,over_number=over_number).order_by(Ball.ball_number).all()
-        return {
+    def get_over_summary(innings_id,over_number,include_balls=True):
+        """Summary of one over, read from its Over aggregate"""
+        over=Over.query.filter_by(inning_id=innings_id,over_number=over_number).first()
+        summary={
             'over_number':over_number+1,
-            'balls':[ball.to_dict() for ball in balls],
-            'total_runs':sum(ball.runs_scored+ball.extra_runs for ball in balls),
-            'is_complete':len(balls)==6 or any(ball.is_wicket for ball in balls),
-            'wickets':sum(1 for ball in balls if ball.is_wicket)
+            'bowler_id':over.bowler_id if over else None,
+            'total_runs':over.runs if over else 0,
+            'extras':over.extras if over else 0,
+            'is_complete':over.is_complete if over else False,
+            'is_maiden':over.is_maiden if over else False,
+            'wickets':over.wickets if over else 0
         }
-    
+        if include_balls:
+            balls=Ball.query.filter_by(inning_id=innings_id,over_number=over_number).order_by(Ball.ball_number,Ball.id).all()
+            summary['balls']=[ball.to_dict() for ball in balls]
+        return summary
+    @staticmethod
+    def rebuild_overs(innings_id=None):
+        """
+        Recompute Over aggregates from the ball log (all innings, or one)
+        Used to backfill innings recorded before overs were aggregated.
+        """
+        scope=[Ball.inning_id==innings_id] if innings_id is not None else []
+        legal=case((Ball.is_legal_delivery==True,1),else_=0)
+        totals=db.session.execute(
+            select(
+                Ball.inning_id,
+                Ball.over_number,
+                func.min(Ball.id),
+                func.sum(Ball.runs_scored+Ball.extra_runs),
+                func.sum(Ball.runs_scored+case((Ball.is_legal_delivery==False,Ball.extra_runs),else_=0)),
+                func.sum(Ball.extra_runs),
+                func.sum(case((Ball.is_wicket==True,1),else_=0)),
+                func.sum(legal),
+            ).where(*scope).group_by(Ball.inning_id,Ball.over_number)
+        ).all()
+        first_ids=[row[2] for row in totals]
+        bowlers={}
+        for chunk in range(0,len(first_ids),500):
+            bowlers.update(db.session.execute(
+                select(Ball.id,Ball.bowler_id).where(Ball.id.in_(first_ids[chunk:chunk+500]))
+            ).all())
+        overs=[{
+            'inning_id':inning_id,
+            'over_number':over_number,
+            'bowler_id':bowlers[first_id],
+            'runs':runs,
+            'runs_conceded':runs_conceded,
+            'extras':extras,
+            'wickets':wickets,
+            'legal_balls':legal_balls,
+            'is_maiden':legal_balls>=6 and runs_conceded==0,
+        } for inning_id,over_number,first_id,runs,runs_conceded,extras,wickets,legal_balls in totals]
+        try:
+            Over.query.filter(*([Over.inning_id==innings_id] if innings_id is not None else [])).delete(synchronize_session=False)
+            db.session.bulk_insert_mappings(Over,overs)
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise ValueError(f"DataBase error:{str(e)}")
+        for over in overs:
+            InningsState.evict(over['inning_id'])
+        return len(overs)
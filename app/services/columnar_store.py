@@ -0,0 +1,153 @@
+import json
+import os
+from datetime import datetime
+import numpy as np
+from sqlalchemy import func
+from app.extensions import db
+from app.models import Ball,Inning,Match
+from app.services.export_service import ExportService
+from app.services.match_service import MatchService
+class ColumnarStore:
+    '''
+    The ball table as columnar files for offline analysis.
+
+    Layout, one partition per season (year of match_date):
+      <root>/season=2025/meta.json        rows, dtypes, dictionaries
+      <root>/season=2025/<column>.npy     one NumPy array per column
+
+    Columns use the smallest dtype that fits (ids int32, counts int8/int16,
+    flags bool). wicket_type and extra_type are dictionary-encoded: int8
+    codes into meta.json's dictionaries, -1 for none; dismissed_player_id
+    and fielder_id use -1 for none too. A row takes 58 bytes.
+
+    Partitions are filled batch by batch into preallocated .npy files
+    (ExportService.ball_batches), so exporting holds one batch in memory.
+    load() memory-maps the .npy files: nothing is read until a column is
+    used, and slices and vectorised stats run straight off the page cache.
+
+    The files are NumPy .npy, not Parquet/Arrow: Parquet pages are encoded
+    and compressed, so they can't be mapped as arrays, and pyarrow is not a
+    dependency of this app. Anything that reads .npy (NumPy, or pandas via
+    to_dataframe()) can use the store as it is.
+    '''
+    COLUMNS={
+        'ball_id':('id','int32'),
+        'match_id':('match_id','int32'),
+        'match_date':('match_date','datetime64[D]'),
+        'inning_id':('inning_id','int32'),
+        'innings_number':('innings_number','int8'),
+        'batting_team_id':('batting_team_id','int32'),
+        'bowling_team_id':('bowling_team_id','int32'),
+        'over_number':('over_number','int16'),
+        'ball_number':('ball_number','int8'),
+        'batsman_id':('batsman_id','int32'),
+        'non_striker_id':('non_striker_id','int32'),
+        'bowler_id':('bowler_id','int32'),
+        'runs_scored':('runs_scored','int8'),
+        'extra_runs':('extra_runs','int8'),
+        'is_wicket':('is_wicket','bool'),
+        'is_legal_delivery':('is_legal_delivery','bool'),
+        'dismissed_player_id':('dismissed_player_id','int32'),
+        'fielder_id':('fielder_id','int32'),
+        'wicket_type':('wicket_type','int8'),
+        'extra_type':('extra_type','int8'),
+    }
+    DICTIONARY_COLUMNS=('wicket_type','extra_type')
+    @staticmethod
+    def export(root,matches=None):
+        '''
+        Write one partition per season of the balls of `matches` (all matches if None).
+        Returns {season: rows}. Existing partitions of those seasons are overwritten.
+        '''
+        matches=matches if matches is not None else MatchService.query_matches()
+        season=func.extract('year',Match.match_date)
+        years=[int(year) for (year,) in matches.with_entities(season).distinct().order_by(season)]
+        written={}
+        for year in years:
+            in_season=matches.filter(Match.match_date>=datetime(year,1,1),Match.match_date<datetime(year+1,1,1))
+            written[year]=ColumnarStore._write_partition(os.path.join(root,f"season={year}"),in_season)
+        return written
+    @staticmethod
+    def _write_partition(directory,matches):
+        os.makedirs(directory,exist_ok=True)
+        balls=(
+            db.session.query(Ball)
+            .join(Inning,Inning.id==Ball.inning_id)
+            .filter(Inning.match_id.in_(matches.with_entities(Match.id).scalar_subquery()))
+        )
+        rows=balls.count()
+        dictionaries={
+            name:sorted(value for (value,) in balls.with_entities(getattr(Ball,name)).distinct() if value is not None)
+            for name in ColumnarStore.DICTIONARY_COLUMNS
+        }
+        codes={name:{value:code for code,value in enumerate(values)} for name,values in dictionaries.items()}
+        arrays={
+            name:np.lib.format.open_memmap(os.path.join(directory,f"{name}.npy"),mode='w+',dtype=dtype,shape=(rows,))
+            for name,(_,dtype) in ColumnarStore.COLUMNS.items()
+        }
+        start=0
+        for batch in ExportService.ball_batches(matches):
+            stop=start+len(batch)
+            for name,(field,dtype) in ColumnarStore.COLUMNS.items():
+                if name in codes:
+                    values=(codes[name].get(row[field],-1) for row in batch)
+                elif name=='match_date':
+                    values=(row[field].date() for row in batch)
+                elif name in ('dismissed_player_id','fielder_id'):
+                    values=(-1 if row[field] is None else row[field] for row in batch)
+                else:
+                    values=(row[field] for row in batch)
+                arrays[name][start:stop]=np.fromiter(values,dtype=dtype,count=len(batch))
+            start=stop
+        if start!=rows:
+            raise RuntimeError(f"{directory}: counted {rows} balls but read {start}")
+        for array in arrays.values():
+            array.flush()
+        meta={
+            'rows':rows,
+            'columns':{name:dtype for name,(_,dtype) in ColumnarStore.COLUMNS.items()},
+            'dictionaries':dictionaries,
+        }
+        with open(os.path.join(directory,'meta.json'),'w') as f:
+            json.dump(meta,f,indent=2)
+        return rows
+    @staticmethod
+    def seasons(root):
+        '''Seasons exported under root, oldest first'''
+        if not os.path.isdir(root):
+            return []
+        return sorted(int(entry.split('=',1)[1]) for entry in os.listdir(root) if entry.startswith('season='))
+    @staticmethod
+    def load(root,season,columns=None):
+        '''
+        Memory-map one season: {column: read-only ndarray}, plus the
+        dictionaries under '_dictionaries'. No data is copied.
+        '''
+        directory=os.path.join(root,f"season={season}")
+        with open(os.path.join(directory,'meta.json')) as f:
+            meta=json.load(f)
+        names=columns or list(meta['columns'])
+        arrays={name:np.load(os.path.join(directory,f"{name}.npy"),mmap_mode='r') for name in names}
+        arrays['_dictionaries']=meta['dictionaries']
+        return arrays
+    @staticmethod
+    def decode(arrays,name):
+        '''Values of a dictionary-encoded column (None where the code is -1)'''
+        values=np.array(arrays['_dictionaries'][name]+[None],dtype=object)
+        return values[arrays[name]]  # code -1 picks the trailing None
+    @staticmethod
+    def to_dataframe(arrays):
+        '''
+        pandas DataFrame over the mapped arrays (pandas is optional).
+        Dictionary columns become Categoricals sharing the codes.
+        '''
+        import pandas
+        data={}
+        for name,array in arrays.items():
+            if name=='_dictionaries':
+                continue
+            if name in arrays['_dictionaries']:
+                data[name]=pandas.Categorical.from_codes(array,arrays['_dictionaries'][name])
+            else:
+                data[name]=array
+        return pandas.DataFrame(data,copy=False)
@@ -0,0 +1,72 @@
+import json
+import zlib
+from sqlalchemy import select
+from app.extensions import db
+from app.models import Ball,Inning,Match
+class ExportService:
+    '''
+    Ball-by-ball dumps as newline-delimited JSON, one delivery per line.
+
+    Responsibilities:
+    - Read the ball table in batches of BATCH_SIZE rows (yield_per; a
+      server-side cursor where the driver has one) as plain column rows,
+      never ORM objects, so nothing piles up in the session
+    - Encode each batch to NDJSON and hand it on as one chunk
+    - Optionally gzip the chunks as they go
+
+    Memory stays at about one batch whatever the size of the export. The
+    callers (export endpoint, export-balls command) write the chunks out as
+    they are produced.
+
+    Line layout: the Ball.to_dict() fields plus match_id, innings_number,
+    batting_team_id, bowling_team_id and match_date.
+    '''
+    BATCH_SIZE=1000
+    COLUMNS=(
+        Ball.id,Inning.match_id,Match.match_date,Ball.inning_id,Inning.innings_number,
+        Inning.batting_team_id,Inning.bowling_team_id,Ball.over_number,Ball.ball_number,
+        Ball.batsman_id,Ball.non_striker_id,Ball.bowler_id,Ball.runs_scored,Ball.is_wicket,
+        Ball.wicket_type,Ball.extra_type,Ball.extra_runs,Ball.dismissed_player_id,
+        Ball.fielder_id,Ball.is_legal_delivery,Ball.created_at,
+    )
+    @staticmethod
+    def ball_batches(matches=None,batch_size=None):
+        '''
+        Yield lists of ball rows (dicts) in ball id order.
+        :param matches: Match query to export the balls of (MatchService.query_matches); all balls if None
+        '''
+        statement=(
+            select(*ExportService.COLUMNS)
+            .join(Inning,Inning.id==Ball.inning_id)
+            .join(Match,Match.id==Inning.match_id)
+            .order_by(Ball.id)
+        )
+        if matches is not None:
+            statement=statement.where(Match.id.in_(matches.with_entities(Match.id).scalar_subquery()))
+        batch_size=batch_size or ExportService.BATCH_SIZE
+        result=db.session.execute(statement.execution_options(stream_results=True,yield_per=batch_size))
+        try:
+            for partition in result.partitions():
+                yield [row._asdict() for row in partition]
+        finally:
+            result.close()
+    @staticmethod
+    def ndjson(matches=None,batch_size=None):
+        '''Yield NDJSON bytes, one chunk per batch'''
+        encode=json.JSONEncoder(separators=(',',':'),default=ExportService._default).encode
+        for rows in ExportService.ball_batches(matches,batch_size):
+            yield "".join(encode(row)+"\n" for row in rows).encode()
+    @staticmethod
+    def gzipped(chunks):
+        '''Gzip a stream of byte chunks on the fly'''
+        compressor=zlib.compressobj(6,zlib.DEFLATED,16+zlib.MAX_WBITS)  # +16: gzip container
+        for chunk in chunks:
+            data=compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+    @staticmethod
+    def _default(value):
+        if hasattr(value,'isoformat'):
+            return value.isoformat()
+        raise TypeError(f"Cannot serialise {type(value).__name__}")
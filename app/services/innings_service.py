@@ -1,6 +1,9 @@
 from app.extensions import db
 from app.models import Inning,Match
 from datetime import datetime
+from app.services.innings_state import InningsState
+from app.services.response_cache import ResponseCache
+from app.services.archive_service import ArchiveService
 class InningsService:
     '''
     Manages innings lifecycle
@@ -45,6 +48,8 @@ class InningsService:
         if match.status=='scheduled':
             match.status='live'
             db.session.commit()
+        ResponseCache.bump('matches',f'match:{match_id}')
+        InningsState.start(innings,over_limit=match.over_limit)
         return innings
     @staticmethod
     def complete_innings(innings_id):
@@ -54,6 +59,8 @@ class InningsService:
         innings.is_completed=True
         innings.updated_at=datetime.utcnow()
         db.session.commit()
+        InningsState.evict(innings_id)
+        ResponseCache.bump(f'match:{innings.match_id}')
         InningsService._check_match_completion(innings.match_id)
         return innings
     @staticmethod
@@ -77,13 +84,22 @@ class InningsService:
                 match.win_margin='match tied'
             match.status='completed'
             db.session.commit()
+            ResponseCache.bump('matches',f'match:{match_id}')
+            ArchiveService.freeze(match_id)
         return match
 
     @staticmethod
     def get_innings_summary(inning_id):
+        archived=ArchiveService.load_innings(inning_id)
+        if archived:
+            return archived
         innings=Inning.query.get(inning_id)
         if not innings:
             return None
+        if innings.is_completed:
+            archived=ArchiveService.load_innings(inning_id,innings.match_id)
+            if archived:
+                return archived
         from app.services.statistics_service import StatisticsService
         return {
             "innings_details":innings.to_dict(),
@@ -0,0 +1,212 @@
+import threading
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import func,case,select,update,inspect
+from app.extensions import db
+from app.models import Ball,Inning,BattingScorecard,BowlingScorecard,Partnership,Over,PlayerCareerStats
+from app.services.statistics_service import StatisticsService
+class InningsState:
+    '''
+    In-memory live state of one innings.
+    Responsibilities:
+    -Track over/ball position and striker/non-striker
+    -Keep running totals (runs, wickets, extras, legal balls)
+    -Hold the current batting/bowling scorecard, partnership and over rows
+    -Persist each delivery as one write batch (no reads on the ball path)
+    States are kept per application in a process-local registry. A state is
+    created when the innings starts and rebuilt from the ball table the first
+    time it is needed after a worker restart. Writes are guarded by the
+    innings `updated_at` value, so a state that went stale (another worker
+    scored the same innings) is detected and rebuilt instead of overwriting.
+    '''
+    _registry_lock=threading.Lock()
+    def __init__(self,innings_id,match_id=None,over_limit=None,target=None,version=None):
+        self.innings_id=innings_id
+        self.match_id=match_id
+        self.over_limit=over_limit
+        self.target=target
+        self.version=version
+        self.is_completed=False
+        # Running totals
+        self.total_runs=0
+        self.total_wickets=0
+        self.extras=0
+        self.legal_balls=0
+        # Position of the last delivery recorded
+        self.over_number=None
+        self.ball_number=None
+        self.last_ball_legal=True
+        # Expected batsmen for the next delivery
+        self.striker_id=None
+        self.non_striker_id=None
+        # Current rows, held as transient model instances
+        self.batting={}
+        self.bowling={}
+        self.partnership=None
+        self.partnership_count=0
+        self.over=None
+        self.lock=threading.Lock()
+        self._dirty=[]
+        # Pending career increments {player_id: {counter: n}}
+        self.career={}
+    def __repr__(self):
+        return f"<InningsState {self.innings_id} {self.total_runs}/{self.total_wickets} ({self.total_overs})>"
+    # ── registry ─────────────────────────────────────────────────────────────
+    @staticmethod
+    def _registry():
+        return current_app.extensions.setdefault('innings_states',{})
+    @classmethod
+    def get(cls,innings_id):
+        """Return the live state for an innings, rebuilding it from the database if needed"""
+        registry=cls._registry()
+        state=registry.get(innings_id)
+        if state is not None:
+            return state
+        state=cls.load(innings_id)
+        if state is None:
+            return None
+        with cls._registry_lock:
+            return registry.setdefault(innings_id,state)
+    @classmethod
+    def start(cls,innings,over_limit=None):
+        """Register a fresh state for a newly created innings (no queries)"""
+        state=cls(innings.id,match_id=innings.match_id,over_limit=over_limit,target=innings.target,version=innings.updated_at)
+        with cls._registry_lock:
+            cls._registry()[innings.id]=state
+        return state
+    @classmethod
+    def evict(cls,innings_id):
+        with cls._registry_lock:
+            cls._registry().pop(innings_id,None)
+    @classmethod
+    def load(cls,innings_id):
+        """Rebuild the state of an innings from the ball table and its aggregate rows"""
+        innings=Inning.query.get(innings_id)
+        if not innings:
+            return None
+        state=cls(innings_id,match_id=innings.match_id,over_limit=innings.match.over_limit,target=innings.target,version=innings.updated_at)
+        state.is_completed=innings.is_completed
+        totals=db.session.execute(
+            select(
+                func.coalesce(func.sum(Ball.runs_scored+Ball.extra_runs),0),
+                func.coalesce(func.sum(Ball.extra_runs),0),
+                func.coalesce(func.sum(case((Ball.is_wicket==True,1),else_=0)),0),
+                func.coalesce(func.sum(case((Ball.is_legal_delivery==True,1),else_=0)),0),
+            ).where(Ball.inning_id==innings_id)
+        ).one()
+        state.total_runs,state.extras,state.total_wickets,state.legal_balls=(int(v) for v in totals)
+        last_ball=Ball.query.filter_by(inning_id=innings_id).order_by(Ball.id.desc()).first()
+        if last_ball:
+            state.advance(last_ball)
+            row=db.session.execute(
+                select(Over.__table__).where(Over.__table__.c.inning_id==innings_id,Over.__table__.c.over_number==last_ball.over_number)
+            ).mappings().first()
+            if row:
+                state.over=Over(**row)
+            else:
+                # Innings recorded before overs were aggregated
+                state.over=Over(inning_id=innings_id,over_number=last_ball.over_number,bowler_id=last_ball.bowler_id)
+                for ball in Ball.query.filter_by(inning_id=innings_id,over_number=last_ball.over_number).order_by(Ball.id):
+                    state.over.update_stats(ball)
+        for model,rows in ((BattingScorecard,state.batting),(BowlingScorecard,state.bowling)):
+            for row in db.session.execute(select(model.__table__).where(model.__table__.c.innings_id==innings_id)).mappings():
+                rows[row['player_id']]=model(**row)
+        partnerships=db.session.execute(select(Partnership.__table__).where(Partnership.__table__.c.inning_id==innings_id)).mappings().all()
+        state.partnership_count=len(partnerships)
+        active=next((p for p in partnerships if p['is_active']),None)
+        state.partnership=Partnership(**active) if active else None
+        return state
+    # ── position & totals ────────────────────────────────────────────────────
+    @property
+    def total_overs(self):
+        return self.legal_balls//6+(self.legal_balls%6)/10
+    @property
+    def run_rate(self):
+        """Same formula as Inning.run_rate"""
+        if self.total_overs > 0:
+            return round(self.total_runs/self.total_overs,2)
+        return 0.0
+    def summary(self):
+        """Live score header for API responses and socket payloads"""
+        return {
+            'total_runs':self.total_runs,
+            'total_wickets':self.total_wickets,
+            'total_overs':self.total_overs,
+            'run_rate':self.run_rate
+        }
+    def next_position(self):
+        """Over and ball number for the next delivery (ball number repeats after an extra)"""
+        if self.over_number is None:
+            return 0,1
+        if self.last_ball_legal:
+            if self.ball_number==6:
+                return self.over_number+1,1
+            return self.over_number,self.ball_number+1
+        return self.over_number,self.ball_number
+    def advance(self,ball):
+        """Move the position and the expected striker/non-striker past a delivery"""
+        self.over_number=ball.over_number
+        self.ball_number=ball.ball_number
+        self.last_ball_legal=ball.is_legal_delivery
+        striker,non_striker=ball.batsman_id,ball.non_striker_id
+        ran=ball.runs_scored+(ball.extra_runs if ball.extra_type in ('bye','leg-bye') else 0)
+        if ran%2==1:
+            striker,non_striker=non_striker,striker
+        if ball.is_legal_delivery and ball.ball_number==6:
+            striker,non_striker=non_striker,striker
+        if ball.is_wicket:
+            striker=None if ball.dismissed_player_id==striker else striker
+            non_striker=None if ball.dismissed_player_id==non_striker else non_striker
+        self.striker_id,self.non_striker_id=striker,non_striker
+    def add_career(self,deltas):
+        for player_id,counters in deltas.items():
+            pending=self.career.setdefault(player_id,{})
+            for name,n in counters.items():
+                pending[name]=pending.get(name,0)+n
+    def mark_dirty(self,row):
+        if not any(r is row for r in self._dirty):
+            self._dirty.append(row)
+    # ── persistence ──────────────────────────────────────────────────────────
+    @staticmethod
+    def _mapping(row):
+        return {attr.key:getattr(row,attr.key) for attr in inspect(type(row)).column_attrs}
+    def persist(self,balls):
+        """
+        Write a batch of deliveries: the balls, every touched row (once), the
+        innings totals and the players' career increments. Returns False (and writes nothing) if the innings was
+        changed elsewhere.
+        """
+        now=datetime.utcnow()
+        result=db.session.execute(
+            update(Inning)
+            .where(Inning.id==self.innings_id,Inning.updated_at==self.version)
+            .values(
+                total_runs=self.total_runs,
+                total_wickets=self.total_wickets,
+                total_overs=self.total_overs,
+                extras=self.extras,
+                is_completed=self.is_completed,
+                updated_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount!=1:
+            db.session.rollback()
+            return False
+        db.session.add_all(balls)
+        for row in self._dirty:
+            mapping=self._mapping(row)
+            if row.id is None:
+                mapping={k:v for k,v in mapping.items() if v is not None}
+                db.session.bulk_insert_mappings(type(row),[mapping],return_defaults=True)
+                row.id=mapping['id']
+            else:
+                db.session.bulk_update_mappings(type(row),[mapping])
+        PlayerCareerStats.increment(self.career,backfill=StatisticsService.aggregate_career_counters)
+        db.session.commit()
+        self._dirty=[]
+        self.career={}
+        self.version=now
+        if self.is_completed:
+            InningsState.evict(self.innings_id)
+        return True
@@ -1,6 +1,8 @@
 import random
 from app.extensions import db
 from app.models import Match,Team,Inning
+from app.services.response_cache import ResponseCache
+from app.services.archive_service import ArchiveService
 from datetime import datetime
 import random
 from random import choice
@@ -42,6 +44,7 @@ class MatchService:
         )
         db.session.add(match)
         db.session.commit()
+        ResponseCache.bump('matches',f'match:{match.id}')
         return match
     @staticmethod 
     def record_toss(match_id,toss_winner_id,toss_decision):
@@ -56,9 +59,13 @@ class MatchService:
         match.toss_winner=toss_winner_id
         match.toss_decision=toss_decision
         db.session.commit()
+        ResponseCache.bump('matches',f'match:{match_id}')
         return match
     @staticmethod
     def get_match_summary(match_id):
+        archived=ArchiveService.load(match_id)
+        if archived:
+            return archived['summary']
         match=Match.query.get(match_id)
         if not match:
             raise ValueError(f"Match {match_id} not found")
@@ -73,6 +80,24 @@ class MatchService:
             } if match.status=='completed' else None
         }
     @staticmethod
+    def query_matches(status=None,team_id=None,date_from=None,date_to=None):
+        '''
+        Match query with the list filters applied (unordered, unpaginated)
+        :param team_id: matches this team played in, either side
+        :param date_from: earliest match_date, inclusive
+        :param date_to: match_date upper bound, exclusive
+        '''
+        query=Match.query
+        if status:
+            query=query.filter(Match.status==status)
+        if team_id:
+            query=query.filter((Match.team_1_id==team_id)|(Match.team_2_id==team_id))
+        if date_from:
+            query=query.filter(Match.match_date>=date_from)
+        if date_to:
+            query=query.filter(Match.match_date<date_to)
+        return query
+    @staticmethod
     def get_live_matches():
         return Match.query.filter_by(status='live').all()
     @staticmethod
@@ -83,7 +108,13 @@ class MatchService:
         match=Match.query.get(match_id)
         if not match:
             raise ValueError(f"Match {match_id} not found")
+        previous=match.status
         match.status=status
         db.session.commit()
+        ResponseCache.bump('matches',f'match:{match_id}')
+        if status=='completed':
+            ArchiveService.freeze(match_id)
+        elif previous=='completed':
+            ArchiveService.discard(match_id)
         return match
     
@@ -0,0 +1,62 @@
+import base64
+import json
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import tuple_
+class KeysetPaginator:
+    '''
+    Keyset (cursor) pagination for list endpoints and pages.
+
+    A page is read with WHERE (sort columns) > (last row's values) ORDER BY
+    the same columns LIMIT n, so page 1000 costs the same index range scan
+    as page 1 — unlike OFFSET, which reads and throws away every row before
+    it. The sort columns must end with the primary key to make the order
+    total, and should be covered by an index (idx_match_date_id,
+    team.name, player.name; `flask create-indexes` adds missing ones to
+    older databases).
+
+    The cursor is the last row's sort values, base64-encoded JSON; clients
+    pass it back untouched as ?cursor=. Page size is ?limit=, capped at
+    ITEMS_PER_PAGE.
+    '''
+    @staticmethod
+    def limit(requested=None):
+        maximum=current_app.config.get('ITEMS_PER_PAGE',20)
+        if requested is None:
+            return maximum
+        return max(1,min(requested,maximum))
+    @staticmethod
+    def encode_cursor(values):
+        values=[v.isoformat() if isinstance(v,datetime) else v for v in values]
+        return base64.urlsafe_b64encode(json.dumps(values,separators=(',',':')).encode()).decode()
+    @staticmethod
+    def decode_cursor(cursor,columns):
+        try:
+            values=json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if not isinstance(values,list) or len(values)!=len(columns):
+                raise ValueError
+            return [
+                datetime.fromisoformat(v) if column.type.python_type is datetime else v
+                for v,column in zip(values,columns)
+            ]
+        except (ValueError,TypeError):
+            raise ValueError("Invalid cursor")
+    @staticmethod
+    def page(query,columns,cursor=None,limit=None,descending=False):
+        '''
+        One page of `query` ordered by `columns`.
+        Returns (rows, next_cursor); next_cursor is None on the last page.
+        Raises ValueError for a cursor that wasn't produced by this order.
+        '''
+        limit=KeysetPaginator.limit(limit)
+        if cursor:
+            values=KeysetPaginator.decode_cursor(cursor,columns)
+            after=tuple_(*columns)<tuple_(*values) if descending else tuple_(*columns)>tuple_(*values)
+            query=query.filter(after)
+        order=[c.desc() for c in columns] if descending else list(columns)
+        rows=query.order_by(*order).limit(limit+1).all()
+        if len(rows)<=limit:
+            return rows,None
+        rows=rows[:limit]
+        last=rows[-1]
+        return rows,KeysetPaginator.encode_cursor([getattr(last,c.key) for c in columns])
@@ -0,0 +1,109 @@
+import time
+from functools import wraps
+from flask import current_app,request
+from app.extensions import cache
+from app.metrics import CACHE_REQUESTS
+IMMUTABLE='public, max-age=31536000, immutable'
+_HIT,_MISS,_NOT_MODIFIED=(CACHE_REQUESTS.labels('response',result) for result in ('hit','miss','not_modified'))
+class ResponseCache:
+    '''
+    Cache for JSON responses of read endpoints, keyed on entity versions.
+
+    Every cached view names the scopes its data comes from, e.g.
+    'match:42', 'matches', 'teams'. Each scope has a version number in the
+    cache; the response key includes the current versions, so a write
+    that bumps a scope makes every response built from it unreachable at
+    once, on every worker sharing the cache. Nothing is deleted: stale
+    entries age out with CACHE_DEFAULT_TIMEOUT.
+
+    Writers (services and write endpoints) call bump() after committing.
+    Responses of finished matches never change again and are kept without
+    expiry (forever=...), and tell clients and proxies they may keep them
+    for a year (Cache-Control: immutable).
+
+    A version missing from the cache (first use, eviction) starts from the
+    current time in ms, so it can't collide with versions handed out before.
+    If the cache backend is unreachable, views are served uncached.
+
+    The versions double as a strong ETag ("<v1>.<v2>"). A client polling
+    with If-None-Match gets a 304 after one cache round trip for the
+    versions: no response lookup, no DB, no body. A scope's version only
+    grows ('match:<id>' on every ball, toss, innings and status change).
+    '''
+    @staticmethod
+    def _version_key(scope):
+        return f"ver:{scope}"
+    @staticmethod
+    def _seed():
+        return int(time.time()*1000)
+    @staticmethod
+    def versions(*scopes):
+        keys=[ResponseCache._version_key(scope) for scope in scopes]
+        values=cache.get_many(*keys)
+        missing=[key for key,value in zip(keys,values) if value is None]
+        if missing:
+            seed=ResponseCache._seed()
+            for key in missing:
+                cache.add(key,seed,timeout=0)
+            values=cache.get_many(*keys)
+        return values
+    @staticmethod
+    def bump(*scopes):
+        '''Invalidate every cached response built from these scopes'''
+        for scope in scopes:
+            key=ResponseCache._version_key(scope)
+            try:
+                # inc() on a missing key starts from 1, a version that may
+                # already have been handed out: seed it like versions() does
+                cache.add(key,ResponseCache._seed(),timeout=0)
+                cache.cache.inc(key)
+            except Exception as e:
+                current_app.logger.warning("response cache: could not bump %s: %s",scope,e)
+    @staticmethod
+    def _tag(response,etag,immutable=False):
+        response.set_etag(etag)
+        if immutable:
+            response.headers['Cache-Control']=IMMUTABLE
+        else:
+            response.headers['Cache-Control']='no-cache'  # revalidate on every poll
+        return response
+    @staticmethod
+    def cached(*scopes,forever=None):
+        '''
+        Decorator for a GET view returning jsonify(...) (optionally with a status).
+        :param scopes: format strings filled from the view kwargs, e.g. 'match:{match_id}'
+        :param forever: predicate on the JSON body; true = cache without expiry
+        Only successful responses ({"success": true}, status 200) are cached.
+        '''
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args,**kwargs):
+                try:
+                    names=[scope.format(**kwargs) for scope in scopes]
+                    versions=ResponseCache.versions(*names)
+                    etag=".".join(str(v) for v in versions)
+                    if etag in request.if_none_match:
+                        _NOT_MODIFIED.inc()
+                        return ResponseCache._tag(current_app.response_class(status=304),etag)
+                    key=f"view:{request.full_path}:{etag}"
+                    hit=cache.get(key)
+                except Exception as e:
+                    current_app.logger.warning("response cache unavailable: %s",e)
+                    return view(*args,**kwargs)
+                if hit is not None:
+                    _HIT.inc()
+                    body,immutable=hit
+                    return ResponseCache._tag(current_app.response_class(body,mimetype='application/json'),etag,immutable)
+                _MISS.inc()
+                response=current_app.make_response(view(*args,**kwargs))
+                data=response.get_json(silent=True)
+                if response.status_code==200 and isinstance(data,dict) and data.get('success'):
+                    immutable=forever is not None and forever(data)
+                    try:
+                        cache.set(key,(response.get_data(),immutable),timeout=0 if immutable else None)
+                    except Exception as e:
+                        current_app.logger.warning("response cache: could not store %s: %s",key,e)
+                    ResponseCache._tag(response,etag,immutable)
+                return response
+            return wrapper
+        return decorator
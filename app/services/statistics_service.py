@@ -1,5 +1,7 @@
-from app.models import Ball,BattingScorecard,BowlingScorecard,Partnership,Inning
-from sqlalchemy import func
+from datetime import datetime
+from app.models import Ball,BattingScorecard,BowlingScorecard,Partnership,Inning,Over,PlayerCareerStats
+from sqlalchemy import func,case,select,or_
+from sqlalchemy.exc import SQLAlchemyError
 from app.extensions import db
 class StatisticsService:
     '''
@@ -7,8 +9,9 @@ class StatisticsService:
     
     Responsibilities:
     - Get batting/bowling scorecards
-    - Calculate player career stats
+    - Calculate player career stats (materialized in PlayerCareerStats)
     - Get partnerships
+    - Get per-over progression (charts)
     - Calculate team totals
     '''
     @staticmethod
@@ -43,17 +46,86 @@ class StatisticsService:
         partnerships=Partnership.query.filter_by(inning_id=innings_id).order_by(Partnership.wickets_fallen).all()
         return [p.to_dict() for p in partnerships]
     @staticmethod
+    def get_over_progression(innings_id):
+        """Per-over runs/wickets for Manhattan and worm charts, read from the Over aggregates"""
+        overs=Over.query.filter_by(inning_id=innings_id).order_by(Over.over_number).all()
+        cumulative_runs=0
+        progression=[]
+        for over in overs:
+            cumulative_runs+=over.runs
+            progression.append({
+                'over':over.over_number+1,
+                'bowler_id':over.bowler_id,
+                'runs':over.runs,
+                'extras':over.extras,
+                'wickets':over.wickets,
+                'is_maiden':over.is_maiden,
+                'cumulative_runs':cumulative_runs
+            })
+        return progression
+    @staticmethod
     def get_player_career_stats(player_id):
-        batting_balls=Ball.query.filter_by(batsman_id=player_id).all()
-        bowling_balls=Ball.query.filter_by(bowler_id=player_id).all()
-        # batting stats
-        total_runs=sum(b.runs_scored for b in batting_balls)
-        balls_faced=sum(1 for b in batting_balls if b.is_legal_delivery)
-        dismissals=Ball.query.filter_by(dismissed_player_id=player_id).count()
-        # bowling stats
-        runs_conceded=sum(b.runs_scored + b.extra_runs for b in bowling_balls)
-        wickets=sum(1 for b in bowling_balls if b.is_wicket and b.wicket_type not in ['run-out'])
-        balls_bowled=sum(1 for b in bowling_balls if b.is_legal_delivery)
+        """Career batting/bowling stats, read from the player's PlayerCareerStats row"""
+        career=db.session.get(PlayerCareerStats,player_id)
+        if career:
+            counters={name:getattr(career,name) for name in PlayerCareerStats.COUNTERS}
+        else:
+            # No row yet: the table was never rebuilt and the player hasn't
+            # played since (the first new ball creates the row from the ball log)
+            counters=StatisticsService.aggregate_career_counters(player_id)
+        return StatisticsService._career_stats_dict(counters)
+    @staticmethod
+    def aggregate_career_counters(player_id=None):
+        """
+        Career counters aggregated in SQL from the ball log in one pass
+        With player_id=None, returns {player_id: counters} for every player.
+        """
+        legal=Ball.is_legal_delivery==True
+        # Same rule as PlayerCareerStats.deltas_for: only a wicket dismisses
+        out=Ball.is_wicket==True
+        def total(condition,value=1):
+            return func.coalesce(func.sum(case((condition,value),else_=0)),0)
+        if player_id is not None:
+            batted=Ball.batsman_id==player_id
+            bowled=Ball.bowler_id==player_id
+            row=db.session.execute(
+                select(
+                    total(batted,Ball.runs_scored),
+                    total(batted&legal),
+                    total(out&(Ball.dismissed_player_id==player_id)),
+                    total(batted&(Ball.runs_scored==4)),
+                    total(batted&(Ball.runs_scored==6)),
+                    total(bowled&out&(func.coalesce(Ball.wicket_type,'')!='run-out')),
+                    total(bowled,Ball.runs_scored+Ball.extra_runs),
+                    total(bowled&legal),
+                ).where(or_(batted,bowled,Ball.dismissed_player_id==player_id))
+            ).one()
+            return dict(zip(PlayerCareerStats.COUNTERS,(int(v) for v in row)))
+        counters={}
+        def merge(rows,names):
+            for pid,*values in rows:
+                entry=counters.setdefault(pid,dict.fromkeys(PlayerCareerStats.COUNTERS,0))
+                entry.update(zip(names,(int(v) for v in values)))
+        merge(db.session.execute(
+            select(Ball.batsman_id,func.sum(Ball.runs_scored),total(legal),total(Ball.runs_scored==4),total(Ball.runs_scored==6))
+            .group_by(Ball.batsman_id)
+        ),('runs','balls_faced','fours','sixes'))
+        merge(db.session.execute(
+            select(Ball.dismissed_player_id,func.count()).where(out,Ball.dismissed_player_id.isnot(None)).group_by(Ball.dismissed_player_id)
+        ),('dismissals',))
+        merge(db.session.execute(
+            select(Ball.bowler_id,total(out&(func.coalesce(Ball.wicket_type,'')!='run-out')),func.sum(Ball.runs_scored+Ball.extra_runs),total(legal))
+            .group_by(Ball.bowler_id)
+        ),('wickets','runs_conceded','balls_bowled'))
+        return counters
+    @staticmethod
+    def _career_stats_dict(counters):
+        total_runs=counters['runs']
+        balls_faced=counters['balls_faced']
+        dismissals=counters['dismissals']
+        runs_conceded=counters['runs_conceded']
+        wickets=counters['wickets']
+        balls_bowled=counters['balls_bowled']
         return {
             'batting':{
                 'runs':total_runs,
@@ -61,8 +133,8 @@ class StatisticsService:
                 'dismissals':dismissals,
                 'average': round(total_runs/dismissals,2) if dismissals>0 else total_runs,
                 'strike_rate':round((total_runs/balls_faced)*100,2) if balls_faced>0 else 0,
-                'fours':sum(1 for b in batting_balls if b.runs_scored==4),
-                'sixes':sum(1 for b in batting_balls if b.runs_scored==6)
+                'fours':counters['fours'],
+                'sixes':counters['sixes']
             },
             'bowling':{
                 'wickets':wickets,
@@ -73,3 +145,20 @@ class StatisticsService:
                 'strike_rate':round(balls_bowled/wickets,2) if wickets>0 else 0
             }
         }
+    @staticmethod
+    def rebuild_career_stats():
+        """
+        Recompute every PlayerCareerStats row from the ball log in bulk
+        Run once after upgrading, or to repair drift; not while balls are being scored.
+        """
+        counters=StatisticsService.aggregate_career_counters()
+        now=datetime.utcnow()
+        rows=[dict(player_id=pid,updated_at=now,**values) for pid,values in counters.items() if pid is not None]
+        try:
+            PlayerCareerStats.query.delete(synchronize_session=False)
+            db.session.bulk_insert_mappings(PlayerCareerStats,rows)
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise ValueError(f"DataBase error:{str(e)}")
+        return len(rows)
\ No newline at end of file
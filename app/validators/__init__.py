@@ -1,8 +1,9 @@
 from .team_validator import TeamCreateSchema,TeamUpdateSchema
 from .player_validator import PlayerCreateSchema,PlayerUpdateSchema
 from .match_validator import MatchCreateSchema,TossRecordSchema
-from .ball_validator import BallRecordSchema,InningsStartSchema
+from .ball_validator import BallRecordSchema,BallBatchSchema,InningsStartSchema
 
 __all__=["TeamCreateSchema","TeamUpdateSchema",'PlayerCreateSchema','PlayerUpdateSchema','MatchCreateSchema','TossRecordSchema',
     'BallRecordSchema',
+    'BallBatchSchema',
     'InningsStartSchema']
\ No newline at end of file
@@ -1,4 +1,4 @@
-from marshmallow import Schema,fields,validates,ValidationError,validate
+from marshmallow import Schema,fields,validates,ValidationError,validate,EXCLUDE
 class BallRecordSchema(Schema):
     innings_id=fields.Int(required=True,error_messages={"required":"inning_id is required"})
     striker_id=fields.Int(required=True,error_messages={"required":"striker id is required"})
@@ -14,6 +14,12 @@ class BallRecordSchema(Schema):
     @validates("is_wicket")
     def validate_wicket_details(self, value, **kwargs):
         pass
+class BallBatchSchema(Schema):
+    """Envelope of a batch; each ball is loaded with BallRecordSchema"""
+    class Meta:
+        unknown=EXCLUDE
+    innings_id=fields.Int(load_default=None)
+    balls=fields.Raw(load_default=None)
 class InningsStartSchema(Schema):
     inning_number=fields.Int(required=True,validate=lambda x: 1<=x <=4)
     match_id=fields.Int(required=True)
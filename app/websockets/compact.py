@@ -0,0 +1,127 @@
+# app/websockets/compact.py
+"""
+Opt-in compact wire format for match_update frames.
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+WHY
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+score_update carries the whole Inning.to_dict() on every ball, but only
+runs/overs/updated_at (sometimes wickets/extras) change between deliveries.
+For a large audience that static part is most of the egress.
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+NEGOTIATION
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+  io(url, { auth: { protocol: "msgpack-delta" } })   (or ?protocol=msgpack-delta)
+
+The 'connected' ACK says which protocol was granted; JSON is the default
+and the fallback when msgpack isn't installed on the server. Compact
+clients are put in "match_<id>:compact" instead of "match_<id>" and get
+match_update as one binary attachment:
+
+  msgpack({ "seq": 17, "match_id": 42,
+            "events": [ ["ball_update",  {...}],
+                        ["score_update", {"id": 12, "base": "<updated_at>",
+                                          "total_runs": 91, "total_overs": 10.5,
+                                          "updated_at": "..."}] ] })
+
+  seq   frame counter per room, +1 per frame from this worker. A jump
+        means frames were dropped → re-join with last_ball_id.
+  base  updated_at of the score the delta applies to. A client holding a
+        different score (missed frame, or frames from another worker)
+        re-joins instead of applying it. A score_update without "base"
+        is a full innings dict (first update, or a new innings).
+        The "score" of a balls_update (offline batch) is encoded the
+        same way and is the base of the next delta.
+  catchup  true on a frame sent to one viewer that was too slow to get
+        the last frames: it carries what was missed (scores in full) and
+        the room's current seq, so the next room frame applies on top.
+
+match_joined / match_resumed stay JSON: they are sent once per join.
+"""
+
+import threading
+
+try:
+    import msgpack
+except ImportError:  # optional: compact clients fall back to JSON
+    msgpack = None
+
+
+PROTOCOL = 'msgpack-delta'
+
+_lock = threading.Lock()
+_last_score = {}   # compact room -> last full score_update sent (the delta base)
+_seq = {}          # compact room -> sequence number of the last frame
+
+
+def available() -> bool:
+    return msgpack is not None
+
+
+def compact_room(room: str) -> str:
+    return f"{room}:compact"
+
+
+def _delta(room: str, score: dict) -> dict:
+    previous = _last_score.get(room)
+    _last_score[room] = score
+    if previous is None or previous.get('id') != score.get('id'):
+        return score
+    delta = {key: value for key, value in score.items() if previous.get(key) != value}
+    delta['id'] = score['id']
+    delta['base'] = previous.get('updated_at')
+    return delta
+
+
+def _encode(room: str, event: str, data):
+    if event == 'score_update':
+        return _delta(room, data)
+    if event == 'balls_update':
+        return dict(data, score=_delta(room, data['score']))
+    return data
+
+
+def encode_frame(room: str, match_id: int, events: list) -> bytes:
+    """msgpack frame for the compact room of `room`; events are (event, data) pairs."""
+    room = compact_room(room)
+    with _lock:
+        seq = _seq[room] = _seq.get(room, 0) + 1
+        encoded = [[event, _encode(room, event, data)] for event, data in events]
+    return msgpack.packb({'seq': seq, 'match_id': match_id, 'events': encoded}, use_bin_type=True)
+
+
+def encode_catchup(room: str, match_id: int, events: list) -> bytes:
+    """msgpack frame for one viewer of the compact room, scores in full."""
+    with _lock:
+        seq = _seq.get(compact_room(room), 0)
+    return msgpack.packb({'seq': seq, 'match_id': match_id, 'catchup': True,
+                          'events': [[event, data] for event, data in events]}, use_bin_type=True)
+
+
+def idle(room: str) -> None:
+    """A frame no compact viewer got: the next score goes out in full."""
+    with _lock:
+        _last_score.pop(compact_room(room), None)
+
+
+def forget(room: str) -> None:
+    """Drop the delta base and sequence of a room whose match is over."""
+    room = compact_room(room)
+    with _lock:
+        _last_score.pop(room, None)
+        _seq.pop(room, None)
+
+
+def observe(room: str, events: list) -> None:
+    """
+    Track a score sent by another worker, so the next delta from this
+    worker is relative to what the clients actually hold.
+    """
+    room = compact_room(room)
+    with _lock:
+        for event, data in events:
+            if event == 'score_update':
+                _last_score[room] = data
+            elif event == 'balls_update':
+                _last_score[room] = data['score']
@@ -0,0 +1,153 @@
+# app/websockets/live_matches.py
+"""
+In-memory registry of live matches, one score line each, for the ticker.
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+WHY
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+The home-page widget shows every live match at once. Polling
+GET /matches/live and joining each match room costs a socket and a
+snapshot per match per viewer. join_ticker instead subscribes to ONE
+room fed from this registry, which is loaded from the DB once and then
+kept current by the match frames this worker sends or receives.
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+SCORE LINE
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+  { "match_id": 42, "status": "live", "innings": 2, "batting_team_id": 3,
+    "runs": 87, "wickets": 3, "overs": 10.4, "target": 181 }
+
+innings/runs/… are None before the first innings starts. A line whose
+status isn't "live" is the last one sent for that match: the client drops
+it from the widget.
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+LIFECYCLE
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+  lines()     All live lines; the first call on a worker reads the DB
+              (so does the first apply())
+  apply()     Fold a match_update frame in; returns the line if it changed
+  reload()    Re-read one match (innings started/completed, status change)
+
+Process-local (current_app.extensions['live_matches']), like the join
+snapshots.
+"""
+
+import threading
+
+from flask import current_app
+
+from app.models import Match
+from app.services import MatchService
+from app.websockets.snapshots import _get_live_innings
+
+
+TICKER_ROOM = 'ticker'
+
+
+class LiveMatches:
+    """Registry of score lines keyed by match id."""
+
+    _registry_lock = threading.Lock()
+
+    def __init__(self):
+        self.lines = None   # match_id -> score line; None until loaded
+
+    @classmethod
+    def current(cls) -> "LiveMatches":
+        registry = current_app.extensions.get('live_matches')
+        if registry is None:
+            with cls._registry_lock:
+                registry = current_app.extensions.setdefault('live_matches', cls())
+        return registry
+
+    @classmethod
+    def lines(cls) -> list:
+        registry = cls.current()
+        with cls._registry_lock:
+            if registry.lines is not None:
+                return [_public(line) for line in registry.lines.values()]
+        loaded = {match.id: _build_line(match) for match in MatchService.get_live_matches()}
+        with cls._registry_lock:
+            if registry.lines is None:
+                registry.lines = loaded
+            return [_public(line) for line in registry.lines.values()]
+
+    @classmethod
+    def apply(cls, match_id: int, events: list):
+        """
+        Score line after a frame of (event, data) pairs, or None if the line
+        didn't change. Events that start or end something reload the match.
+        Loads the registry if needed: ticker viewers on other workers rely
+        on this worker to send the lines of the balls it records.
+        """
+        registry = cls.current()
+        # Loaded now: the DB already holds this frame's changes, so the line
+        # won't look changed, but ticker viewers haven't seen it yet
+        loaded = registry.lines is None
+        if loaded:
+            cls.lines()
+        with cls._registry_lock:
+            line = registry.lines.get(match_id)
+            updated = dict(line) if line else None
+            reload = updated is None
+            for event, data in events:
+                if event in ('score_update', 'balls_update'):
+                    # A batch carries the innings after its last ball
+                    score = data['score'] if event == 'balls_update' else data
+                    if score.get('is_completed'):
+                        reload = True
+                    elif updated is not None:
+                        updated.update(_score(score))
+                elif event in ('innings_complete', 'match_status'):
+                    reload = True
+            if not reload:
+                if updated == line and not loaded:
+                    return None
+                registry.lines[match_id] = updated
+                return _public(updated)
+        return cls.reload(match_id)
+
+    @classmethod
+    def reload(cls, match_id: int):
+        """Re-read one match; returns its line (status != live once it is over)."""
+        registry = cls.current()
+        if registry.lines is None:
+            cls.lines()
+        match = Match.query.get(match_id)
+        if match is None:
+            return None
+        line = _build_line(match)
+        with cls._registry_lock:
+            if match.status == 'live':
+                registry.lines[match_id] = line
+            elif registry.lines.pop(match_id, None) is None:
+                return None  # wasn't on the ticker, nothing to retract
+        return _public(line)
+
+
+def _score(innings: dict) -> dict:
+    return {
+        'inning_id':       innings['id'],
+        'innings':         innings['innings_number'],
+        'batting_team_id': innings['batting_team_id'],
+        'runs':            innings['total_runs'],
+        'wickets':         innings['total_wickets'],
+        'overs':           innings['total_overs'],
+        'target':          innings['target'],
+    }
+
+
+def _build_line(match) -> dict:
+    innings = _get_live_innings(match.id)
+    line = {'match_id': match.id, 'status': match.status}
+    if innings is not None:
+        line.update(_score(innings.to_dict()))
+    else:
+        line.update(inning_id=None, innings=None, batting_team_id=None,
+                    runs=None, wickets=None, overs=None, target=None)
+    return line
+
+
+def _public(line: dict) -> dict:
+    return {key: value for key, value in line.items() if key != 'inning_id'}
@@ -22,32 +22,64 @@ SOCKET ROOMS
 Each live match gets its own room: "match_<id>"
   → emit to "match_42" reaches ONLY viewers of match 42
   → 1000 users watching 100 matches = zero cross-talk
+One more room, "ticker", carries a score line per live match for the
+home-page widget (app/websockets/live_matches.py).
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 EVENTS  (Server → Client)
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
   connected         ACK on initial WebSocket open
   match_joined      Full current state snapshot sent after join_match
+  match_resumed     Only the deliveries missed since last_ball_id (reconnect)
+  match_update      One frame per room carrying the events below, in order
+                    (binary msgpack + score deltas for clients that asked
+                    for it at connect — see app/websockets/compact.py):
+                    { "match_id": 42,
+                      "events": [ {"event": "ball_update",  "data": {...}},
+                                  {"event": "score_update", "data": {...}} ] }
+  ticker_joined     Score lines of all live matches, after join_ticker
+  ticker_update     One match's score line changed (at most once per frame)
+  error             Something went wrong
+
+EVENTS INSIDE match_update
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
   ball_update       New delivery recorded (runs, wicket, extras)
+  balls_update      Several deliveries recorded at once (offline batch replay)
   score_update      Innings total updated (runs/wickets/overs)
   innings_complete  An innings has ended (all-out or overs done)
   match_status      Match lifecycle change (live → completed/abandoned)
-  error             Something went wrong
+
+Everything one delivery produces (ball + score, sometimes innings/match
+status) is sent as ONE frame, encoded once for the whole room. Frames to a
+room are capped at one per MATCH_EMIT_INTERVAL seconds; events arriving
+in between wait for the next frame, and a newer score_update/match_status
+replaces the queued one instead of piling up.
 
 EVENTS  (Client → Server)
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
   join_match        Subscribe to a match room
   leave_match       Unsubscribe from a match room
+  join_ticker       Subscribe to the score lines of every live match
+  leave_ticker      Unsubscribe from the ticker
   ping_match        Health-check / latency probe
 """
 
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
 
-from flask import request
+from flask import request, current_app
 from flask_socketio import join_room, leave_room, emit
+from socketio import PubSubManager
 
 from app.extensions import db
-from app.models import Match, Inning, Ball
+from app.metrics import EMIT_SECONDS, register_collector
+from app.models import Inning, Ball, Player
+from app.websockets import compact
+from app.websockets.live_matches import LiveMatches, TICKER_ROOM
+from app.websockets.snapshots import MatchSnapshots
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -65,35 +97,6 @@ def _room(match_id: int) -> str:
     return f"match_{match_id}"
 
 
-def _get_live_innings(match_id: int):
-    """
-    Return the currently active (incomplete) innings for a match.
-    Returns None if the match hasn't started yet.
-    """
-    return (
-        Inning.query
-        .filter_by(match_id=match_id, is_complete=False)
-        .order_by(Inning.innings_number.desc())
-        .first()
-    )
-
-
-def _get_recent_balls(match_id: int, limit: int = 12) -> list[dict]:
-    """
-    Return the last `limit` deliveries for a match in chronological order.
-    Used to hydrate the ball feed when a client first joins.
-    """
-    balls = (
-        Ball.query
-        .join(Inning)
-        .filter(Inning.match_id == match_id)
-        .order_by(Ball.id.desc())
-        .limit(limit)
-        .all()
-    )
-    return [b.to_dict() for b in reversed(balls)]
-
-
 def _build_commentary(ball: "Ball") -> str:
     """
     Auto-generate a one-line commentary string for a delivery.
@@ -105,18 +108,20 @@ def _build_commentary(ball: "Ball") -> str:
     "SIX! Sharma pulls Shami over mid-wicket"
     "Dot ball. Bumrah to Sharma"
     """
-    batsman = ball.batsman.name if ball.batsman else "Batsman"
-    bowler  = ball.bowler.name  if ball.bowler  else "Bowler"
+    batsman = db.session.get(Player, ball.batsman_id)
+    bowler  = db.session.get(Player, ball.bowler_id)
+    batsman = batsman.name if batsman else "Batsman"
+    bowler  = bowler.name  if bowler  else "Bowler"
 
     if ball.is_wicket:
-        return f"WICKET! {bowler} gets {batsman} ({ball.dismissal_type or 'out'})"
+        return f"WICKET! {bowler} gets {batsman} ({ball.wicket_type or 'out'})"
     if ball.runs_scored == 6:
         return f"SIX! {bowler} to {batsman}"
     if ball.runs_scored == 4:
         return f"FOUR! {bowler} to {batsman}"
-    if ball.is_wide:
+    if ball.extra_type == 'wide':
         return f"Wide. {bowler} to {batsman}"
-    if ball.is_no_ball:
+    if ball.extra_type == 'no-ball':
         return f"No ball! {bowler} to {batsman}, {ball.runs_scored} run(s)"
     if ball.runs_scored == 0:
         return f"Dot ball. {bowler} to {batsman}"
@@ -138,25 +143,37 @@ def register_match_events(socketio):
     # ── CONNECTION LIFECYCLE ──────────────────────────────────────────────────
 
     @socketio.on('connect')
-    def handle_connect():
+    def handle_connect(auth=None):
         """
         Fires automatically the moment a client opens a WebSocket connection.
         `request.sid` is Socket.IO's unique session ID for this tab/client.
+
+        Wire protocol is negotiated here: { "protocol": "msgpack-delta" } in
+        the auth payload (or ?protocol=msgpack-delta) asks for compact frames.
         """
-        print(f"[WS] Client connected  sid={request.sid}")
+        requested = (auth or {}).get('protocol') if isinstance(auth, dict) else None
+        requested = requested or request.args.get('protocol')
+        protocol = 'json'
+        if requested == compact.PROTOCOL and compact.available():
+            _compact_sids.add(request.sid)
+            protocol = compact.PROTOCOL
+        current_app.logger.debug("[WS] Client connected  sid=%s  protocol=%s", request.sid, protocol)
         emit('connected', {
             'status': 'ok',
             'sid': request.sid,
+            'protocol': protocol,
             'message': 'Connected to Cricket live server',
         })
 
     @socketio.on('disconnect')
-    def handle_disconnect():
+    def handle_disconnect(reason=None):
         """
         Fires when a client closes their tab, loses network, or times out.
         Socket.IO automatically removes them from all rooms — no manual cleanup needed.
         """
-        print(f"[WS] Client disconnected  sid={request.sid}")
+        _compact_sids.discard(request.sid)
+        _forget(request.sid)
+        current_app.logger.debug("[WS] Client disconnected  sid=%s", request.sid)
 
     # ── ROOM MANAGEMENT ───────────────────────────────────────────────────────
 
@@ -168,35 +185,52 @@ def register_match_events(socketio):
         Expected payload
         ----------------
         { "match_id": 42 }
+        { "match_id": 42, "last_ball_id": 301 }    ← reconnecting client
 
         Server responds with
         --------------------
         'match_joined' event carrying the full current state so the UI
         is never blank while waiting for the next ball event.
+
+        A reconnecting client that sends the id of the last delivery it
+        saw gets 'match_resumed' instead — only the balls it missed plus
+        the live innings score:
+        { "match_id": 42, "missed_balls": [...], "current_innings": {...} }
+        If the gap is older than the in-memory feed it falls back to the
+        full 'match_joined' snapshot.
         """
         match_id = data.get('match_id')
+        last_ball_id = data.get('last_ball_id')
 
         if not match_id:
             emit('error', {'message': 'match_id is required'})
             return
 
-        match = Match.query.get(match_id)
-        if not match:
+        # Served from memory; only the first joiner (per match, per
+        # worker) pays for the queries — see app/websockets/snapshots.py
+        snapshot = MatchSnapshots.get(match_id)
+        if not snapshot:
             emit('error', {'message': f'Match {match_id} not found'})
             return
 
         room = _room(match_id)
+        if request.sid in _compact_sids:
+            room = compact.compact_room(room)
         join_room(room)
-        print(f"[WS] {request.sid} → joined {room}")
+        current_app.logger.debug("[WS] %s → joined %s", request.sid, room)
+
+        if isinstance(last_ball_id, int):
+            missed = MatchSnapshots.since(match_id, last_ball_id)
+            if missed is not None:
+                emit('match_resumed', {
+                    'match_id':        match_id,
+                    'missed_balls':    missed,
+                    'current_innings': snapshot['current_innings'],
+                })
+                return
 
         # Send a state snapshot immediately (avoids blank UI on first connect)
-        current_innings = _get_live_innings(match_id)
-        emit('match_joined', {
-            'match_id':       match_id,
-            'match':          match.to_dict(),
-            'current_innings': current_innings.to_dict() if current_innings else None,
-            'recent_balls':   _get_recent_balls(match_id, limit=12),
-        })
+        emit('match_joined', snapshot)
 
     @socketio.on('leave_match')
     def handle_leave_match(data):
@@ -211,9 +245,31 @@ def register_match_events(socketio):
         if match_id:
             room = _room(match_id)
             leave_room(room)
-            print(f"[WS] {request.sid} ← left {room}")
+            leave_room(compact.compact_room(room))
+            _forget(request.sid, room)
+            current_app.logger.debug("[WS] %s ← left %s", request.sid, room)
             emit('match_left', {'match_id': match_id})
 
+    @socketio.on('join_ticker')
+    def handle_join_ticker(data=None):
+        """
+        Client subscribes to the live-match ticker (home-page widget).
+
+        Server responds with
+        --------------------
+        'ticker_joined' { "matches": [ {score line}, ... ] }  then one
+        'ticker_update' {score line} whenever a match's line changes.
+        Served from memory — no per-join DB query on a warm worker.
+        """
+        join_room(TICKER_ROOM)
+        emit('ticker_joined', {'matches': LiveMatches.lines()})
+        current_app.logger.debug("[WS] %s → joined %s", request.sid, TICKER_ROOM)
+
+    @socketio.on('leave_ticker')
+    def handle_leave_ticker(data=None):
+        leave_room(TICKER_ROOM)
+        current_app.logger.debug("[WS] %s ← left %s", request.sid, TICKER_ROOM)
+
     # ── UTILITY ───────────────────────────────────────────────────────────────
 
     @socketio.on('ping_match')
@@ -232,6 +288,376 @@ def register_match_events(socketio):
         })
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# LIVE CACHES
+# Every emitter keeps this worker's join snapshot / ball feed current; with a
+# message queue, the same events arriving from other workers do it too.
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _update_live_caches(event: str, match_id: int, payload: dict = None) -> None:
+    if event == 'ball_update':
+        MatchSnapshots.add_balls(match_id, [payload])
+    elif event == 'balls_update':
+        MatchSnapshots.add_balls(match_id, payload['balls'])
+        _update_live_caches('score_update', match_id, payload['score'])
+    elif event == 'score_update':
+        if payload['is_completed']:
+            MatchSnapshots.invalidate(match_id)
+        else:
+            MatchSnapshots.set_innings(match_id, payload)
+    elif event in ('innings_complete', 'match_status'):
+        MatchSnapshots.invalidate(match_id)
+
+
+_LAST_INNINGS = 2   # InningsService._check_match_completion decides the result after two innings
+_FINISHED = {'completed', 'abandoned'}
+
+
+def _ends_match(events: list) -> bool:
+    return any(
+        (event == 'match_status' and data.get('status') in _FINISHED)
+        or (event == 'innings_complete' and data.get('innings_number', 0) >= _LAST_INNINGS)
+        for event, data in events
+    )
+
+
+def _forget_match(match_id: int) -> None:
+    """
+    The match is over: drop what this worker holds per match, once its last
+    frame is out. A later join (or a status corrected by hand) starts afresh.
+    """
+    MatchSnapshots.forget(match_id)
+    compact.forget(_room(match_id))
+    with _frames_lock:
+        _last_frame_at.pop(_room(match_id), None)
+    with _backlogs_lock:
+        for target in (_room(match_id), compact.compact_room(_room(match_id))):
+            _last_scan.pop(target, None)
+
+
+def apply_remote_emit(event: str, payload, room: str) -> None:
+    """
+    Apply an emit published by another worker to this worker's caches.
+    Called by the message-queue client manager (app/websockets/message_queue.py).
+    """
+    if not isinstance(room, str) or not room.startswith('match_'):
+        return
+    try:
+        match_id = int(room[len('match_'):])
+    except ValueError:
+        return
+    if event == 'match_update':
+        events = [(item['event'], item['data']) for item in payload.get('events', ())]
+        for name, data in events:
+            _update_live_caches(name, match_id, data)
+        compact.observe(room, events)
+        LiveMatches.apply(match_id, events)
+        if _ends_match(events):
+            _forget_match(match_id)
+    else:
+        _update_live_caches(event, match_id, payload)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# EMIT SCHEDULER
+# Emitters hand their event to _schedule_emit() instead of emitting it.
+# Events are merged into match_update frames and sent at most once per
+# MATCH_EMIT_INTERVAL per room.
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Only the latest of these matters to a viewer: a newer one replaces a queued one
+_LATEST_ONLY = {'score_update', 'match_status'}
+
+_frames_lock = threading.Lock()
+_pending_frames = {}   # room -> events waiting for a scheduled flush
+_last_frame_at = {}    # room -> time.monotonic() of the last frame sent
+_open_frame = ContextVar('open_match_frame', default=None)
+_compact_sids = set()  # sids that negotiated compact.PROTOCOL at connect
+
+
+@contextmanager
+def coalesce(socketio_instance, match_id: int):
+    """
+    Collect every event emitted inside the block into one frame.
+
+        with coalesce(socketio, match_id):
+            emit_ball_update(socketio, match_id, ball)
+            emit_score_update(socketio, match_id, innings)
+    """
+    frame = []
+    token = _open_frame.set((match_id, frame))
+    try:
+        yield
+    finally:
+        _open_frame.reset(token)
+        if frame:
+            _schedule_frame(socketio_instance, match_id, frame)
+
+
+def _merge(queued: list, events: list) -> None:
+    for event, data in events:
+        if event in _LATEST_ONLY:
+            queued[:] = [
+                (e, d) for e, d in queued
+                if e != event or (event == 'score_update' and d.get('id') != data.get('id'))
+            ]
+        queued.append((event, data))
+
+
+def _has_audience(server, room: str) -> bool:
+    """Whether an emit to `room` can reach anyone: a member on this worker,
+    or, behind a message queue, possibly one on another worker."""
+    if isinstance(server.manager, PubSubManager):
+        return True
+    return bool(server.manager.rooms.get('/', {}).get(room))
+
+
+def _send_frame(socketio_instance, match_id: int, events: list) -> None:
+    started = time.perf_counter()
+    room = _room(match_id)
+    _hold_back(socketio_instance.server, match_id, events)
+    socketio_instance.emit('match_update', {
+        'match_id': match_id,
+        'events':   [{'event': event, 'data': data} for event, data in events],
+    }, room=room, skip_sid=_held_back(room))
+    if compact.available():
+        target = compact.compact_room(room)
+        if _has_audience(socketio_instance.server, target):
+            socketio_instance.emit('match_update', compact.encode_frame(room, match_id, events),
+                                   room=target, skip_sid=_held_back(target))
+        else:
+            compact.idle(room)   # nobody opted in: no delta, no msgpack
+    line = LiveMatches.apply(match_id, events)
+    if line is not None:
+        socketio_instance.emit('ticker_update', line, room=TICKER_ROOM)
+    if _ends_match(events):
+        _forget_match(match_id)
+    EMIT_SECONDS.observe(time.perf_counter() - started)
+
+
+def _flush_later(app, socketio_instance, match_id: int, delay: float) -> None:
+    socketio_instance.sleep(delay)
+    room = _room(match_id)
+    with _frames_lock:
+        events = _pending_frames.pop(room, None)
+        _last_frame_at[room] = time.monotonic()
+    if events:
+        with app.app_context():
+            _send_frame(socketio_instance, match_id, events)
+
+
+def _schedule_frame(socketio_instance, match_id: int, events: list) -> None:
+    interval = current_app.config.get('MATCH_EMIT_INTERVAL', 0)
+    room = _room(match_id)
+    with _frames_lock:
+        queued = _pending_frames.get(room)
+        if queued is not None:
+            _merge(queued, events)  # the flush already scheduled will carry it
+            return
+        now = time.monotonic()
+        wait = _last_frame_at.get(room, float('-inf')) + interval - now
+        if wait <= 0:
+            _last_frame_at[room] = now
+        else:
+            _pending_frames[room] = []
+            _merge(_pending_frames[room], events)
+    if wait <= 0:
+        _send_frame(socketio_instance, match_id, events)
+    else:
+        socketio_instance.start_background_task(_flush_later, current_app._get_current_object(),
+                                                  socketio_instance, match_id, wait)
+
+
+def _schedule_emit(socketio_instance, match_id: int, event: str, data) -> None:
+    open_frame = _open_frame.get()
+    if open_frame is not None and open_frame[0] == match_id:
+        open_frame[1].append((event, data))
+    else:
+        _schedule_frame(socketio_instance, match_id, [(event, data)])
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SLOW CONSUMERS
+# A viewer with more than WS_CLIENT_QUEUE_LIMIT packets waiting in its
+# socket is skipped by room frames, so a bad connection can't grow memory
+# without bound. What it missed waits in a per-viewer backlog: score and
+# status updates collapse to the latest (same rule as the scheduler), ball
+# and lifecycle events are kept up to WS_CLIENT_BACKLOG_LIMIT. On the first
+# frame after its socket drained it gets the backlog as one match_update
+# (then the frame itself); if the backlog overflowed, a match_joined
+# snapshot instead.
+# Every viewer of a room is checked at most once per WS_SLOW_SCAN_INTERVAL;
+# the frames in between only re-check the viewers already held back, so a
+# frame costs O(slow viewers), not O(room).
+# Compact viewers are tracked from the JSON frame of the same room, which
+# is always sent first.
+# ─────────────────────────────────────────────────────────────────────────────
+
+_backlogs_lock = threading.Lock()
+_backlogs = {}   # room -> {sid: events held back, or None when it needs a resync}
+_last_scan = {}  # room -> time.monotonic() of its last full check
+_slow_counters = {'frames_held_back': 0, 'catch_ups': 0, 'resyncs': 0}
+_SLOW_COUNTER_HELP = {
+    'frames_held_back': 'Room frames held back from a slow viewer',
+    'catch_ups': 'Slow viewers caught up from their backlog',
+    'resyncs': 'Slow viewers resent a full snapshot after overflowing their backlog',
+}
+
+
+def _queue_depth(server, eio_sid) -> int:
+    """
+    Packets waiting in a client's engine.io socket. The one place that reads
+    engine.io internals: if they are missing or changed, every viewer counts
+    as drained and frames go out as if the check were disabled.
+    """
+    try:
+        socket = server.eio.sockets.get(eio_sid)
+        return socket.queue.qsize() if socket is not None else 0
+    except (AttributeError, NotImplementedError):
+        return 0
+
+
+def _held_back(room: str) -> list:
+    with _backlogs_lock:
+        return list(_backlogs.get(room, ()))
+
+
+def _hold_back(server, match_id: int, events: list) -> None:
+    """
+    Before a frame goes out: park it for this worker's slow viewers of the
+    match, and send drained viewers what they missed.
+    """
+    limit = current_app.config.get('WS_CLIENT_QUEUE_LIMIT', 0)
+    if not limit:
+        return
+    backlog_limit = current_app.config.get('WS_CLIENT_BACKLOG_LIMIT', 60)
+    interval = current_app.config.get('WS_SLOW_SCAN_INTERVAL', 1.0)
+    room = _room(match_id)
+    now = time.monotonic()
+    catch_ups = []
+    for target in (room, compact.compact_room(room)):
+        with _backlogs_lock:
+            known = list(_backlogs.get(target, ()))
+            scan = now - _last_scan.get(target, -interval) >= interval
+            if scan:
+                _last_scan[target] = now
+        # Queue depths are read outside the lock
+        if scan:
+            viewers = server.manager.get_participants('/', target)
+        else:
+            viewers = [(sid, server.manager.eio_sid_from_sid(sid, '/')) for sid in known]
+        slow = {sid for sid, eio_sid in viewers if _queue_depth(server, eio_sid) > limit}
+        with _backlogs_lock:
+            backlogs = _backlogs.get(target, {})
+            for sid in slow:
+                _slow_counters['frames_held_back'] += 1
+                backlog = backlogs.get(sid, [])
+                if backlog is not None:
+                    _merge(backlog, events)
+                    if len(backlog) > backlog_limit:
+                        backlog = None
+                backlogs[sid] = backlog
+            for sid in known:
+                if sid not in slow and sid in backlogs:
+                    catch_ups.append((target, sid, backlogs.pop(sid)))
+            if backlogs:
+                _backlogs[target] = backlogs
+            else:
+                _backlogs.pop(target, None)
+    for target, sid, backlog in catch_ups:
+        _catch_up(server, match_id, target, sid, backlog)
+
+
+def _catch_up(server, match_id: int, target: str, sid: str, backlog) -> None:
+    if backlog is None:
+        # Too far behind: the snapshot already includes the current frame,
+        # so a client applying deliveries by id ignores the overlap
+        with _backlogs_lock:
+            _slow_counters['resyncs'] += 1
+        snapshot = MatchSnapshots.get(match_id)
+        if snapshot is not None:
+            server.emit('match_joined', snapshot, to=sid)
+        return
+    with _backlogs_lock:
+        _slow_counters['catch_ups'] += 1
+    if target != _room(match_id):
+        server.emit('match_update', compact.encode_catchup(_room(match_id), match_id, backlog), to=sid)
+    else:
+        server.emit('match_update', {
+            'match_id': match_id,
+            'events':   [{'event': event, 'data': data} for event, data in backlog],
+        }, to=sid)
+
+
+def _forget(sid: str, room: str = None) -> None:
+    with _backlogs_lock:
+        for target in ([room, compact.compact_room(room)] if room else list(_backlogs)):
+            backlogs = _backlogs.get(target)
+            if backlogs is not None:
+                backlogs.pop(sid, None)
+                if not backlogs:
+                    del _backlogs[target]
+
+
+def hold_back_remote(server, event: str, payload, room: str) -> list:
+    """
+    Sids of this worker to skip for an emit published by another worker.
+    `payload` is None for a binary (compact) frame. Called by the
+    message-queue client manager before it delivers the emit.
+    """
+    if event != 'match_update' or not isinstance(room, str) or not room.startswith('match_'):
+        return []
+    if payload is not None:
+        events = [(item['event'], item['data']) for item in payload.get('events', ())]
+        _hold_back(server, payload['match_id'], events)
+    return _held_back(room)
+
+
+def live_socket_stats(server) -> dict:
+    """Outbound queue depths and slow-viewer counters of this worker."""
+    connected = list(server.manager.rooms.get('/', {}).get(None, {}).values())
+    depths = [_queue_depth(server, eio_sid) for eio_sid in connected]
+    with _backlogs_lock:
+        held = [backlog for backlogs in _backlogs.values() for backlog in backlogs.values()]
+        counters = dict(_slow_counters)
+    return dict(
+        counters,
+        connections=len(depths),
+        queue_depth_max=max(depths, default=0),
+        queue_depth_total=sum(depths),
+        slow_viewers=len(held),
+        backlog_events=sum(len(backlog) for backlog in held if backlog is not None),
+        awaiting_resync=sum(1 for backlog in held if backlog is None),
+    )
+
+
+@register_collector
+def _socket_metrics():
+    """Scrape-time room sizes and live_socket_stats() for /metrics."""
+    from app.extensions import socketio
+    server = socketio.server
+    if server is None:
+        return []
+    rooms = server.manager.rooms.get('/', {})
+    sizes = [({'room': room}, len(members)) for room, members in list(rooms.items())
+             if room is not None and (room.startswith('match_') or room == TICKER_ROOM)]
+    stats = live_socket_stats(server)
+    gauges = [
+        ('cricket_ws_room_clients', 'gauge', 'Clients joined to each match/ticker room', sizes),
+        ('cricket_ws_connections', 'gauge', 'Open Socket.IO connections', [({}, stats['connections'])]),
+        ('cricket_ws_queue_depth_max', 'gauge', 'Largest outbound packet queue of one client',
+         [({}, stats['queue_depth_max'])]),
+        ('cricket_ws_queue_depth', 'gauge', 'Outbound packets queued across clients',
+         [({}, stats['queue_depth_total'])]),
+        ('cricket_ws_slow_viewers', 'gauge', 'Viewers skipped by room frames until they drain',
+         [({}, stats['slow_viewers'])]),
+    ]
+    counters = [(f'cricket_ws_{name}_total', 'counter', help, [({}, stats[name])])
+                for name, help in _SLOW_COUNTER_HELP.items()]
+    return gauges + counters
+
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # SERVER-SIDE EMITTERS
 # Called from app/routes/api/balls.py (and other routes) — NOT by clients.
@@ -262,8 +688,45 @@ def emit_ball_update(socketio_instance, match_id: int, ball: "Ball") -> None:
     payload = ball.to_dict()
     payload['commentary'] = _build_commentary(ball)
 
-    socketio_instance.emit('ball_update', payload, room=room)
-    print(f"[WS] ball_update → {room}  runs={payload['runs_scored']}")
+    _schedule_emit(socketio_instance, match_id, 'ball_update', payload)
+    _update_live_caches('ball_update', match_id, payload)
+    current_app.logger.debug("[WS] ball_update → %s  runs=%s", room, payload['runs_scored'])
+
+
+def emit_balls_update(
+    socketio_instance,
+    match_id: int,
+    balls: list,
+    score: dict,
+) -> None:
+    """
+    Broadcast a batch of deliveries as ONE coalesced update.
+
+    Used when a scorer's tablet comes back online and replays the balls it
+    recorded offline — viewers get a single event instead of 30–60
+    ball_update/score_update pairs.
+
+    Args
+    ----
+    score : dict
+        Inning.to_dict() after the last ball of the batch — the same payload
+        as score_update, so is_completed / extras / updated_at travel with it
+        { "id": 12, "total_runs": 87, "total_wickets": 3, "total_overs": 10.4,
+          "extras": 6, "is_completed": false, ... }
+
+    A batch that ends the innings is followed by emit_innings_complete().
+
+    Called by: app/routes/api/balls.py  after a batch is committed to DB.
+    """
+    room    = _room(match_id)
+    payload = {
+        'match_id': match_id,
+        'balls':    [b.to_dict() for b in balls],
+        'score':    score,
+    }
+    _schedule_emit(socketio_instance, match_id, 'balls_update', payload)
+    _update_live_caches('balls_update', match_id, payload)
+    current_app.logger.debug("[WS] balls_update → %s  balls=%s", room, len(balls))
 
 
 def emit_score_update(socketio_instance, match_id: int, innings: "Inning") -> None:
@@ -274,7 +737,9 @@ def emit_score_update(socketio_instance, match_id: int, innings: "Inning") -> No
 
     Called by: app/routes/api/balls.py  immediately after emit_ball_update.
     """
-    socketio_instance.emit('score_update', innings.to_dict(), room=_room(match_id))
+    payload = innings.to_dict()
+    _schedule_emit(socketio_instance, match_id, 'score_update', payload)
+    _update_live_caches('score_update', match_id, payload)
 
 
 def emit_innings_complete(
@@ -294,12 +759,14 @@ def emit_innings_complete(
     Called by: app/routes/api/balls.py  when _check_innings_complete() returns True.
     """
     room = _room(match_id)
-    socketio_instance.emit('innings_complete', {
+    # Caches first: sending the frame that ends the match forgets it
+    _update_live_caches('innings_complete', match_id)
+    _schedule_emit(socketio_instance, match_id, 'innings_complete', {
         'match_id':       match_id,
         'innings_number': innings_number,
         'final_score':    final_score,
-    }, room=room)
-    print(f"[WS] innings_complete → {room}  innings={innings_number}")
+    })
+    current_app.logger.debug("[WS] innings_complete → %s  innings=%s", room, innings_number)
 
 
 def emit_match_status_change(
@@ -325,9 +792,22 @@ def emit_match_status_change(
     Called by: app/routes/api/balls.py  when match.status changes.
     """
     room = _room(match_id)
-    socketio_instance.emit('match_status', {
+    _update_live_caches('match_status', match_id)
+    _schedule_emit(socketio_instance, match_id, 'match_status', {
         'match_id':       match_id,
         'status':         new_status,
         'result_summary': result_summary,
-    }, room=room)
-    print(f"[WS] match_status → {room}  status={new_status}")
\ No newline at end of file
+    })
+    current_app.logger.debug("[WS] match_status → %s  status=%s", room, new_status)
+
+
+def emit_ticker_line(socketio_instance, match_id: int) -> None:
+    """
+    Re-read a match's score line and send it to the ticker, for changes
+    that don't go through a match_update frame (an innings starting).
+
+    Called by: app/routes/api/balls.py  after an innings is started.
+    """
+    line = LiveMatches.reload(match_id)
+    if line is not None:
+        socketio_instance.emit('ticker_update', line, room=TICKER_ROOM)
@@ -0,0 +1,139 @@
+# app/websockets/message_queue.py
+"""
+Message-queue backends for running several Socket.IO workers.
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+WHY
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Without a queue, socketio.emit(..., room="match_42") only reaches the
+clients connected to the process that recorded the ball. With a queue,
+every worker publishes its emits on a shared channel and every worker
+delivers them to its own clients in the room.
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+CONFIG  (SOCKETIO_MESSAGE_QUEUE)
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+  None / ""          single worker, no queue (default, and what the
+                     Flask-SocketIO test client requires)
+  redis://host:6379  Redis pub/sub — production
+  kafka://… / zmq+…  other python-socketio backends
+  amqp://…           anything else goes to Kombu
+  memory://          in-process stand-in: several Server instances in ONE
+                     process share a channel. For tests and
+                     scripts/bench_socket_fanout.py; it can't span processes.
+
+Running N workers
+-----------------
+Each worker is a separate process with the same SOCKETIO_MESSAGE_QUEUE,
+e.g. one `gunicorn -k eventlet -w 1 -b :500N run:app` per port behind a
+load balancer with sticky sessions (long-polling needs every request of a
+session on the same worker). With Redis the eventlet worker must be
+monkey patched; gunicorn's eventlet worker does that.
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+LIVE CACHES
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+The join snapshot and ball feed (app/websockets/snapshots.py) are per
+worker and are kept current by the emitters of the worker that scored
+the ball. Managers built here also apply emits received from other
+workers to the local caches (see apply_remote_emit in match_socket.py),
+so a fan joining on any worker gets the same snapshot, and hold them
+back from slow viewers of this worker (see SLOW CONSUMERS there).
+"""
+
+import json
+import threading
+
+import socketio
+
+
+class InProcessManager(socketio.PubSubManager):
+    """
+    Pub/sub between Socket.IO servers living in the same process.
+
+    Messages are JSON encoded on publish, like the Redis backend, so
+    anything that would not survive the real queue fails here too.
+    """
+
+    name = 'memory'
+    _channels = {}
+    _channels_lock = threading.Lock()
+
+    def __init__(self, url='memory://', channel='socketio', write_only=False, logger=None, json=None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger, json=json)
+        self.inbox = None
+
+    def initialize(self):
+        if not self.write_only:
+            self.inbox = self.server.eio.create_queue()
+            with self._channels_lock:
+                self._channels.setdefault(self.channel, []).append(self.inbox)
+        super().initialize()
+
+    def _publish(self, data):
+        message = self.json.dumps(data)
+        with self._channels_lock:
+            inboxes = list(self._channels.get(self.channel, ()))
+        for inbox in inboxes:
+            inbox.put(message)
+
+    def _listen(self):
+        while True:
+            yield self.inbox.get()
+
+
+class _LiveCacheSync:
+    """
+    Mixin for a PubSubManager: for an emit that came from another worker,
+    hold it back from this worker's slow viewers, then apply it to this
+    worker's snapshot/feed caches once delivered.
+    """
+
+    app = None
+
+    def _handle_emit(self, message):
+        if self.app is None or message.get('host_id') == self.host_id:
+            # local emits already did both in the emitter
+            return super()._handle_emit(message)
+        from app.websockets.match_socket import apply_remote_emit, hold_back_remote
+        data = message.get('data')
+        plain = not message.get('binary') and isinstance(data, list) and len(data) == 1
+        with self.app.app_context():
+            held = hold_back_remote(self.server, message.get('event'),
+                                    data[0] if plain else None, message.get('room'))
+        if held:
+            skip = message.get('skip_sid') or []
+            message = dict(message, skip_sid=(skip if isinstance(skip, list) else [skip]) + held)
+        super()._handle_emit(message)
+        if plain:
+            with self.app.app_context():
+                apply_remote_emit(message.get('event'), data[0], message.get('room'))
+
+
+def _queue_class(url: str):
+    if url.startswith('memory://'):
+        return InProcessManager
+    if url.startswith(('redis://', 'rediss://', 'valkey://', 'valkeys://', 'unix://')):
+        return socketio.RedisManager
+    if url.startswith('kafka://'):
+        return socketio.KafkaManager
+    if url.startswith('zmq'):
+        return socketio.ZmqManager
+    return socketio.KombuManager
+
+
+def create_client_manager(url: str, channel: str = 'flask-socketio', app=None):
+    """
+    Client manager for SOCKETIO_MESSAGE_QUEUE, or None for a single worker.
+
+    Always passed to socketio.init_app explicitly: the SocketIO extension
+    object is shared, and a manager left over from a previous app must not
+    leak into one configured without a queue.
+    """
+    if not url:
+        return None
+    base = _queue_class(url)
+    manager_class = type(f'LiveCache{base.__name__}', (_LiveCacheSync, base), {})
+    manager = manager_class(url, channel=channel)
+    manager.app = app
+    return manager
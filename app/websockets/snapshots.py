@@ -0,0 +1,262 @@
+# app/websockets/snapshots.py
+"""
+In-memory cache of the `match_joined` snapshot, one per match.
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+WHY
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+When a big match starts thousands of fans call join_match within a few
+seconds. Building the snapshot costs a Match lookup, a live-innings query
+and a recent-balls join — per client. The snapshot is identical for every
+viewer, so it is built once per match and served from memory.
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+TWO PARTS
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+  header   match + live innings dicts. Cheap to rebuild (two PK-ish
+           queries), so it is invalidated freely and expires after
+           MATCH_SNAPSHOT_TTL seconds.
+  feed     ring buffer of the last LIVE_FEED_SIZE serialised deliveries
+           of the match (a deque with maxlen). Filled by the ball emit
+           path; read from the DB only on a cold start (first join after
+           the worker started). It survives header invalidation, so the
+           ball→inning join never runs on a warm worker.
+
+match_joined = header + the last RECENT_BALLS entries of the feed.
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+LIFECYCLE
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+  get()          Cached snapshot, or build the missing part (single-flight:
+                 one rebuild per match at a time, concurrent joiners wait)
+  since()        Feed entries after a ball id, for reconnect backfill
+  add_balls()    emit_ball_update / emit_balls_update append the deliveries
+  set_innings()  emit_score_update / emit_balls_update replace the live innings
+  invalidate()   innings/match lifecycle changes (next join rebuilds the header)
+  forget()       the match is over: drop everything held for it
+
+Headers are replaced, never mutated in place, and get() hands out a new
+dict, so a payload handed to emit() can't change while it is being
+serialised.
+
+The cache is process-local (current_app.extensions['match_snapshots']);
+each worker builds its own copy.
+"""
+
+import threading
+import time
+from collections import deque
+from itertools import islice
+
+from flask import current_app
+
+from app.metrics import CACHE_REQUESTS
+
+from app.models import Match, Inning, Ball
+
+
+RECENT_BALLS = 12
+
+_HIT, _MISS = CACHE_REQUESTS.labels('snapshot', 'hit'), CACHE_REQUESTS.labels('snapshot', 'miss')
+
+
+class MatchSnapshots:
+    """Registry of cached headers and feeds plus the per-match rebuild locks."""
+
+    _registry_lock = threading.Lock()
+
+    def __init__(self):
+        self.snapshots = {}         # match_id -> (built_at, header dict)
+        self.feeds = {}             # match_id -> deque of ball payloads, oldest first
+        self.locks = {}             # match_id -> Lock held while rebuilding
+        # match_id -> bumped by changes that may race a rebuild of that part
+        self.generations = {}
+        self.feed_generations = {}
+        self.epoch = 0              # bumped by forget(), which drops generations
+
+    # ── registry ─────────────────────────────────────────────────────────────
+
+    @classmethod
+    def current(cls) -> "MatchSnapshots":
+        registry = current_app.extensions.get('match_snapshots')
+        if registry is None:
+            with cls._registry_lock:
+                registry = current_app.extensions.setdefault('match_snapshots', cls())
+        return registry
+
+    @classmethod
+    def get(cls, match_id: int):
+        """Snapshot for a match, or None if the match doesn't exist."""
+        return cls.current()._get(match_id)
+
+    @classmethod
+    def since(cls, match_id: int, last_ball_id: int):
+        """
+        Deliveries after `last_ball_id`, or None when the feed can't prove it
+        holds all of them (gap older than the ring buffer, or feed cold).
+        """
+        registry = cls.current()
+        with cls._registry_lock:
+            feed = registry.feeds.get(match_id)
+            if feed is None:
+                return None
+            # A full buffer has dropped older balls: the client must already
+            # hold the oldest one we still have, or something is missing
+            if len(feed) == feed.maxlen and last_ball_id < feed[0]['id']:
+                return None
+            return [payload for payload in feed if payload['id'] > last_ball_id]
+
+    @classmethod
+    def add_balls(cls, match_id: int, payloads: list) -> None:
+        cls.current()._update(match_id, balls=payloads)
+
+    @classmethod
+    def set_innings(cls, match_id: int, innings: dict) -> None:
+        cls.current()._update(match_id, innings=innings)
+
+    @classmethod
+    def invalidate(cls, match_id: int) -> None:
+        registry = cls.current()
+        with cls._registry_lock:
+            registry.snapshots.pop(match_id, None)
+            _bump(registry.generations, match_id)
+
+    @classmethod
+    def forget(cls, match_id: int) -> None:
+        """Drop the header, feed, lock and generations of a finished match."""
+        registry = cls.current()
+        with cls._registry_lock:
+            for entries in (registry.snapshots, registry.feeds, registry.locks,
+                            registry.generations, registry.feed_generations):
+                entries.pop(match_id, None)
+            # A rebuild in flight compared against the dropped generation
+            registry.epoch += 1
+
+    # ── internals ────────────────────────────────────────────────────────────
+
+    def _fresh(self, match_id: int):
+        entry = self.snapshots.get(match_id)
+        if entry is None:
+            return None
+        built_at, header = entry
+        if time.monotonic() - built_at > current_app.config.get('MATCH_SNAPSHOT_TTL', 30):
+            return None
+        return header
+
+    def _compose(self, match_id: int, header=None):
+        with self._registry_lock:
+            header = header or self._fresh(match_id)
+            feed = self.feeds.get(match_id)
+            if header is None or feed is None:
+                return None
+            recent = list(islice(feed, max(len(feed) - RECENT_BALLS, 0), None))
+        return dict(header, recent_balls=recent)
+
+    def _generation(self, generations: dict, match_id: int):
+        return generations.get(match_id, 0), self.epoch
+
+    def _get(self, match_id: int):
+        snapshot = self._compose(match_id)
+        if snapshot is not None:
+            _HIT.inc()
+            return snapshot
+        _MISS.inc()
+        with self._registry_lock:
+            lock = self.locks.setdefault(match_id, threading.Lock())
+        with lock:
+            # Whoever held the lock before us may have just built it
+            header = self._fresh(match_id)
+            if header is None:
+                generation = self._generation(self.generations, match_id)
+                header = _build_header(match_id)
+                if header is None:
+                    with self._registry_lock:
+                        self.locks.pop(match_id, None)  # unknown ids must not pile up
+                    return None
+                with self._registry_lock:
+                    # An invalidate() during the build means it may already be
+                    # stale: serve it to this caller, but don't cache it
+                    if self._generation(self.generations, match_id) == generation:
+                        self.snapshots[match_id] = (time.monotonic(), header)
+            if match_id not in self.feeds:
+                generation = self._generation(self.feed_generations, match_id)
+                size = current_app.config.get('LIVE_FEED_SIZE', 120)
+                feed = deque(_get_recent_balls(match_id, limit=size), maxlen=size)
+                with self._registry_lock:
+                    if self._generation(self.feed_generations, match_id) != generation:
+                        # A ball was emitted while we read: this copy may miss it
+                        return dict(header, recent_balls=list(feed)[-RECENT_BALLS:])
+                    self.feeds[match_id] = feed
+            return self._compose(match_id, header)
+
+    def _update(self, match_id: int, balls: list = None, innings: dict = None) -> None:
+        with self._registry_lock:
+            if balls:
+                feed = self.feeds.get(match_id)
+                if feed is None:
+                    # Cold: the next join reads the DB. Keep a read that is
+                    # already in flight (and may predate this ball) from caching
+                    _bump(self.feed_generations, match_id)
+                else:
+                    for payload in balls:
+                        # Ball ids only grow within a match; skip what a
+                        # concurrent hydration already read
+                        if not feed or payload['id'] > feed[-1]['id']:
+                            feed.append(payload)
+            entry = self.snapshots.get(match_id)
+            if entry is None:
+                # Nothing cached, but a build may be in flight that read the
+                # DB before this change was committed: keep it from caching
+                _bump(self.generations, match_id)
+                return
+            built_at, header = entry
+            header = dict(header)
+            if innings is not None:
+                header['current_innings'] = innings
+            self.snapshots[match_id] = (built_at, header)
+
+
+def _bump(generations: dict, match_id: int) -> None:
+    generations[match_id] = generations.get(match_id, 0) + 1
+
+
+def _get_live_innings(match_id: int):
+    """
+    Return the currently active (incomplete) innings for a match.
+    Returns None if the match hasn't started yet.
+    """
+    return (
+        Inning.query
+        .filter_by(match_id=match_id, is_completed=False)
+        .order_by(Inning.innings_number.desc())
+        .first()
+    )
+
+
+def _get_recent_balls(match_id: int, limit: int = RECENT_BALLS) -> list[dict]:
+    """
+    Return the last `limit` deliveries for a match in chronological order.
+    Used to hydrate the feed on a cold start.
+    """
+    balls = (
+        Ball.query
+        .join(Inning)
+        .filter(Inning.match_id == match_id)
+        .order_by(Ball.id.desc())
+        .limit(limit)
+        .all()
+    )
+    return [b.to_dict() for b in reversed(balls)]
+
+
+def _build_header(match_id: int):
+    """Everything in match_joined except the balls."""
+    match = Match.query.get(match_id)
+    if not match:
+        return None
+    current_innings = _get_live_innings(match_id)
+    return {
+        'match_id':        match_id,
+        'match':           match.to_dict(),
+        'current_innings': current_innings.to_dict() if current_innings else None,
+    }
@@ -0,0 +1,33 @@
+# conftest.py
+# Fixtures shared by the pytest suites (test_*.py):
+# an app on TestingConfig's in-memory database with two teams of 11 players.
+
+import pytest
+
+from app import create_app
+from app.extensions import db, cache
+from app.models import Team, Player
+
+
+@pytest.fixture
+def app():
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        cache.clear()
+        teams = [Team(name='Mumbai Indians', short_name='MI'), Team(name='Chennai Super Kings', short_name='CSK')]
+        db.session.add_all(teams)
+        db.session.commit()
+        players = [Player(name=f'Player {i}', jersey_number=i, role='batsman',
+                          team_id=teams[0].id if i < 11 else teams[1].id) for i in range(22)]
+        db.session.add_all(players)
+        db.session.commit()
+        app.player_ids = [p.id for p in players]
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
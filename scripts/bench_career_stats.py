@@ -0,0 +1,129 @@
+"""
+Benchmark StatisticsService.get_player_career_stats at several career sizes.
+
+Seeds an in-memory database with one player who has N deliveries (half
+batting, half bowling) next to N deliveries of other players, then times
+the PlayerCareerStats primary-key read, the SQL-side aggregate over the
+ball log, and the old approach that hydrated every Ball.
+
+Usage:
+    python scripts/bench_career_stats.py
+    python scripts/bench_career_stats.py --sizes 10000 100000 1000000 --repeat 5 --legacy-max 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.extensions import db
+from app.models import Ball, Inning, Match, Player, Team
+from app.services import StatisticsService
+
+PLAYER_ID = 1
+OTHER_PLAYERS = list(range(2, 23))
+CHUNK = 50000
+
+
+def _legacy_career_stats(player_id):
+    """The previous implementation: load every Ball row and sum in Python."""
+    batting_balls = Ball.query.filter_by(batsman_id=player_id).all()
+    bowling_balls = Ball.query.filter_by(bowler_id=player_id).all()
+    dismissals = Ball.query.filter_by(dismissed_player_id=player_id).count()
+    return {
+        'runs': sum(b.runs_scored for b in batting_balls),
+        'balls_faced': sum(1 for b in batting_balls if b.is_legal_delivery),
+        'dismissals': dismissals,
+        'runs_conceded': sum(b.runs_scored + b.extra_runs for b in bowling_balls),
+        'wickets': sum(1 for b in bowling_balls if b.is_wicket and b.wicket_type not in ['run-out']),
+        'balls_bowled': sum(1 for b in bowling_balls if b.is_legal_delivery),
+    }
+
+
+def seed(size, rng):
+    """Insert `size` balls for PLAYER_ID and `size` balls for everybody else."""
+    db.drop_all()
+    db.create_all()
+    db.session.add_all([Team(id=1, name='Bench XI', short_name='BXI'), Team(id=2, name='Rest XI', short_name='RXI')])
+    db.session.add_all([
+        Player(id=pid, name=f'Player {pid}', jersey_number=pid, role='all-rounder', team_id=1 if pid <= 11 else 2)
+        for pid in [PLAYER_ID] + OTHER_PLAYERS
+    ])
+    db.session.add(Match(id=1, team_1_id=1, team_2_id=2, match_date=datetime(2024, 7, 1), status='completed'))
+    db.session.add(Inning(id=1, match_id=1, batting_team_id=1, bowling_team_id=2, innings_number=1))
+    db.session.commit()
+    created_at = datetime.utcnow()
+    rows = []
+    for i in range(size * 2):
+        mine = i % 2 == 0
+        batting = mine and i % 4 == 0
+        bowling = mine and not batting
+        runs = rng.choices([0, 1, 2, 3, 4, 6], weights=[35, 25, 15, 5, 15, 5])[0]
+        extra_type = rng.choice(['wide', 'no-ball', 'bye']) if rng.random() < 0.08 else None
+        is_wicket = extra_type is None and rng.random() < 0.05
+        batsman = PLAYER_ID if batting else rng.choice(OTHER_PLAYERS)
+        rows.append({
+            'inning_id': 1,
+            'over_number': (i // 6) % 20,
+            'ball_number': i % 6 + 1,
+            'batsman_id': batsman,
+            'non_striker_id': rng.choice(OTHER_PLAYERS),
+            'bowler_id': PLAYER_ID if bowling else rng.choice(OTHER_PLAYERS),
+            'runs_scored': runs,
+            'is_wicket': is_wicket,
+            'wicket_type': rng.choice(['bowled', 'caught', 'run-out']) if is_wicket else None,
+            'extra_type': extra_type,
+            'extra_runs': 1 if extra_type else 0,
+            'dismissed_player_id': batsman if is_wicket else None,
+            'is_legal_delivery': extra_type not in ('wide', 'no-ball'),
+            'created_at': created_at,
+        })
+        if len(rows) == CHUNK:
+            db.session.execute(Ball.__table__.insert(), rows)
+            rows = []
+    if rows:
+        db.session.execute(Ball.__table__.insert(), rows)
+    db.session.commit()
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        fn(PLAYER_ID)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000], help='balls per player')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--legacy-max', type=int, default=100000, help='skip the legacy path above this size')
+    args = parser.parse_args()
+
+    app = create_app('testing')
+    rng = random.Random(42)
+    print(f"{'balls/player':>12}  {'materialized':>14}  {'sql aggregate':>14}  {'legacy (ORM)':>14}")
+    with app.app_context():
+        for size in args.sizes:
+            seed(size, rng)
+            # No PlayerCareerStats row yet, so the service falls back to the aggregate
+            sql_ms = timed(StatisticsService.get_player_career_stats, args.repeat)
+            StatisticsService.rebuild_career_stats()
+            row_ms = timed(StatisticsService.get_player_career_stats, args.repeat)
+            if size <= args.legacy_max:
+                legacy = f"{timed(_legacy_career_stats, max(1, args.repeat // 2)):11.1f} ms"
+            else:
+                legacy = f"{'skipped':>14}"
+            print(f"{size:>12,}  {row_ms:11.2f} ms  {sql_ms:11.1f} ms  {legacy}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""
+Benchmark room broadcast throughput across Socket.IO workers sharing a
+message queue (app/websockets/message_queue.py).
+
+A fixed audience of --clients viewers is spread evenly over N workers, all
+in one match room. Worker 0 emits --messages deliveries to the room as
+match_update frames (ball + score, see app/websockets/match_socket.py);
+every worker delivers them to its own viewers. With --separate each
+delivery is sent the pre-coalescing way, as a ball_update and a
+score_update event. Reported per worker count: time until every viewer got
+every message, deliveries per second, and publishes per second.
+
+Viewers are registered directly with each server's client manager, and the
+Engine.IO transport is replaced by a counter. Everything from emit() up to
+the socket write is real: publish, queue hop, room lookup and packet
+encoding.
+
+  memory://   workers are Server instances in this process, each with its
+              own listener thread. They share one interpreter, so this
+              measures the cost of the fanout, not multi-core scaling.
+  redis://…   workers are separate processes (needs a running Redis).
+
+Usage:
+    python scripts/bench_socket_fanout.py
+    python scripts/bench_socket_fanout.py --workers 1 2 4 8 --clients 5000 --messages 200
+    python scripts/bench_socket_fanout.py --separate
+    python scripts/bench_socket_fanout.py --queue redis://localhost:6379/2
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import socketio
+
+from app.websockets.message_queue import create_client_manager
+
+ROOM = 'match_1'
+PAYLOAD = {
+    'id': 301, 'inning_id': 12, 'over_number': 4, 'ball_number': 3,
+    'batsman_id': 7, 'non_striker_id': 8, 'bowler_id': 23,
+    'runs_scored': 4, 'is_wicket': False, 'wicket_type': None,
+    'extra_type': None, 'extra_runs': 0, 'dismissed_player_id': None,
+    'fielder_id': None, 'is_legal_delivery': True,
+    'created_at': '2024-07-01T19:42:07.512000',
+    'commentary': 'FOUR! Bumrah to Sharma',
+}
+SCORE = {
+    'id': 12, 'match_id': 1, 'batting_team_id': 3, 'bowling_team_id': 4,
+    'innings_number': 1, 'is_completed': False, 'total_runs': 87,
+    'total_wickets': 3, 'total_overs': 10.4, 'extras': 6, 'target': None,
+    'created_at': '2024-07-01T19:00:02.120000', 'updated_at': '2024-07-01T19:42:07.530000',
+}
+FRAME = {'match_id': 1, 'events': [{'event': 'ball_update', 'data': PAYLOAD},
+                                   {'event': 'score_update', 'data': SCORE}]}
+
+
+def _events(separate):
+    """(event, data) pairs sent per delivery."""
+    if separate:
+        return [('ball_update', PAYLOAD), ('score_update', SCORE)]
+    return [('match_update', FRAME)]
+
+
+class Worker:
+    """One Socket.IO server with `clients` viewers in ROOM and a delivery counter."""
+
+    def __init__(self, url, channel, clients, expected):
+        self.server = socketio.Server(client_manager=create_client_manager(url, channel=channel),
+                                      async_mode='threading')
+        self.expected = expected
+        self.delivered = 0
+        self.done = threading.Event()
+        self.lock = threading.Lock()
+        self.server.eio.send_packet = self._count
+        self.server.manager.initialize()
+        for _ in range(clients):
+            sid = self.server.manager.connect(uuid.uuid4().hex, '/')
+            self.server.manager.enter_room(sid, '/', ROOM)
+
+    def _count(self, eio_sid, eio_pkt):
+        with self.lock:
+            self.delivered += 1
+            if self.delivered >= self.expected:
+                self.done.set()
+
+
+def run_in_process(url, workers, clients, messages, separate):
+    channel = f'bench-{uuid.uuid4().hex}'
+    per_worker = clients // workers
+    events = _events(separate)
+    pool = [Worker(url, channel, per_worker, per_worker * messages * len(events)) for _ in range(workers)]
+    time.sleep(0.2)  # let the listener threads subscribe
+    started = time.perf_counter()
+    for _ in range(messages):
+        for event, data in events:
+            pool[0].server.emit(event, data, room=ROOM)
+    published = time.perf_counter()
+    for worker in pool:
+        if not worker.done.wait(timeout=120):
+            raise RuntimeError(f'worker delivered {worker.delivered}/{worker.expected}')
+    return published - started, time.perf_counter() - started
+
+
+def _worker_process(url, channel, clients, expected, ready, results):
+    worker = Worker(url, channel, clients, expected)
+    ready.put(True)
+    worker.done.wait(timeout=120)
+    results.put((time.perf_counter(), worker.delivered))
+
+
+def run_in_processes(url, workers, clients, messages, separate):
+    channel = f'bench-{uuid.uuid4().hex}'
+    per_worker = clients // workers
+    events = _events(separate)
+    ready, results = multiprocessing.Queue(), multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=_worker_process,
+                                     args=(url, channel, per_worker, per_worker * messages * len(events), ready, results))
+             for _ in range(workers)]
+    for proc in procs:
+        proc.start()
+    for _ in procs:
+        ready.get(timeout=60)
+    time.sleep(0.5)  # let the subscriptions settle
+    publisher = create_client_manager(url, channel=channel)
+    publisher.write_only = True
+    started = time.perf_counter()
+    for _ in range(messages):
+        for event, data in events:
+            # What an emit from another worker puts on the wire
+            publisher._publish({'method': 'emit', 'event': event, 'data': [data], 'binary': False,
+                                'namespace': '/', 'room': ROOM, 'skip_sid': None, 'callback': None,
+                                'host_id': publisher.host_id})
+    published = time.perf_counter()
+    finished = [results.get(timeout=180) for _ in procs]
+    for proc in procs:
+        proc.join()
+    # perf_counter is system-wide monotonic on Linux, so the clocks compare
+    return published - started, max(t for t, _ in finished) - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--queue', default='memory://', help='SOCKETIO_MESSAGE_QUEUE to benchmark')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--clients', type=int, default=2000, help='viewers in the room, across all workers')
+    parser.add_argument('--messages', type=int, default=200, help='deliveries broadcast')
+    parser.add_argument('--separate', action='store_true', help='ball_update + score_update instead of one frame')
+    args = parser.parse_args()
+
+    run = run_in_process if args.queue.startswith('memory://') else run_in_processes
+    print(f"queue={args.queue}  clients={args.clients}  messages={args.messages}  "
+          f"{'separate events' if args.separate else 'match_update frames'}")
+    print(f"{'workers':>8} {'publish/s':>12} {'all delivered':>14} {'deliveries/s':>14}")
+    for workers in args.workers:
+        publish_time, total_time = run(args.queue, workers, args.clients, args.messages, args.separate)
+        deliveries = (args.clients // workers) * workers * args.messages
+        print(f"{workers:>8} {args.messages / publish_time:>12,.0f} {total_time * 1000:>12.1f}ms "
+              f"{deliveries / total_time:>14,.0f}")
+
+
+if __name__ == '__main__':
+    main()
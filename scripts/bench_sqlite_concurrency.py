@@ -0,0 +1,146 @@
+"""
+Benchmark SQLite read/write concurrency with and without SQLITE_PRAGMAS
+(app/database.py).
+
+For each profile a fresh database file is seeded with one live match.
+One writer process scores balls through BallService.record_ball, as the
+scorer's requests do, while --readers processes read the match the way page
+views and socket handlers do (MatchService.get_match_summary and the
+batting scorecard, one session per read). Reported per profile: writes
+and reads per second, p50/p99 latency of each, and "database is locked"
+errors.
+
+  default   SQLITE_PRAGMAS = {} (rollback journal, synchronous=FULL;
+            pysqlite's own 5 s busy timeout)
+  tuned     Config.SQLITE_PRAGMAS (WAL, synchronous=NORMAL, ...)
+
+Usage:
+    python scripts/bench_sqlite_concurrency.py
+    python scripts/bench_sqlite_concurrency.py --readers 8 --duration 20
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy.exc import OperationalError
+
+from app import create_app
+from app.config import Config, TestingConfig, config
+from app.extensions import db
+from app.models import Player, Team
+from app.services import BallService, InningsService, MatchService, StatisticsService
+
+PROFILES = {'default': {}, 'tuned': Config.SQLITE_PRAGMAS}
+
+
+def seed(app):
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([Team(id=1, name='Bench XI', short_name='BXI'), Team(id=2, name='Rest XI', short_name='RXI')])
+        db.session.add_all([Player(id=p, name=f'Player {p}', jersey_number=p, role='all-rounder',
+                                   team_id=1 if p <= 11 else 2) for p in range(1, 23)])
+        db.session.commit()
+        match = MatchService.create_match(team_1_id=1, team_2_id=2, over_limit=1000)
+        innings = InningsService.start_innings(match.id, batting_team_id=1, bowling_team_id=2, innings_number=1)
+        ids = match.id, innings.id
+        for ball in range(120):
+            _record(innings.id, ball)
+        db.session.remove()
+    return ids
+
+
+def _record(innings_id, ball):
+    BallService.record_ball(innings_id=innings_id, striker_id=1 + ball % 2, non_striker_id=2 - ball % 2,
+                            bowler_id=12 + (ball // 6) % 5, runs=(0, 1, 4, 0, 2, 6)[ball % 6])
+
+
+def _work(config_name, kind, match_id, innings_id, start, until, results):
+    """Worker process: run reads or writes from `start` to `until`, then report (kind, latencies ms, locked errors)."""
+    app = create_app(config_name)
+    samples, errors, n = [], 0, 0
+    time.sleep(max(0.0, start - time.time()))
+    with app.app_context():
+        while time.time() < until:
+            started = time.perf_counter()
+            try:
+                if kind == 'write':
+                    _record(innings_id, 120 + n)
+                else:
+                    MatchService.get_match_summary(match_id)
+                    StatisticsService.get_batting_scorecard(innings_id)
+                samples.append((time.perf_counter() - started) * 1000)
+            except (OperationalError, ValueError) as e:
+                if 'locked' not in str(e):
+                    raise
+                errors += 1
+            finally:
+                db.session.remove()   # end the transaction, as a request teardown does
+            n += 1
+    results.put((kind, samples, errors))
+
+
+def run_profile(name, pragmas, readers, duration, workdir):
+    config_name = f'bench_{name}'
+    config[config_name] = type(f'Bench{name.title()}Config', (TestingConfig,), {
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(workdir, f'{name}.db')}",
+        'SQLITE_PRAGMAS': pragmas,
+        'QUERY_COUNT_WARN': 0, 'QUERY_TIME_WARN': 0, 'QUERY_REPEAT_WARN': 0,
+    })
+    match_id, innings_id = seed(create_app(config_name))
+
+    # Processes, not threads: the GIL would otherwise serialise the workers
+    # and hide the file locking being measured. Forked, so the config
+    # registered above is visible in the children.
+    ctx = multiprocessing.get_context('fork')
+    results = ctx.Queue()
+    start = time.time() + 2.0   # all workers created their app by then
+    until = start + duration
+    procs = [ctx.Process(target=_work, args=(config_name, kind, match_id, innings_id, start, until, results))
+             for kind in ['write'] + ['read'] * readers]
+    for proc in procs:
+        proc.start()
+    result = {'writes': [], 'reads': [], 'write_errors': 0, 'read_errors': 0}
+    for _ in procs:
+        kind, samples, errors = results.get()
+        result[kind + 's'].extend(samples)
+        result[kind + '_errors'] += errors
+    for proc in procs:
+        proc.join()
+    return result
+
+
+def _quantiles(samples):
+    if len(samples) < 2:
+        return float('nan'), float('nan')
+    cuts = statistics.quantiles(samples, n=100)
+    return cuts[49], cuts[98]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--readers', type=int, default=4, help='reader processes next to the one writer')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per profile')
+    parser.add_argument('--profiles', nargs='+', default=list(PROFILES), choices=list(PROFILES))
+    args = parser.parse_args()
+
+    print(f"1 writer, {args.readers} readers, {args.duration:.0f}s per profile")
+    print(f"{'profile':>8} {'writes/s':>9} {'write p50':>10} {'write p99':>10} {'reads/s':>9} "
+          f"{'read p50':>9} {'read p99':>9} {'locked':>7}")
+    with tempfile.TemporaryDirectory(prefix='bench-sqlite-') as workdir:
+        for name in args.profiles:
+            result = run_profile(name, PROFILES[name], args.readers, args.duration, workdir)
+            write_p50, write_p99 = _quantiles(result['writes'])
+            read_p50, read_p99 = _quantiles(result['reads'])
+            print(f"{name:>8} {len(result['writes']) / args.duration:>9.1f} {write_p50:>8.1f}ms {write_p99:>8.1f}ms "
+                  f"{len(result['reads']) / args.duration:>9.1f} {read_p50:>7.1f}ms {read_p99:>7.1f}ms "
+                  f"{result['write_errors'] + result['read_errors']:>7}")
+
+
+if __name__ == '__main__':
+    main()
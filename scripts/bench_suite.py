@@ -0,0 +1,342 @@
+"""
+Benchmark suite for the scoring, stats and socket hot paths, with results
+stored as JSON so runs can be compared between commits.
+
+For every scale (total balls in the database) a fresh database is seeded
+from a fixed random seed: completed matches of 240 balls each, bulk
+inserted, with career totals rebuilt; then one live match is scored
+through the services, and the benchmarks run against it:
+
+  record_ball            BallService.record_ball, one sample per delivery
+  record_balls_over      BallService.record_balls with an over (6 balls)
+  batting_scorecard      StatisticsService.get_batting_scorecard
+  bowling_scorecard      StatisticsService.get_bowling_scorecard
+  career_stats           StatisticsService.get_player_career_stats (busiest player)
+  match_summary          MatchService.get_match_summary
+  page_home, page_match, page_matches
+                         GET /, /match/<id>, /matches (template rendering included)
+  join_match_cold        join_match with the snapshot invalidated first
+  join_match_warm        join_match served from the cached snapshot
+
+Times are milliseconds; each benchmark reports median, p95, min and mean
+over its samples, plus the SQL queries per call. The identity map is
+cleared before each read sample, so rows come from the database.
+
+Results go to bench_results/<commit>.json (or --output). --compare OLD.json
+prints the change of each median and exits 1 if any got slower than
+--threshold percent.
+
+Usage:
+    python scripts/bench_suite.py
+    python scripts/bench_suite.py --scales 100 10000 1000000 --repeat 30
+    python scripts/bench_suite.py --database sqlite:////tmp/bench.db
+    python scripts/bench_suite.py --compare bench_results/4f2a9c1.json
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import sqlalchemy
+
+from app import create_app
+from app.config import TestingConfig, config
+from app.extensions import cache, db, socketio
+from app.middleware.query_counter import count_queries
+from app.models import Ball, Inning, Match, Player, Team
+from app.services import BallService, MatchService, StatisticsService
+from app.websockets.snapshots import MatchSnapshots
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+TEAMS = 8
+SQUAD = 11
+BALLS_PER_MATCH = 240
+CHUNK = 50000
+SINGLE_BALLS = 60     # live innings: scored one ball at a time ...
+BATCH_OVERS = 9       # ... then an over at a time (19 overs in all)
+
+
+# ───────────────────────────────────────────
+# DATA
+# ───────────────────────────────────────────
+
+def _players(team_id):
+    first = (team_id - 1) * SQUAD + 1
+    return list(range(first, first + SQUAD))
+
+
+def seed(app, size, rng):
+    """Fresh schema with `size` balls of completed matches; returns the busiest player id."""
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+    cache.clear()
+    for registry in ('innings_states', 'match_snapshots', 'live_matches', 'match_archives'):
+        app.extensions.pop(registry, None)   # process-local caches of the previous scale
+    db.session.add_all([Team(id=t, name=f'Team {t}', short_name=f'T{t}') for t in range(1, TEAMS + 1)])
+    db.session.add_all([
+        Player(id=p, name=f'Player {p}', jersey_number=p % 100, role='all-rounder', team_id=t)
+        for t in range(1, TEAMS + 1) for p in _players(t)
+    ])
+    db.session.commit()
+
+    matches = math.ceil(size / BALLS_PER_MATCH)
+    start = datetime(2020, 1, 1)
+    db.session.execute(Match.__table__.insert(), [
+        {'id': m, 'team_1_id': (m - 1) % TEAMS + 1, 'team_2_id': m % TEAMS + 1,
+         'match_date': start + timedelta(hours=6 * m), 'match_type': 'T20', 'over_limit': 20,
+         'status': 'completed', 'created_at': start, 'updated_at': start}
+        for m in range(1, matches + 1)
+    ])
+    db.session.execute(Inning.__table__.insert(), [
+        {'id': 2 * m - 1 + n, 'match_id': m, 'innings_number': n + 1, 'is_completed': True,
+         'batting_team_id': ((m - 1) % TEAMS + 1) if n == 0 else (m % TEAMS + 1),
+         'bowling_team_id': (m % TEAMS + 1) if n == 0 else ((m - 1) % TEAMS + 1)}
+        for m in range(1, matches + 1) for n in (0, 1)
+    ])
+    rows = []
+    created_at = datetime.utcnow()
+    for i in range(size):
+        match_id, position = divmod(i, BALLS_PER_MATCH)
+        match_id += 1
+        innings = 2 * match_id - 1 + position // 120
+        batting = _players(((match_id - 1) % TEAMS + 1) if position < 120 else (match_id % TEAMS + 1))
+        bowling = _players((match_id % TEAMS + 1) if position < 120 else ((match_id - 1) % TEAMS + 1))
+        runs = rng.choices([0, 1, 2, 3, 4, 6], weights=[35, 25, 15, 5, 15, 5])[0]
+        extra_type = rng.choice(['wide', 'no-ball', 'bye']) if rng.random() < 0.08 else None
+        is_wicket = extra_type is None and rng.random() < 0.05
+        batsman = batting[rng.randrange(7)]
+        rows.append({
+            'inning_id': innings,
+            'over_number': (position % 120) // 6,
+            'ball_number': position % 6 + 1,
+            'batsman_id': batsman,
+            'non_striker_id': batting[rng.randrange(7, SQUAD)],
+            'bowler_id': bowling[rng.randrange(6, SQUAD)],
+            'runs_scored': runs,
+            'is_wicket': is_wicket,
+            'wicket_type': rng.choice(['bowled', 'caught', 'lbw']) if is_wicket else None,
+            'extra_type': extra_type,
+            'extra_runs': 1 if extra_type else 0,
+            'dismissed_player_id': batsman if is_wicket else None,
+            'is_legal_delivery': extra_type not in ('wide', 'no-ball'),
+            'created_at': created_at,
+        })
+        if len(rows) == CHUNK:
+            db.session.execute(Ball.__table__.insert(), rows)
+            rows = []
+    if rows:
+        db.session.execute(Ball.__table__.insert(), rows)
+    db.session.commit()
+    StatisticsService.rebuild_career_stats()
+    busiest = db.session.query(Ball.batsman_id).group_by(Ball.batsman_id) \
+        .order_by(sqlalchemy.func.count().desc()).limit(1).scalar()
+    return busiest or 1
+
+
+def deliveries(rng, count):
+    """`count` plausible deliveries for team 1 batting against team 2."""
+    batting, bowling = _players(1), _players(2)
+    striker, non_striker, next_in = batting[0], batting[1], 2
+    out = []
+    for i in range(count):
+        runs = rng.choices([0, 1, 2, 4, 6], weights=[40, 30, 12, 13, 5])[0]
+        ball = {'striker_id': striker, 'non_striker_id': non_striker,
+                'bowler_id': bowling[6 + (i // 6) % 5], 'runs': runs}
+        if rng.random() < 0.04 and next_in < SQUAD:
+            ball.update(runs=0, is_wicket=True, wicket_type='bowled', dismissed_player_id=striker)
+            striker, next_in = batting[next_in], next_in + 1
+        elif runs % 2:
+            striker, non_striker = non_striker, striker
+        if i % 6 == 5:
+            striker, non_striker = non_striker, striker
+        out.append(ball)
+    return out
+
+
+# ───────────────────────────────────────────
+# MEASUREMENT
+# ───────────────────────────────────────────
+
+def summarise(samples, queries):
+    ordered = sorted(samples)
+    return {
+        'samples': len(samples),
+        'median': round(statistics.median(ordered), 4),
+        'p95': round(ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)], 4),
+        'min': round(ordered[0], 4),
+        'mean': round(statistics.fmean(ordered), 4),
+        'queries': round(queries / len(samples), 2),
+    }
+
+
+def measure(fn, repeat, warmup=2, before=None):
+    """Run fn `warmup` + `repeat` times; time the last `repeat` in ms."""
+    samples, queries = [], 0
+    for i in range(warmup + repeat):
+        db.session.expunge_all()
+        if before:
+            before()
+        with count_queries() as stats:
+            started = time.perf_counter()
+            fn()
+            elapsed = (time.perf_counter() - started) * 1000
+        if i >= warmup:
+            samples.append(elapsed)
+            queries += stats.count
+    return summarise(samples, queries)
+
+
+def measure_each(calls):
+    """Time each call once (calls that change state, like scoring a ball)."""
+    samples, queries = [], 0
+    for call in calls:
+        with count_queries() as stats:
+            started = time.perf_counter()
+            call()
+            samples.append((time.perf_counter() - started) * 1000)
+        queries += stats.count
+    return summarise(samples, queries)
+
+
+def run_scale(app, size, repeat, rng):
+    started = time.perf_counter()
+    busiest = seed(app, size, rng)
+    seeded = time.perf_counter() - started
+    client = app.test_client()
+
+    match_id = MatchService.create_match(team_1_id=1, team_2_id=2, over_limit=20).id
+    innings_id = client.post('/api/v1/balls/innings/start', json={
+        'match_id': match_id, 'batting_team_id': 1, 'bowling_team_id': 2, 'inning_number': 1,
+    }).json['innings']['id']
+    balls = deliveries(rng, SINGLE_BALLS + 6 * BATCH_OVERS)
+    results = {}
+    results['record_ball'] = measure_each(
+        [lambda ball=ball: BallService.record_ball(innings_id=innings_id, **ball) for ball in balls[:SINGLE_BALLS]])
+    overs = [balls[SINGLE_BALLS + 6 * o:SINGLE_BALLS + 6 * (o + 1)] for o in range(BATCH_OVERS)]
+    results['record_balls_over'] = measure_each(
+        [lambda over=over: BallService.record_balls(innings_id, over) for over in overs])
+
+    results['batting_scorecard'] = measure(lambda: StatisticsService.get_batting_scorecard(innings_id), repeat)
+    results['bowling_scorecard'] = measure(lambda: StatisticsService.get_bowling_scorecard(innings_id), repeat)
+    results['career_stats'] = measure(lambda: StatisticsService.get_player_career_stats(busiest), repeat)
+    results['match_summary'] = measure(lambda: MatchService.get_match_summary(match_id), repeat)
+    for name, path in (('page_home', '/'), ('page_match', f'/match/{match_id}'), ('page_matches', '/matches')):
+        results[name] = measure(lambda path=path: _ok(client.get(path)), repeat)
+
+    viewer = socketio.test_client(app)
+    join = lambda: viewer.emit('join_match', {'match_id': match_id})
+    results['join_match_cold'] = measure(join, repeat, before=lambda: MatchSnapshots.invalidate(match_id))
+    results['join_match_warm'] = measure(join, repeat)
+    viewer.disconnect()
+    return {'balls': size, 'seed_seconds': round(seeded, 2), 'benchmarks': results}
+
+
+def _ok(response):
+    if response.status_code != 200:
+        raise RuntimeError(f"{response.request.path}: HTTP {response.status_code}")
+
+
+# ───────────────────────────────────────────
+# REPORTING
+# ───────────────────────────────────────────
+
+def _git(*args):
+    try:
+        return subprocess.run(['git', *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment(database):
+    return {
+        'commit': _git('rev-parse', '--short', 'HEAD'),
+        'dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+        'created_at': datetime.utcnow().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sqlalchemy': sqlalchemy.__version__,
+        'sqlite': sqlite3.sqlite_version,
+        'database': database.split('://', 1)[0] + '://' + ('memory' if database.endswith(':memory:') else '…'),
+    }
+
+
+def compare(old, new, threshold):
+    """Print median changes; returns the (scale, benchmark) pairs slower than threshold %."""
+    slower = []
+    print(f"\ncompared with {old['environment']['commit']} ({old['environment']['created_at']})")
+    print(f"{'balls':>9}  {'benchmark':<20} {'old ms':>10} {'new ms':>10} {'change':>8}")
+    for scale, run in new['scales'].items():
+        before = old['scales'].get(scale)
+        if before is None:
+            continue
+        for name, result in run['benchmarks'].items():
+            if name not in before['benchmarks']:
+                continue
+            old_ms, new_ms = before['benchmarks'][name]['median'], result['median']
+            change = (new_ms - old_ms) / old_ms * 100 if old_ms else 0.0
+            flag = '  SLOWER' if change > threshold else ''
+            if flag:
+                slower.append((scale, name))
+            print(f"{int(scale):>9,}  {name:<20} {old_ms:>10.3f} {new_ms:>10.3f} {change:>+7.1f}%{flag}")
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=[100, 10000, 1000000], help='balls in the database')
+    parser.add_argument('--repeat', type=int, default=20, help='samples per read benchmark')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--database', default=TestingConfig.SQLALCHEMY_DATABASE_URI,
+                        help='database URL to benchmark against (dropped and re-created per scale)')
+    parser.add_argument('--output', help='result file (default bench_results/<commit>.json)')
+    parser.add_argument('--compare', metavar='OLD.json', help='earlier result file to compare with')
+    parser.add_argument('--threshold', type=float, default=10.0, help='percent slowdown reported as a regression')
+    args = parser.parse_args()
+
+    config['bench'] = type('BenchConfig', (TestingConfig,), {
+        'SQLALCHEMY_DATABASE_URI': args.database,
+        'QUERY_COUNT_WARN': 0, 'QUERY_TIME_WARN': 0, 'QUERY_REPEAT_WARN': 0,
+    })
+    app = create_app('bench')
+    report = {'environment': environment(args.database), 'seed': args.seed, 'repeat': args.repeat, 'scales': {}}
+    with app.app_context():
+        for size in args.scales:
+            run = run_scale(app, size, args.repeat, random.Random(args.seed))
+            report['scales'][str(size)] = run
+            print(f"\n{size:,} balls (seeded in {run['seed_seconds']}s)")
+            print(f"  {'benchmark':<20} {'median':>9} {'p95':>9} {'min':>9} {'queries':>8}")
+            for name, result in run['benchmarks'].items():
+                print(f"  {name:<20} {result['median']:>7.3f}ms {result['p95']:>7.3f}ms "
+                      f"{result['min']:>7.3f}ms {result['queries']:>8}")
+        db.session.remove()
+
+    output = args.output
+    if not output:
+        commit = report['environment']['commit'] or 'unknown'
+        suffix = '-dirty' if report['environment']['dirty'] else ''
+        output = os.path.join(ROOT, 'bench_results', f'{commit}{suffix}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nwrote {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            slower = compare(json.load(f), report, args.threshold)
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
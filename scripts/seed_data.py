@@ -1,7 +1,15 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import argparse
+import time
+from multiprocessing import Pool
 from app import create_app
 from app.extensions import db
-from app.models import Team,Player
-from app.services import MatchService,InningsService,BallService
+from app.models import Team,Player,Match,Inning,Ball,BattingScorecard,BowlingScorecard,Partnership,Over
+from app.services import MatchService,InningsService,BallService,StatisticsService
+from scripts.simulation import simulate_match
+from sqlalchemy import func
 from faker import Faker
 import random
 from datetime import datetime, timedelta
@@ -203,6 +211,58 @@ def simulate_innings(match_id,batting_team,bowling_team,innings_num):
             break
     InningsService.complete_innings(innings_id=innings.id)
     return total_runs
+BULK_TABLES = [Match, Inning, Ball, BattingScorecard, BowlingScorecard, Partnership, Over]
+def _squads(team_ids):
+    """Batting order and bowlers of every team, as plain ids for the simulator"""
+    squads = {}
+    for team_id in team_ids:
+        players = Player.query.filter(Player.team_id == team_id).order_by(Player.id.asc()).all()
+        bowlers = [p.id for p in players if p.role in ['bowler', 'all-rounder']] or [p.id for p in players]
+        squads[team_id] = {'id': team_id, 'batting_order': [p.id for p in players], 'bowlers': bowlers}
+    return squads
+def _insert_rows(results):
+    """Bulk insert the rows of several simulated matches, parents first"""
+    for model in BULK_TABLES:
+        rows = [row for result in results for row in result[model.__tablename__]]
+        if rows:
+            db.session.execute(model.__table__.insert(), rows)
+    db.session.commit()
+def simulate_matches_bulk(team_ids, num_matches, workers=1, seed=None, batch=200):
+    """
+    Seed completed matches with the vectorized simulator (scripts/simulation.py)
+    Matches are simulated in `workers` processes and inserted `batch` matches per
+    transaction; ids are assigned up front so no row needs a round trip.
+    """
+    squads = _squads(team_ids)
+    seed = random.randrange(2**32) if seed is None else seed
+    rng = random.Random(seed)
+    next_match_id = (db.session.query(func.max(Match.id)).scalar() or 0) + 1
+    next_inning_id = (db.session.query(func.max(Inning.id)).scalar() or 0) + 1
+    start_date = datetime(2024, 7, 1, 19, 0, 0)
+    tasks = []
+    for i in range(num_matches):
+        team1, team2 = rng.sample(team_ids, 2)
+        tasks.append((next_match_id + i, (next_inning_id + 2 * i, next_inning_id + 2 * i + 1),
+                      squads[team1], squads[team2], start_date + timedelta(hours=12 * i), seed))
+    started = time.perf_counter()
+    balls = 0
+    pending = []
+    pool = Pool(workers) if workers > 1 else None
+    try:
+        results = pool.imap(simulate_match, tasks, chunksize=max(1, min(50, batch // workers))) if pool else map(simulate_match, tasks)
+        for done, result in enumerate(results, start=1):
+            pending.append(result)
+            balls += len(result['ball'])
+            if len(pending) >= batch or done == num_matches:
+                _insert_rows(pending)
+                pending = []
+                print(f"  {done}/{num_matches} matches, {balls} balls ({time.perf_counter() - started:.1f}s)")
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+    StatisticsService.rebuild_career_stats()
+    print(f"Seeded {num_matches} matches / {balls} balls in {time.perf_counter() - started:.1f}s (seed={seed})")
 def print_summary():
     print("\n" + "="*60)
     print("DATABASE SUMMARY")
@@ -210,10 +270,9 @@ def print_summary():
     
     teams = Team.query.all()
     players = Player.query.all()
-    from app.models import Match, Inning, Ball
     matches = Match.query.all()
     innings = Inning.query.all()
-    balls = Ball.query.all()
+    ball_count = Ball.query.count()  # count in SQL, bulk seeds hold millions of balls
     
     print(f"\n Teams: {len(teams)}")
     for team in teams:
@@ -231,8 +290,8 @@ def print_summary():
     print(f"   • Completed: {completed}")
     
     print(f"\n Innings: {len(innings)}")
-    print(f"\n Balls Recorded: {len(balls)}")
-    print(f"   • Average per match: {len(balls) // len(matches) if matches else 0}")
+    print(f"\n Balls Recorded: {ball_count}")
+    print(f"   • Average per match: {ball_count // len(matches) if matches else 0}")
     
     # Calculate total runs
     total_runs = sum(i.total_runs for i in innings)
@@ -242,9 +301,19 @@ def print_summary():
     print("DATABASE SEEDED SUCCESSFULLY!")
     print("="*60)
 def main():
+    parser = argparse.ArgumentParser(description="Seed the database with simulated matches")
+    parser.add_argument('--matches', type=int, default=10, help='number of matches to simulate')
+    parser.add_argument('--workers', type=int, default=1, help='simulator processes (vectorized engine only)')
+    parser.add_argument('--engine', choices=['vectorized', 'service'], default='vectorized',
+                        help='vectorized: NumPy simulator + bulk insert; service: BallService.record_ball per delivery')
+    parser.add_argument('--batch', type=int, default=200, help='matches per bulk insert transaction')
+    parser.add_argument('--seed', type=int, default=None, help='random seed for reproducible data sets')
+    args = parser.parse_args()
     print("\n" + "="*60)
     print("SEEDING DATABASE WITH SAMPLE DATA")
     print("="*60)
+    if args.seed is not None:
+        random.seed(args.seed)
     app=create_app()
     with app.app_context():
         clear_db()
@@ -252,10 +321,13 @@ def main():
         create_players(team_ids)
         print("\nSimulating matches and innings...")
         print("-"*60)
-        num_matches=10
-        for i in range(num_matches):
-            team1,team2=random.sample(team_ids,2)
-            create_matches(team1,team2,i+1)
+        if args.engine == 'vectorized':
+            db.engine.echo = False  # SQL echo of millions of rows would dominate the run
+            simulate_matches_bulk(team_ids, args.matches, workers=args.workers, seed=args.seed, batch=args.batch)
+        else:
+            for i in range(args.matches):
+                team1,team2=random.sample(team_ids,2)
+                create_matches(team1,team2,i+1)
         print_summary()
 if __name__=="__main__":
     main()
@@ -0,0 +1,324 @@
+"""
+Vectorized match simulator used by scripts/seed_data.py.
+
+Generates a whole innings of outcomes at once with NumPy, from the same
+weighted distributions as seed_data.simulate_innings, and derives the ball
+rows, batting/bowling scorecards, partnerships, overs and innings totals
+in array form. Nothing here touches the database or the ORM: a simulated
+match comes back as plain row dicts keyed by table name, using match and
+innings ids handed in by the caller, ready to be bulk inserted.
+
+Strike rotation is sequential in nature but only depends on parity: the
+striker's end flips on odd runs off the bat and at the end of every over,
+so it is a cumulative XOR. Each end keeps its batsman until a wicket falls
+at that end, when the next batsman in the order arrives there.
+"""
+from datetime import timedelta
+
+import numpy as np
+
+RUN_VALUES = np.array([0, 1, 2, 3, 4, 6])
+RUN_WEIGHTS = np.array([35, 25, 15, 5, 15, 5]) / 100  # Realistic T20 distribution
+EXTRA_RATE = 0.08
+EXTRA_TYPES = ('wide', 'no-ball', 'bye')
+WICKET_RATE = 0.05
+DEATH_OVERS_FROM = 15
+DEATH_WICKET_BONUS = 0.02
+
+
+def _overs(legal_balls):
+    return legal_balls // 6 + (legal_balls % 6) / 10
+
+
+def simulate_innings(rng, batting_order, bowlers, over_limit=20, target=None):
+    """
+    Simulate one innings.
+
+    Args
+    ----
+    batting_order : list of player ids, openers first
+    bowlers       : list of player ids allowed to bowl
+    target        : runs needed to win (second innings), or None
+
+    Returns a dict of per-delivery arrays plus the derived aggregate rows.
+    """
+    max_legal = over_limit * 6
+    max_wickets = len(batting_order) - 1
+    # Enough candidate deliveries that extras can never run us out of balls
+    n = int(max_legal * 1.6) + 12
+
+    runs = rng.choice(RUN_VALUES, size=n, p=RUN_WEIGHTS)
+    is_extra = rng.random(n) < EXTRA_RATE
+    extra_kind = np.where(is_extra, rng.integers(0, len(EXTRA_TYPES), size=n), -1)
+    extra_runs = is_extra.astype(np.int64)
+    legal = extra_kind < 0
+    legal |= extra_kind == EXTRA_TYPES.index('bye')
+    legal_before = np.cumsum(legal) - legal
+    over = legal_before // 6
+    wicket_p = WICKET_RATE + DEATH_WICKET_BONUS * (over >= DEATH_OVERS_FROM)
+    is_wicket = legal & (rng.random(n) < wicket_p)
+
+    # Cut the innings at the first all-out / overs-done / target-reached ball
+    total = np.cumsum(runs + extra_runs)
+    stop = (np.cumsum(is_wicket) >= max_wickets) | (legal_before + legal >= max_legal)
+    if target is not None:
+        stop |= total >= target
+    end = int(np.argmax(stop)) + 1 if stop.any() else n
+    runs, is_extra, extra_kind, extra_runs = runs[:end], is_extra[:end], extra_kind[:end], extra_runs[:end]
+    legal, legal_before, over, is_wicket = legal[:end], legal_before[:end], over[:end], is_wicket[:end]
+    legal_after = legal_before + legal
+
+    # Strike: which end faces each ball, and who is standing at each end
+    over_end = legal & (legal_after % 6 == 0)
+    flip = ((runs % 2 == 1) & ~is_wicket) ^ over_end
+    striker_end = np.concatenate(([0], np.cumsum(flip)[:-1])) % 2
+    occupant = np.full((2, end), -1)
+    occupant[0, 0], occupant[1, 0] = 0, 1
+    wicket_balls = np.flatnonzero(is_wicket)
+    arrivals = np.arange(2, 2 + len(wicket_balls))
+    keep = wicket_balls + 1 < end
+    occupant[striker_end[wicket_balls[keep]], wicket_balls[keep] + 1] = arrivals[keep]
+    occupant = np.maximum.accumulate(occupant, axis=1)
+    striker = np.where(striker_end == 0, occupant[0], occupant[1])
+    non_striker = np.where(striker_end == 0, occupant[1], occupant[0])
+
+    # Bowlers: a different one every over
+    n_overs = int(over[-1]) + 1
+    if len(bowlers) > 1:
+        steps = rng.integers(1, len(bowlers), size=n_overs)
+        steps[0] = rng.integers(0, len(bowlers))
+        over_bowler = np.cumsum(steps) % len(bowlers)
+    else:
+        over_bowler = np.zeros(n_overs, dtype=np.int64)
+    bowler = over_bowler[over]
+
+    return {
+        'n': end,
+        'runs': runs,
+        'extra_kind': extra_kind,
+        'extra_runs': extra_runs,
+        'legal': legal,
+        'over': over,
+        'ball_number': legal_before % 6 + 1,
+        'is_wicket': is_wicket,
+        'striker': striker,
+        'non_striker': non_striker,
+        'bowler': bowler,
+        'over_bowler': over_bowler,
+        'total_runs': int(total[end - 1]),
+        'total_wickets': int(is_wicket.sum()),
+        'extras': int(extra_runs.sum()),
+        'legal_balls': int(legal.sum()),
+    }
+
+
+def _innings_rows(sim, inning_id, batting_order, bowlers, created_at):
+    """Turn simulated arrays into rows for every table the ball path maintains."""
+    batting_order = np.asarray(batting_order)
+    bowlers = np.asarray(bowlers)
+    n = sim['n']
+    runs, extra_runs, legal = sim['runs'], sim['extra_runs'], sim['legal']
+    extra_kind, is_wicket = sim['extra_kind'], sim['is_wicket']
+    striker, non_striker, bowler = sim['striker'], sim['non_striker'], sim['bowler']
+    extra_type = np.array((None,) + EXTRA_TYPES, dtype=object)[extra_kind + 1]
+    charged = runs + np.where(legal, 0, extra_runs)  # byes are not charged to the bowler
+
+    balls = [{
+        'inning_id': inning_id,
+        'over_number': o,
+        'ball_number': b,
+        'batsman_id': s,
+        'non_striker_id': ns,
+        'bowler_id': bw,
+        'runs_scored': r,
+        'is_wicket': w,
+        'wicket_type': 'bowled' if w else None,
+        'extra_type': et,
+        'extra_runs': er,
+        'dismissed_player_id': s if w else None,
+        'fielder_id': None,
+        'is_legal_delivery': lg,
+        'created_at': created_at,
+    } for o, b, s, ns, bw, r, w, et, er, lg in zip(
+        sim['over'].tolist(), sim['ball_number'].tolist(),
+        batting_order[striker].tolist(), batting_order[non_striker].tolist(), bowlers[bowler].tolist(),
+        runs.tolist(), is_wicket.tolist(), extra_type.tolist(), extra_runs.tolist(), legal.tolist(),
+    )]
+
+    # Batting: only batsmen who faced a ball get a scorecard, in order of first ball faced
+    nb = len(batting_order)
+    faced = np.bincount(striker, minlength=nb)
+    bat_runs = np.bincount(striker, weights=runs, minlength=nb).astype(int)
+    bat_balls = np.bincount(striker, weights=legal, minlength=nb).astype(int)
+    fours = np.bincount(striker, weights=runs == 4, minlength=nb).astype(int)
+    sixes = np.bincount(striker, weights=runs == 6, minlength=nb).astype(int)
+    dots = np.bincount(striker, weights=runs == 0, minlength=nb).astype(int)
+    first_faced = np.full(nb, n)
+    np.minimum.at(first_faced, striker, np.arange(n))
+    out_ball = np.full(nb, -1)
+    out_ball[striker[is_wicket]] = np.flatnonzero(is_wicket)
+    batting = []
+    for position, idx in enumerate(i for i in np.argsort(first_faced, kind='stable') if faced[i]):
+        out = out_ball[idx] >= 0
+        batting.append({
+            'innings_id': inning_id,
+            'player_id': int(batting_order[idx]),
+            'runs': int(bat_runs[idx]),
+            'balls_faced': int(bat_balls[idx]),
+            'fours': int(fours[idx]),
+            'sixes': int(sixes[idx]),
+            'dots': int(dots[idx]),
+            'strike_rate': bat_runs[idx] / bat_balls[idx] * 100 if bat_balls[idx] else 0,
+            'is_out': bool(out),
+            'dismissal_type': 'bowled' if out else None,
+            'bowler_id': int(bowlers[bowler[out_ball[idx]]]) if out else None,
+            'fielder_id': None,
+            'batting_position': position + 1,
+        })
+
+    # Overs
+    n_overs = int(sim['over'][-1]) + 1
+    over = sim['over']
+    over_runs = np.bincount(over, weights=runs + extra_runs, minlength=n_overs).astype(int)
+    over_charged = np.bincount(over, weights=charged, minlength=n_overs).astype(int)
+    over_extras = np.bincount(over, weights=extra_runs, minlength=n_overs).astype(int)
+    over_wickets = np.bincount(over, weights=is_wicket, minlength=n_overs).astype(int)
+    over_legal = np.bincount(over, weights=legal, minlength=n_overs).astype(int)
+    over_maiden = (over_legal >= 6) & (over_charged == 0)
+    overs = [{
+        'inning_id': inning_id,
+        'over_number': o,
+        'bowler_id': int(bowlers[sim['over_bowler'][o]]),
+        'runs': int(over_runs[o]),
+        'runs_conceded': int(over_charged[o]),
+        'extras': int(over_extras[o]),
+        'wickets': int(over_wickets[o]),
+        'legal_balls': int(over_legal[o]),
+        'is_maiden': bool(over_maiden[o]),
+    } for o in range(n_overs)]
+
+    # Bowling
+    nw = len(bowlers)
+    bowled = np.bincount(bowler, minlength=nw)
+    bw_balls = np.bincount(bowler, weights=legal, minlength=nw).astype(int)
+    bw_runs = np.bincount(bowler, weights=runs + extra_runs, minlength=nw).astype(int)
+    bw_extras = np.bincount(bowler, weights=extra_runs, minlength=nw).astype(int)
+    bw_wides = np.bincount(bowler, weights=extra_kind == 0, minlength=nw).astype(int)
+    bw_no_balls = np.bincount(bowler, weights=extra_kind == 1, minlength=nw).astype(int)
+    bw_dots = np.bincount(bowler, weights=(runs == 0) & (extra_runs == 0), minlength=nw).astype(int)
+    bw_wickets = np.bincount(bowler, weights=is_wicket, minlength=nw).astype(int)
+    bw_maidens = np.bincount(sim['over_bowler'], weights=over_maiden, minlength=nw).astype(int)
+    bowling = []
+    for idx in np.flatnonzero(bowled):
+        overs_bowled = _overs(int(bw_balls[idx]))
+        wickets = int(bw_wickets[idx])
+        bowling.append({
+            'innings_id': inning_id,
+            'player_id': int(bowlers[idx]),
+            'overs_bowled': overs_bowled,
+            'balls_bowled': int(bw_balls[idx]),
+            'maidens': int(bw_maidens[idx]),
+            'wides': int(bw_wides[idx]),
+            'no_balls': int(bw_no_balls[idx]),
+            'dots': int(bw_dots[idx]),
+            'runs_conceded': int(bw_runs[idx]),
+            'wickets_taken': wickets,
+            'extras_conceded': int(bw_extras[idx]),
+            'economy_rate': bw_runs[idx] / overs_bowled if overs_bowled > 0 else 0.0,
+            'bowling_average': bw_runs[idx] / wickets if wickets else 0.0,
+            'strike_rate': bw_balls[idx] / wickets if wickets else 0.0,
+        })
+
+    # Partnerships: one per wicket-delimited segment
+    segment = np.cumsum(is_wicket) - is_wicket
+    n_segments = int(segment[-1]) + 1
+    seg_runs = np.bincount(segment, weights=runs + extra_runs, minlength=n_segments).astype(int)
+    seg_balls = np.bincount(segment, weights=legal, minlength=n_segments).astype(int)
+    seg_start = np.searchsorted(segment, np.arange(n_segments))
+    partnerships = [{
+        'inning_id': inning_id,
+        'batsman1_id': int(batting_order[striker[start]]),
+        'batsman2_id': int(batting_order[non_striker[start]]),
+        'runs_scored': int(seg_runs[k]),
+        'balls_faced': int(seg_balls[k]),
+        'wickets_fallen': k,
+        'is_active': k == n_segments - 1 and not bool(is_wicket[-1]),
+    } for k, start in enumerate(seg_start.tolist())]
+
+    return {
+        'ball': balls,
+        'batting_scorecard': batting,
+        'bowling_scorecard': bowling,
+        'partnership': partnerships,
+        'over': overs,
+    }
+
+
+def simulate_match(task):
+    """
+    Simulate a completed T20 match between two squads.
+
+    task = (match_id, inning_ids, team_1, team_2, match_date, seed) where each
+    team is {'id': .., 'batting_order': [player ids], 'bowlers': [player ids]}.
+    Ids are assigned by the caller up front so rows can be inserted as-is.
+    Safe to run in a worker process: it only uses its own RNG.
+    """
+    match_id, inning_ids, team_1, team_2, match_date, seed = task
+    rng = np.random.default_rng([seed, match_id])
+    over_limit = 20
+    toss_winner = team_1 if rng.random() < 0.5 else team_2
+    toss_decision = 'bat' if rng.random() < 0.5 else 'field'
+    other = team_2 if toss_winner is team_1 else team_1
+    batting_first, bowling_first = (toss_winner, other) if toss_decision == 'bat' else (other, toss_winner)
+
+    rows = {'match': [], 'inning': [], 'ball': [], 'batting_scorecard': [],
+            'bowling_scorecard': [], 'partnership': [], 'over': []}
+    innings = []
+    target = None
+    for number, (batting, bowling) in enumerate(((batting_first, bowling_first), (bowling_first, batting_first)), start=1):
+        sim = simulate_innings(rng, batting['batting_order'], bowling['bowlers'], over_limit, target)
+        inning_id = inning_ids[number - 1]
+        for table, table_rows in _innings_rows(sim, inning_id, batting['batting_order'], bowling['bowlers'],
+                                               match_date + timedelta(minutes=100 * (number - 1))).items():
+            rows[table].extend(table_rows)
+        rows['inning'].append({
+            'id': inning_id,
+            'match_id': match_id,
+            'batting_team_id': batting['id'],
+            'bowling_team_id': bowling['id'],
+            'innings_number': number,
+            'is_completed': True,
+            'total_runs': sim['total_runs'],
+            'total_wickets': sim['total_wickets'],
+            'total_overs': _overs(sim['legal_balls']),
+            'extras': sim['extras'],
+            'target': target,
+            'created_at': match_date,
+            'updated_at': match_date,
+        })
+        innings.append(rows['inning'][-1])
+        target = sim['total_runs'] + 1
+
+    first, second = innings
+    if second['total_runs'] > first['total_runs']:
+        winner_id, margin = second['batting_team_id'], f"by {10 - second['total_wickets']} wickets"
+    elif first['total_runs'] > second['total_runs']:
+        winner_id, margin = first['batting_team_id'], f"by {first['total_runs'] - second['total_runs']} runs"
+    else:
+        winner_id, margin = None, 'match tied'
+    rows['match'].append({
+        'id': match_id,
+        'team_1_id': team_1['id'],
+        'team_2_id': team_2['id'],
+        'match_date': match_date,
+        'match_type': 'T20',
+        'over_limit': over_limit,
+        'status': 'completed',
+        'toss_winner': toss_winner['id'],
+        'toss_decision': toss_decision,
+        'winner_id': winner_id,
+        'win_margin': margin,
+        'created_at': match_date,
+        'updated_at': match_date,
+    })
+    return rows
@@ -0,0 +1,358 @@
+"""
+Websocket load generator for live match fanout, entirely on localhost.
+
+Starts a server worker (this script with --serve: the app under eventlet,
+a throwaway SQLite file, --matches live matches), connects --clients
+python-socketio AsyncClients over websocket, spreads them round-robin over
+the match rooms with join_match, then scores --rate balls per second in
+every match for --duration seconds through POST /api/v1/balls/record.
+
+Reported:
+  delivery latency   from the scorer sending the POST to a viewer receiving
+                     the ball (match_update frame, catch-up or resync
+                     snapshot): p50/p90/p99/max over every (viewer, ball)
+  dropped            balls a viewer never received, of those scored in its
+                     match after it joined
+  resyncs            match_joined snapshots sent to viewers that fell
+                     too far behind (see the slow-consumer section of
+                     app/websockets/match_socket.py)
+  server memory      RSS of the worker idle, with every viewer joined, and
+                     its peak (VmHWM), from /proc
+  POST latency       of the scorer's record requests
+
+Viewers can be spread over several processes (--processes) so the load
+generator isn't the bottleneck; perf_counter() is system-wide monotonic on
+Linux, so times from different processes compare.
+
+eventlet's WSGI server serves at most 1024 connections at once by default
+(gunicorn's eventlet worker: worker_connections=1000); the worker started
+here allows --max-connections, by default enough for every viewer. Viewers
+that can't connect or join within --join-timeout are reported, not waited
+for.
+
+Needs the asyncio client: pip install "python-socketio[asyncio_client]"
+
+Usage:
+    python scripts/ws_load.py
+    python scripts/ws_load.py --clients 5000 --matches 4 --rate 2 --duration 30 --processes 4
+    python scripts/ws_load.py --emit-interval 0 --clients 2000
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+
+def _raise_fd_limit():
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+# ───────────────────────────────────────────
+# SERVER (--serve)
+# ───────────────────────────────────────────
+
+def serve(args):
+    """Run one app worker under eventlet with `matches` live matches; write their ids to --setup."""
+    import eventlet
+    eventlet.monkey_patch()
+
+    from app import create_app
+    from app.config import TestingConfig, config
+    from app.extensions import db, socketio
+    from app.models import Player, Team
+    from app.services import InningsService, MatchService
+
+    config['load'] = type('LoadConfig', (TestingConfig,), {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{args.database}',
+        'MATCH_EMIT_INTERVAL': args.emit_interval,
+        'QUERY_COUNT_WARN': 0, 'QUERY_TIME_WARN': 0, 'QUERY_REPEAT_WARN': 0,
+    })
+    app = create_app('load')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        db.session.add_all([Team(id=1, name='Load XI', short_name='LXI'), Team(id=2, name='Fanout XI', short_name='FXI')])
+        db.session.add_all([Player(id=p, name=f'Player {p}', jersey_number=p, role='all-rounder',
+                                   team_id=1 if p <= 11 else 2) for p in range(1, 23)])
+        db.session.commit()
+        setup = []
+        for _ in range(args.matches):
+            match = MatchService.create_match(team_1_id=1, team_2_id=2, over_limit=args.overs)
+            innings = InningsService.start_innings(match.id, batting_team_id=1, bowling_team_id=2, innings_number=1)
+            setup.append({'match_id': match.id, 'innings_id': innings.id})
+    with open(args.setup + '.tmp', 'w') as f:
+        json.dump({'matches': setup}, f)
+    os.rename(args.setup + '.tmp', args.setup)
+    socketio.run(app, host='127.0.0.1', port=args.port, log_output=False, max_size=args.max_connections)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(args, workdir):
+    port = _free_port()
+    setup_path = os.path.join(workdir, 'setup.json')
+    overs = int(args.rate * args.duration / 6) + 2
+    log = open(os.path.join(workdir, 'server.log'), 'w')
+    proc = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), '--serve', '--port', str(port),
+         '--database', os.path.join(workdir, 'load.db'), '--setup', setup_path,
+         '--matches', str(args.matches), '--overs', str(overs), '--emit-interval', str(args.emit_interval),
+         '--max-connections', str(args.max_connections or args.clients + 100)],
+        stdout=log, stderr=subprocess.STDOUT, cwd=ROOT,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited with {proc.returncode}, see {log.name}")
+        if os.path.exists(setup_path):
+            try:
+                with socket.create_connection(('127.0.0.1', port), timeout=1):
+                    break
+            except OSError:
+                pass
+        time.sleep(0.1)
+    else:
+        proc.kill()
+        raise RuntimeError(f"server did not start, see {log.name}")
+    with open(setup_path) as f:
+        setup = json.load(f)
+    return proc, f'http://127.0.0.1:{port}', setup['matches']
+
+
+def server_memory(pid):
+    """(rss, peak rss) of a process in MB, from /proc."""
+    values = {}
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith(('VmRSS:', 'VmHWM:')):
+                key, value = line.split(':')
+                values[key] = int(value.split()[0]) / 1024
+    return values.get('VmRSS', 0.0), values.get('VmHWM', 0.0)
+
+
+# ───────────────────────────────────────────
+# VIEWERS
+# ───────────────────────────────────────────
+
+class Viewer:
+    """One Socket.IO client in one match room; records when each ball id arrived."""
+
+    def __init__(self, match_id):
+        import socketio
+        self.match_id = match_id
+        self.sio = socketio.AsyncClient(reconnection=False)
+        self.joined_at = None
+        self.received = {}    # ball id -> perf_counter() at arrival
+        self.resyncs = 0
+        self.sio.on('match_joined', self._joined)
+        self.sio.on('match_update', self._update)
+
+    def _seen(self, balls, now):
+        for ball in balls:
+            self.received.setdefault(ball['id'], now)
+
+    async def _joined(self, snapshot):
+        now = time.perf_counter()
+        if self.joined_at is None:
+            self.joined_at = now
+        else:
+            self.resyncs += 1
+            self._seen(snapshot.get('recent_balls', []), now)
+
+    async def _update(self, frame):
+        now = time.perf_counter()
+        for item in frame['events']:
+            if item['event'] == 'ball_update':
+                self._seen([item['data']], now)
+            elif item['event'] == 'balls_update':
+                self._seen(item['data']['balls'], now)
+
+    async def start(self, url):
+        await self.sio.connect(url, transports=['websocket'], wait_timeout=30)
+        await self.sio.emit('join_match', {'match_id': self.match_id})
+
+
+async def _run_viewers(url, match_ids, count, offset, concurrency, join_timeout, ready, stop):
+    viewers = [Viewer(match_ids[(offset + i) % len(match_ids)]) for i in range(count)]
+    gate = asyncio.Semaphore(concurrency)
+
+    async def start(viewer):
+        async with gate:
+            await asyncio.wait_for(viewer.start(url), join_timeout)
+
+    await asyncio.gather(*(start(viewer) for viewer in viewers), return_exceptions=True)
+    deadline = time.perf_counter() + join_timeout
+    while any(v.joined_at is None for v in viewers) and time.perf_counter() < deadline:
+        await asyncio.sleep(0.05)
+    failed = [viewer for viewer in viewers if viewer.joined_at is None]
+    ready.put(len(failed))
+    while not stop.is_set():
+        await asyncio.sleep(0.1)
+    results = [(v.match_id, v.joined_at, v.received, v.resyncs, v.sio.connected)
+               for v in viewers if v.joined_at is not None]
+    await asyncio.gather(*(viewer.sio.disconnect() for viewer in viewers), return_exceptions=True)
+    return results
+
+
+def viewer_process(url, match_ids, count, offset, concurrency, join_timeout, ready, stop, results):
+    _raise_fd_limit()
+    results.put(asyncio.run(_run_viewers(url, match_ids, count, offset, concurrency, join_timeout, ready, stop)))
+
+
+# ───────────────────────────────────────────
+# SCORER
+# ───────────────────────────────────────────
+
+async def score(url, matches, rate, duration):
+    """Post `rate` balls/s per match for `duration` s; returns ({ball id: (match id, sent at)}, POST ms)."""
+    import aiohttp
+    sent, post_ms = {}, []
+
+    async def innings(session, match):
+        interval = 1 / rate
+        next_at = time.perf_counter()
+        end = next_at + duration
+        ball = 0
+        while next_at < end:
+            await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+            started = time.perf_counter()
+            async with session.post(f'{url}/api/v1/balls/record', json={
+                'innings_id': match['innings_id'], 'striker_id': 1 + ball % 2, 'non_striker_id': 2 - ball % 2,
+                'bowler_id': 12 + (ball // 6) % 5, 'runs': (0, 1, 4, 0, 2, 6)[ball % 6],
+            }) as response:
+                body = await response.json()
+            if response.status != 201:
+                raise RuntimeError(f"record failed: {response.status} {body}")
+            post_ms.append((time.perf_counter() - started) * 1000)
+            sent[body['ball']['id']] = (match['match_id'], started)
+            ball += 1
+            next_at += interval
+
+    async with aiohttp.ClientSession() as session:
+        await asyncio.gather(*(innings(session, match) for match in matches))
+    return sent, post_ms
+
+
+# ───────────────────────────────────────────
+# REPORT
+# ───────────────────────────────────────────
+
+def percentile(ordered, p):
+    if not ordered:
+        return float('nan')
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+def report(args, sent, post_ms, viewers, failed, memory):
+    latencies, expected, dropped, resyncs, disconnected = [], 0, 0, 0, 0
+    for match_id, joined_at, received, viewer_resyncs, connected in viewers:
+        resyncs += viewer_resyncs
+        disconnected += not connected
+        for ball_id, (ball_match, sent_at) in sent.items():
+            if ball_match != match_id or sent_at < joined_at:
+                continue
+            expected += 1
+            arrived = received.get(ball_id)
+            if arrived is None:
+                dropped += 1
+            else:
+                latencies.append((arrived - sent_at) * 1000)
+    latencies.sort()
+    post_ms.sort()
+    idle, joined, peak = memory
+    print(f"\nclients={args.clients} matches={args.matches} rate={args.rate}/s per match "
+          f"duration={args.duration}s emit_interval={args.emit_interval}s processes={args.processes}")
+    print(f"balls scored       {len(sent)}")
+    print(f"deliveries         {len(latencies)} of {expected} expected, dropped {dropped} "
+          f"({dropped / expected * 100 if expected else 0:.2f}%)")
+    print(f"delivery latency   p50 {percentile(latencies, 50):.1f} ms  p90 {percentile(latencies, 90):.1f} ms  "
+          f"p99 {percentile(latencies, 99):.1f} ms  max {latencies[-1] if latencies else float('nan'):.1f} ms")
+    print(f"POST latency       p50 {percentile(post_ms, 50):.1f} ms  p99 {percentile(post_ms, 99):.1f} ms  "
+          f"mean {statistics.fmean(post_ms) if post_ms else float('nan'):.1f} ms")
+    print(f"viewers            {len(viewers)} joined, {failed} failed to connect/join, "
+          f"{disconnected} disconnected during the run")
+    print(f"resyncs            {resyncs}")
+    print(f"server memory      idle {idle:.0f} MB  joined {joined:.0f} MB  peak {peak:.0f} MB  "
+          f"(~{(joined - idle) * 1024 / max(args.clients, 1):.1f} KB per viewer)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=1000, help='viewers, across all processes')
+    parser.add_argument('--matches', type=int, default=1, help='live matches (rooms) the viewers are spread over')
+    parser.add_argument('--rate', type=float, default=2.0, help='balls per second per match')
+    parser.add_argument('--duration', type=float, default=20.0, help='seconds of scoring')
+    parser.add_argument('--processes', type=int, default=1, help='viewer processes')
+    parser.add_argument('--connect-concurrency', type=int, default=100, help='connections opened at once per process')
+    parser.add_argument('--emit-interval', type=float, default=0.25, help="server's MATCH_EMIT_INTERVAL")
+    parser.add_argument('--drain', type=float, default=5.0, help='seconds to wait for late deliveries')
+    parser.add_argument('--join-timeout', type=float, default=60.0, help='seconds a viewer gets to connect and join')
+    parser.add_argument('--max-connections', type=int, help='WSGI connection limit of the worker (default clients + 100)')
+    # server mode (started by the load generator itself)
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--database', help=argparse.SUPPRESS)
+    parser.add_argument('--setup', help=argparse.SUPPRESS)
+    parser.add_argument('--overs', type=int, default=20, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    _raise_fd_limit()
+    if args.serve:
+        serve(args)
+        return
+
+    with tempfile.TemporaryDirectory(prefix='ws-load-') as workdir:
+        server, url, matches = start_server(args, workdir)
+        try:
+            pid = server.pid
+            idle, _ = server_memory(pid)
+            match_ids = [match['match_id'] for match in matches]
+            ready, stop, results = multiprocessing.Queue(), multiprocessing.Event(), multiprocessing.Queue()
+            share, extra = divmod(args.clients, args.processes)
+            procs, offset = [], 0
+            for n in range(args.processes):
+                count = share + (n < extra)
+                procs.append(multiprocessing.Process(target=viewer_process, args=(
+                    url, match_ids, count, offset, args.connect_concurrency, args.join_timeout, ready, stop, results)))
+                offset += count
+            started = time.perf_counter()
+            for proc in procs:
+                proc.start()
+            failed = 0
+            for _ in procs:
+                failed += ready.get(timeout=args.join_timeout * 2 + 60)
+            print(f"{args.clients - failed} viewers joined in {time.perf_counter() - started:.1f}s")
+            joined, _ = server_memory(pid)
+
+            sent, post_ms = asyncio.run(score(url, matches, args.rate, args.duration))
+            time.sleep(args.drain)
+            _, peak = server_memory(pid)
+            stop.set()
+            viewers = [viewer for _ in procs for viewer in results.get(timeout=120)]
+            for proc in procs:
+                proc.join()
+            report(args, sent, post_ms, viewers, failed, (idle, joined, peak))
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# test_archive.py
+# Frozen completed matches (ArchiveService, MatchArchive).
+# Run with: python -m pytest -q test_archive.py
+
+import pytest
+
+from app.extensions import db
+from app.middleware.query_counter import count_queries
+from app.models import Match, MatchArchive
+from app.services import ArchiveService, BallService, InningsService, MatchService
+
+
+@pytest.fixture
+def match_id(app):
+    match_id = MatchService.create_match(team_1_id=1, team_2_id=2, over_limit=20).id
+    innings_id = InningsService.start_innings(match_id, 1, 2, 1).id
+    ids = app.player_ids
+    for runs in (1, 4, 0, 6):
+        BallService.record_ball(innings_id=innings_id, striker_id=ids[0], non_striker_id=ids[1],
+                                bowler_id=ids[12], runs=runs)
+    return match_id
+
+
+def test_only_a_completed_match_has_its_archive_discarded(app, match_id):
+    with count_queries() as stats:
+        MatchService.update_match_status(match_id, 'live')
+    assert not [statement for statement in stats.statements if 'match_archive' in statement]
+
+    MatchService.update_match_status(match_id, 'completed')
+    assert MatchArchive.query.count() == 1
+    MatchService.update_match_status(match_id, 'live')   # corrected by hand
+    assert MatchArchive.query.count() == 0
+    assert ArchiveService.load(match_id) is None
+
+
+def complete_without_freezing(match_id):
+    match = db.session.get(Match, match_id)
+    match.status = 'completed'
+    db.session.commit()
+
+
+def test_freeze_and_load_round_trip(app, match_id):
+    assert ArchiveService.freeze(match_id) is None   # not completed yet
+    complete_without_freezing(match_id)
+    summary = MatchService.get_match_summary(match_id)
+    innings = [InningsService.get_innings_summary(i['id']) for i in summary['innings']]
+
+    archive = ArchiveService.freeze(match_id)
+    assert ArchiveService.freeze(match_id) is archive   # already frozen
+    document = ArchiveService.load(match_id)
+    assert document == {'summary': summary, 'innings': innings}
+    assert ArchiveService.load_innings(innings[0]['innings_details']['id']) == innings[0]
+    with count_queries() as stats:
+        assert MatchService.get_match_summary(match_id) == summary
+        assert InningsService.get_innings_summary(innings[0]['innings_details']['id']) == innings[0]
+    assert stats.count == 0   # memoised blob, no scorecard tables
+
+
+def test_archive_bytes_depend_only_on_the_match(app, match_id):
+    complete_without_freezing(match_id)
+    digest = ArchiveService.freeze(match_id).digest
+    ArchiveService.discard(match_id)
+    assert ArchiveService.load(match_id) is None
+    assert ArchiveService.freeze(match_id).digest == digest
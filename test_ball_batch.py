@@ -0,0 +1,189 @@
+# test_ball_batch.py
+# Batch ball ingestion (POST /api/v1/balls/record/batch) and what it sends
+# to the match room, next to the single-ball route (POST /balls/record).
+# Run with: python -m pytest -q test_ball_batch.py
+
+import msgpack
+import pytest
+
+from app.extensions import db, socketio
+from app.models import Ball, Inning
+from app.services import MatchService
+from app.websockets import compact
+from app.websockets.live_matches import LiveMatches
+
+
+@pytest.fixture
+def innings(app, client):
+    match_id = MatchService.create_match(team_1_id=1, team_2_id=2, over_limit=1).id
+    innings_id = client.post('/api/v1/balls/innings/start', json={
+        'match_id': match_id, 'batting_team_id': 1, 'bowling_team_id': 2, 'inning_number': 1,
+    }).json['innings']['id']
+    return match_id, innings_id
+
+
+def deliveries(app, count, **fields):
+    ids = app.player_ids
+    return [dict({'striker_id': ids[0], 'non_striker_id': ids[1], 'bowler_id': ids[12], 'runs': 1}, **fields)
+            for _ in range(count)]
+
+
+def room_events(viewer):
+    return [(item['event'], item['data'])
+            for packet in viewer.get_received() if packet['name'] == 'match_update'
+            for item in packet['args'][0]['events']]
+
+
+def batch(client, innings_id, balls):
+    return client.post('/api/v1/balls/record/batch', json={'innings_id': innings_id, 'balls': balls})
+
+
+def test_batch_records_every_ball_in_order(app, client, innings):
+    _, innings_id = innings
+    response = batch(client, innings_id, deliveries(app, 2) + deliveries(app, 1, extras=1, extras_type='wide', runs=0)
+                     + deliveries(app, 1, runs=4))
+    assert response.status_code == 201
+    assert [(ball['over_number'], ball['ball_number']) for ball in response.json['balls']] == [
+        (0, 1), (0, 2), (0, 3), (0, 3)]
+    assert response.json['inning_summary'] == {'total_runs': 7, 'total_wickets': 0, 'total_overs': 0.3, 'run_rate': 23.33}
+
+
+@pytest.mark.parametrize('balls, error', [
+    ([], 'balls must be a non-empty list'),
+    ('6 balls', 'balls must be a non-empty list'),
+    ([{}] * 4, 'at most 3 balls can be recorded in one batch'),
+])
+def test_batch_shape_is_checked(app, client, innings, balls, error):
+    _, innings_id = innings
+    app.config['BALL_BATCH_MAX'] = 3
+    response = batch(client, innings_id, balls)
+    assert (response.status_code, response.json['error']) == (400, error)
+
+
+
+def test_batch_envelope_is_checked(app, client, innings):
+    _, innings_id = innings
+    response = client.post('/api/v1/balls/record/batch', json=deliveries(app, 1))
+    assert (response.status_code, response.json['error']) == (400, 'request body must be a JSON object')
+
+    response = batch(client, 'twelve', deliveries(app, 1))
+    assert (response.status_code, list(response.json['errors'])) == (400, ['innings_id'])
+
+    response = batch(client, str(innings_id), deliveries(app, 1))
+    assert response.status_code == 201
+
+def test_invalid_ball_rejects_the_whole_batch(app, client, innings):
+    _, innings_id = innings
+    response = batch(client, innings_id, deliveries(app, 1) + deliveries(app, 1, is_wicket=True))
+    assert (response.status_code, response.json['error']) == (400, 'ball 1: wicket_type is required when is_wicket is true')
+
+    response = batch(client, innings_id, deliveries(app, 1) + [{'striker_id': app.player_ids[0]}])
+    assert response.status_code == 400
+    assert set(response.json['errors']) == {'1'}   # index of the bad ball
+
+    # Seventh ball of a one-over innings: nothing of the batch is kept
+    response = batch(client, innings_id, deliveries(app, 7))
+    assert (response.status_code, response.json['error']) == (400, 'cannot record ball in completed innings')
+    assert Ball.query.filter_by(inning_id=innings_id).count() == 0
+
+    response = batch(client, innings_id, deliveries(app, 1))
+    assert [(ball['over_number'], ball['ball_number']) for ball in response.json['balls']] == [(0, 1)]
+
+
+def test_batch_that_ends_the_innings_sends_the_full_innings(app, client, innings):
+    match_id, innings_id = innings
+    viewer = socketio.test_client(app)
+    viewer.emit('join_match', {'match_id': match_id})
+    viewer.get_received()
+
+    response = client.post('/api/v1/balls/record/batch', json={
+        'innings_id': innings_id, 'balls': deliveries(app, 6, extras=1, extras_type='bye', runs=0),
+    })
+    assert response.status_code == 201
+    assert response.json['inning_summary']['total_runs'] == 6
+    assert innings_id not in app.extensions['innings_states']
+
+    events = room_events(viewer)
+    assert [event for event, _ in events] == ['balls_update', 'innings_complete']
+    score = events[0][1]['score']
+    assert score['id'] == innings_id
+    assert score['is_completed'] is True
+    assert score['extras'] == 6
+    assert events[1][1]['final_score'] == {'runs': 6, 'wickets': 0, 'overs': 1.0}
+
+
+
+def test_single_ball_that_ends_the_innings_announces_it(app, client, innings):
+    match_id, innings_id = innings
+    viewer = socketio.test_client(app)
+    viewer.emit('join_match', {'match_id': match_id})
+    batch(client, innings_id, deliveries(app, 5))
+    viewer.get_received()
+
+    response = client.post('/api/v1/balls/record', json=dict(deliveries(app, 1)[0], innings_id=innings_id))
+    assert response.status_code == 201
+    assert response.json['inning_summary'] == {'total_runs': 6, 'total_wickets': 0, 'total_overs': 1.0, 'run_rate': 6.0}
+    assert innings_id not in app.extensions['innings_states']   # not rebuilt for the response
+    events = room_events(viewer)
+    assert [event for event, _ in events] == ['ball_update', 'score_update', 'innings_complete']
+    assert events[1][1]['is_completed'] is True
+    assert events[2][1]['final_score'] == {'runs': 6, 'wickets': 0, 'overs': 1.0}
+
+def joined(app, match_id):
+    viewer = socketio.test_client(app)
+    viewer.emit('join_match', {'match_id': match_id})
+    [snapshot] = [packet['args'][0] for packet in viewer.get_received() if packet['name'] == 'match_joined']
+    return snapshot
+
+
+def test_batch_keeps_the_join_snapshot_current(app, client, innings):
+    match_id, innings_id = innings
+    before = joined(app, match_id)['current_innings']   # caches the snapshot
+
+    client.post('/api/v1/balls/record/batch', json={
+        'innings_id': innings_id, 'balls': deliveries(app, 3, extras=1, extras_type='wide', runs=0),
+    })
+    current = joined(app, match_id)['current_innings']
+    assert (current['total_runs'], current['extras'], current['is_completed']) == (3, 3, False)
+    assert current['updated_at'] != before['updated_at']
+
+    client.post('/api/v1/balls/record/batch', json={'innings_id': innings_id, 'balls': deliveries(app, 6)})
+    assert joined(app, match_id)['current_innings'] is None   # no innings in progress
+
+
+def test_batch_that_ends_the_innings_reloads_the_ticker_line(app, client, innings):
+    match_id, innings_id = innings
+    ticker = socketio.test_client(app)
+    ticker.emit('join_ticker')
+    ticker.get_received()
+
+    balls = client.post('/api/v1/balls/record/batch', json={
+        'innings_id': innings_id, 'balls': deliveries(app, 2),
+    }).json['balls']
+    [line] = [packet['args'][0] for packet in ticker.get_received() if packet['name'] == 'ticker_update']
+    assert (line['innings'], line['runs'], line['overs']) == (1, 2, 0.2)
+
+    # A balls_update that ends the innings reloads the line on its own (a
+    # frame from another worker may not carry innings_complete with it)
+    inning = db.session.get(Inning, innings_id)
+    inning.is_completed = True
+    db.session.commit()
+    line = LiveMatches.apply(match_id, [('balls_update', {'balls': balls, 'score': inning.to_dict()})])
+    assert line['status'] == 'live'
+    assert (line['innings'], line['runs']) == (None, None)   # between innings
+
+
+def test_batch_score_is_the_base_of_the_next_compact_delta(app, client, innings):
+    match_id, innings_id = innings
+    viewer = socketio.test_client(app, auth={'protocol': compact.PROTOCOL})
+    viewer.emit('join_match', {'match_id': match_id})
+    viewer.get_received()
+
+    batch(client, innings_id, deliveries(app, 2))
+    client.post('/api/v1/balls/record', json=dict(deliveries(app, 1, runs=4)[0], innings_id=innings_id))
+    frames = [msgpack.unpackb(packet['args'][0]) for packet in viewer.get_received() if packet['name'] == 'match_update']
+    assert [[event for event, _ in frame['events']] for frame in frames] == [['balls_update'], ['ball_update', 'score_update']]
+    balls_update, score = frames[0]['events'][0][1], frames[1]['events'][1][1]
+    assert 'base' not in balls_update['score'] and balls_update['score']['total_runs'] == 2
+    assert score['base'] == balls_update['score']['updated_at']
+    assert score['total_runs'] == 6
@@ -0,0 +1,135 @@
+# test_ball_service.py
+# Ball path on the in-memory innings state (app/services/innings_state.py):
+# totals and positions, writes from a stale state, rebuilds after eviction.
+# Run with: python -m pytest -q test_ball_service.py
+
+import pytest
+
+from app.extensions import db
+from app.models import Ball, BattingScorecard, BowlingScorecard, Inning, Over
+from app.services import BallService, InningsService, MatchService
+from app.services.innings_state import InningsState
+
+
+@pytest.fixture
+def innings_id(app):
+    match_id = MatchService.create_match(team_1_id=1, team_2_id=2, over_limit=20).id
+    return InningsService.start_innings(match_id, 1, 2, 1).id
+
+
+def bowl(app, innings_id, runs=0, bowler=12, **fields):
+    ids = app.player_ids
+    return BallService.record_ball(innings_id=innings_id, striker_id=ids[0], non_striker_id=ids[1],
+                                   bowler_id=ids[bowler], runs=runs, **fields)
+
+
+def totals(innings_id):
+    inning = db.session.get(Inning, innings_id)
+    db.session.refresh(inning)
+    return inning.total_runs, inning.total_wickets, inning.extras, inning.total_overs
+
+
+def test_extras_and_wickets_move_totals_and_position(app, innings_id):
+    balls = [
+        bowl(app, innings_id, 1),
+        bowl(app, innings_id, extras=1, extra_type='wide'),
+        bowl(app, innings_id, extras=2, extra_type='bye'),
+        bowl(app, innings_id, is_wicket=True, wicket_type='bowled', dismissed_player_id=app.player_ids[0]),
+        bowl(app, innings_id, 4, extras=1, extra_type='no-ball'),
+        bowl(app, innings_id),
+        bowl(app, innings_id),
+        bowl(app, innings_id),
+        bowl(app, innings_id, 1),
+    ]
+    assert [(ball.over_number, ball.ball_number) for ball in balls] == [
+        (0, 1), (0, 2), (0, 2), (0, 3), (0, 4), (0, 4), (0, 5), (0, 6), (1, 1)]
+    assert [ball.is_legal_delivery for ball in balls[:5]] == [True, False, True, True, False]
+    assert totals(innings_id) == (10, 1, 4, 1.1)
+
+
+def test_stale_state_is_rebuilt_and_the_ball_replayed(app, innings_id):
+    bowl(app, innings_id, 1)
+    stale = InningsState.get(innings_id)
+    # Another worker scores the next ball from its own state
+    InningsState.evict(innings_id)
+    bowl(app, innings_id, 4)
+    app.extensions['innings_states'][innings_id] = stale
+
+    ball = bowl(app, innings_id, 2)
+    assert (ball.over_number, ball.ball_number) == (0, 3)
+    assert totals(innings_id) == (7, 0, 0, 0.3)
+    assert Ball.query.filter_by(inning_id=innings_id).count() == 3
+    assert InningsState.get(innings_id) is not stale
+
+
+def test_state_evicted_mid_over_is_rebuilt_from_the_database(app, innings_id):
+    for runs in (1, 4, 0):
+        bowl(app, innings_id, runs)
+    InningsState.evict(innings_id)
+
+    ball = bowl(app, innings_id, 2)
+    assert (ball.over_number, ball.ball_number) == (0, 4)
+    over = Over.query.filter_by(inning_id=innings_id, over_number=0).one()
+    assert (over.legal_balls, over.runs) == (4, 7)
+    [scorecard] = BattingScorecard.query.filter_by(innings_id=innings_id).all()
+    assert (scorecard.runs, scorecard.balls_faced) == (7, 4)
+    state = InningsState.get(innings_id)
+    assert (state.total_runs, state.legal_balls, state.next_position()) == (7, 4, (0, 5))
+
+
+def test_failed_ball_leaves_no_trace(app, innings_id):
+    bowl(app, innings_id, 1)
+    with pytest.raises(ValueError):
+        bowl(app, innings_id, 9)
+    assert totals(innings_id) == (1, 0, 0, 0.1)
+    ball = bowl(app, innings_id)
+    assert (ball.over_number, ball.ball_number) == (0, 2)
+    assert Ball.query.filter_by(inning_id=innings_id).count() == 2
+
+
+def bowl_over(app, innings_id, bowler, first=None):
+    """A complete over of dots by `bowler`, opened by the delivery `first` (its fields) if given."""
+    legal = 6
+    if first:
+        legal -= bowl(app, innings_id, bowler=bowler, **first).is_legal_delivery
+    for _ in range(legal):
+        bowl(app, innings_id, bowler=bowler)
+
+
+def test_overs_and_maidens_are_aggregated_per_ball(app, innings_id):
+    bowl_over(app, innings_id, 12, first={'extras': 1, 'extra_type': 'leg-bye'})   # maiden: leg byes aren't charged
+    bowl_over(app, innings_id, 13, first={'extras': 1, 'extra_type': 'wide'})      # not a maiden
+    bowl_over(app, innings_id, 12)
+
+    overs = Over.query.filter_by(inning_id=innings_id).order_by(Over.over_number).all()
+    assert [(o.over_number, o.legal_balls, o.runs, o.runs_conceded, o.is_maiden) for o in overs] == [
+        (0, 6, 1, 0, True), (1, 6, 1, 1, False), (2, 6, 0, 0, True)]
+    maidens = {row.player_id: row.maidens for row in BowlingScorecard.query.filter_by(innings_id=innings_id)}
+    assert maidens == {app.player_ids[12]: 2, app.player_ids[13]: 0}
+    assert BallService.get_over_summary(innings_id, 1, include_balls=False)['is_maiden'] is False
+
+
+def test_rebuild_overs_matches_the_ball_path(app, innings_id):
+    bowl_over(app, innings_id, 12, first={'extras': 2, 'extra_type': 'bye'})
+    bowl_over(app, innings_id, 13, first={'runs': 4, 'extras': 1, 'extra_type': 'no-ball'})
+    bowl(app, innings_id, 1, bowler=12)
+    columns = lambda: [(o.over_number, o.bowler_id, o.runs, o.runs_conceded, o.extras, o.wickets, o.legal_balls, o.is_maiden)
+                       for o in Over.query.filter_by(inning_id=innings_id).order_by(Over.over_number)]
+    recorded = columns()
+    assert BallService.rebuild_overs(innings_id) == 3
+    db.session.expire_all()
+    assert columns() == recorded
+
+
+def test_rejected_balls_keep_the_live_state(app, innings_id):
+    bowl(app, innings_id, 1)
+    state = InningsState.get(innings_id)
+    ids = app.player_ids
+    good = dict(striker_id=ids[0], non_striker_id=ids[1], bowler_id=ids[12], runs=4)
+    for bad in ({'runs': 9}, {'extras': -1}, {'innings_id': innings_id + 1}):
+        with pytest.raises(ValueError):
+            BallService.record_balls(innings_id, [good, dict(good, **bad)])
+
+    assert InningsState.get(innings_id) is state
+    assert (state.total_runs, state.next_position()) == (1, (0, 2))
+    assert Ball.query.filter_by(inning_id=innings_id).count() == 1
@@ -0,0 +1,130 @@
+# test_cache.py
+# Response cache for the read API, on SimpleCache (TestingConfig).
+# Run with: python -m pytest -q test_cache.py
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db, cache
+
+
+@pytest.fixture
+def queries(app):
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    yield statements
+    event.remove(db.engine, 'before_cursor_execute', listener)
+
+
+def start_match(client):
+    match_id = client.post('/api/v1/matches', json={'team_1_id': 1, 'team_2_id': 2}).json['match']['id']
+    innings = client.post('/api/v1/balls/innings/start', json={
+        'match_id': match_id, 'batting_team_id': 1, 'bowling_team_id': 2, 'inning_number': 1,
+    }).json['innings']
+    return match_id, innings['id']
+
+
+def record_ball(client, app, innings_id, runs):
+    ids = app.player_ids
+    response = client.post('/api/v1/balls/record', json={
+        'innings_id': innings_id, 'striker_id': ids[0], 'non_striker_id': ids[1],
+        'bowler_id': ids[12], 'runs': runs,
+    })
+    assert response.status_code == 201
+
+
+def test_repeated_read_is_served_from_cache(app, client, queries):
+    match_id, _ = start_match(client)
+    first = client.get(f'/api/v1/matches/{match_id}')
+    queries.clear()
+    second = client.get(f'/api/v1/matches/{match_id}')
+    assert second.status_code == 200
+    assert second.json == first.json
+    assert queries == []
+
+
+def test_ball_invalidates_match_but_not_match_list(app, client, queries):
+    match_id, innings_id = start_match(client)
+    client.get(f'/api/v1/matches/{match_id}')
+    client.get(f'/api/v1/matches/{match_id}/scorecard')
+    client.get('/api/v1/matches')
+    record_ball(client, app, innings_id, 4)
+
+    summary = client.get(f'/api/v1/matches/{match_id}').json
+    assert summary['match']['innings'][0]['total_runs'] == 4
+    scorecard = client.get(f'/api/v1/matches/{match_id}/scorecard').json
+    assert scorecard['innings'][0]['batting'][0]['runs'] == 4
+
+    queries.clear()
+    client.get('/api/v1/matches')
+    assert queries == []
+
+
+def test_team_write_invalidates_team_reads(app, client):
+    assert client.get('/api/v1/teams').json['count'] == 2
+    assert client.get('/api/v1/teams/1').json['team']['short_name'] == 'MI'
+    client.post('/api/v1/teams', json={'name': 'Royal Challengers', 'short_name': 'RCB'})
+    client.put('/api/v1/teams/1', json={'short_name': 'MUM'})
+    assert client.get('/api/v1/teams').json['count'] == 3
+    assert client.get('/api/v1/teams/1').json['team']['short_name'] == 'MUM'
+
+
+def test_not_found_is_not_cached(app, client):
+    assert client.get('/api/v1/teams/99').status_code == 404
+    client.post('/api/v1/teams', json={'name': 'Royal Challengers', 'short_name': 'RCB'})
+    assert client.get('/api/v1/teams/3').status_code == 200
+
+
+def test_completed_match_is_cached_without_expiry(app, client):
+    match_id, _ = start_match(client)
+    from app.services import MatchService
+    MatchService.update_match_status(match_id, 'completed')
+    client.get(f'/api/v1/matches/{match_id}')
+    backend = cache.cache
+    keys = [key for key in backend._cache if key.startswith('view:') and f'/matches/{match_id}?' in key]
+    assert len(keys) == 1
+    expires, _ = backend._cache[keys[0]]
+    assert expires == 0
+
+
+def test_conditional_get_returns_304_until_next_ball(app, client, queries):
+    match_id, innings_id = start_match(client)
+    first = client.get(f'/api/v1/matches/{match_id}')
+    etag = first.headers['ETag']
+    assert not etag.startswith('W/')
+
+    queries.clear()
+    unchanged = client.get(f'/api/v1/matches/{match_id}', headers={'If-None-Match': etag})
+    assert unchanged.status_code == 304
+    assert unchanged.data == b''
+    assert unchanged.headers['ETag'] == etag
+    assert queries == []
+
+    record_ball(client, app, innings_id, 6)
+    changed = client.get(f'/api/v1/matches/{match_id}', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+    assert changed.json['match']['innings'][0]['total_runs'] == 6
+
+
+def test_toss_changes_match_etag(app, client):
+    match_id, _ = start_match(client)
+    etag = client.get(f'/api/v1/matches/{match_id}').headers['ETag']
+    client.post(f'/api/v1/matches/{match_id}/toss', json={'toss_winner_id': 1, 'toss_decision': 'bat'})
+    assert client.get(f'/api/v1/matches/{match_id}', headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_bump_after_eviction_does_not_reuse_a_version(app, client):
+    # Version key lost (eviction, cache restart) right before each write
+    cache.delete('ver:teams')
+    client.post('/api/v1/teams', json={'name': 'Royal Challengers', 'short_name': 'RCB'})
+    first = client.get('/api/v1/teams')
+    assert first.json['count'] == 3
+
+    cache.delete('ver:teams')
+    client.post('/api/v1/teams', json={'name': 'Delhi Capitals', 'short_name': 'DC'})
+    second = client.get('/api/v1/teams', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert second.headers['ETag'] != first.headers['ETag']
+    assert second.json['count'] == 4
@@ -0,0 +1,88 @@
+# test_career_stats.py
+# Materialized career totals (PlayerCareerStats): incremented by the ball
+# path, rebuilt with `flask rebuild-career-stats`, always equal to the
+# totals of the ball log.
+# Run with: python -m pytest -q test_career_stats.py
+
+import pytest
+
+from app.extensions import db
+from app.models import PlayerCareerStats
+from app.services import BallService, InningsService, MatchService, StatisticsService
+
+
+@pytest.fixture
+def innings_id(app):
+    match_id = MatchService.create_match(team_1_id=1, team_2_id=2, over_limit=20).id
+    return InningsService.start_innings(match_id, 1, 2, 1).id
+
+
+def bowl(app, innings_id, runs=0, **fields):
+    ids = app.player_ids
+    return BallService.record_ball(innings_id=innings_id, striker_id=ids[0], non_striker_id=ids[1],
+                                   bowler_id=ids[12], runs=runs, **fields)
+
+
+def stored(player_id):
+    row = db.session.get(PlayerCareerStats, player_id)
+    db.session.refresh(row)
+    return {name: getattr(row, name) for name in PlayerCareerStats.COUNTERS}
+
+
+def test_rows_created_before_an_upgrade_keep_the_history(app, innings_id):
+    for runs in (4, 6, 1):
+        bowl(app, innings_id, runs)
+    # Database from before the table existed: no rows, never rebuilt
+    PlayerCareerStats.query.delete()
+    db.session.commit()
+
+    bowl(app, innings_id, 2)
+    batsman, bowler = app.player_ids[0], app.player_ids[12]
+    assert stored(batsman) == StatisticsService.aggregate_career_counters(batsman)
+    assert stored(batsman)['runs'] == 13
+    assert stored(bowler)['balls_bowled'] == 4
+    assert StatisticsService.get_player_career_stats(batsman)['batting']['runs'] == 13
+
+
+def test_ball_path_increments_every_counter(app, innings_id):
+    batsman, partner, bowler = app.player_ids[0], app.player_ids[1], app.player_ids[12]
+    bowl(app, innings_id, 4)
+    bowl(app, innings_id, 6)
+    bowl(app, innings_id, extras=1, extra_type='wide')
+    bowl(app, innings_id, is_wicket=True, wicket_type='caught', dismissed_player_id=batsman)
+    bowl(app, innings_id, 1, is_wicket=True, wicket_type='run-out', dismissed_player_id=partner)
+
+    assert stored(batsman) == dict(runs=11, balls_faced=4, dismissals=1, fours=1, sixes=1,
+                                   wickets=0, runs_conceded=0, balls_bowled=0)
+    assert stored(partner)['dismissals'] == 1
+    assert stored(bowler) == dict(runs=0, balls_faced=0, dismissals=0, fours=0, sixes=0,
+                                  wickets=1, runs_conceded=12, balls_bowled=4)   # run out not credited
+    for player_id in (batsman, partner, bowler):
+        assert stored(player_id) == StatisticsService.aggregate_career_counters(player_id)
+
+
+def test_rebuild_command_repairs_drift(app, innings_id):
+    for runs in (1, 4, 0, 2):
+        bowl(app, innings_id, runs)
+    batsman = app.player_ids[0]
+    expected = stored(batsman)
+    db.session.get(PlayerCareerStats, batsman).runs = 999
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=['rebuild-career-stats'])
+    assert result.output == 'Rebuilt career stats for 2 players\n'
+    assert stored(batsman) == expected
+    assert PlayerCareerStats.query.count() == 2
+
+
+def test_rebuild_counts_dismissals_like_the_ball_path(app, innings_id):
+    batsman = app.player_ids[0]
+    bowl(app, innings_id, 1, dismissed_player_id=batsman)   # named but not out
+    bowl(app, innings_id, is_wicket=True, wicket_type='bowled', dismissed_player_id=batsman)
+    incremental = stored(batsman)
+    assert incremental['dismissals'] == 1
+    assert StatisticsService.aggregate_career_counters(batsman) == incremental
+    assert StatisticsService.aggregate_career_counters()[batsman] == incremental
+
+    app.test_cli_runner().invoke(args=['rebuild-career-stats'])
+    assert stored(batsman) == incremental
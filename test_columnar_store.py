@@ -0,0 +1,68 @@
+# test_columnar_store.py
+# The ball table as memory-mapped .npy columns per season (ColumnarStore,
+# `flask export-columnar`).
+# Run with: python -m pytest -q test_columnar_store.py
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.services import BallService, ColumnarStore, ExportService, InningsService, MatchService
+
+
+@pytest.fixture
+def seasons(app):
+    """One match in 2025 (2 balls) and one in 2026 (4 balls: a wide, a bye and a wicket)."""
+    ids = app.player_ids
+    plain = dict(striker_id=ids[0], non_striker_id=ids[1], bowler_id=ids[12])
+    for year, deliveries in [
+        (2025, [dict(runs=1), dict(runs=4)]),
+        (2026, [dict(runs=2), dict(extras=1, extra_type='wide'), dict(extras=2, extra_type='bye'),
+                dict(is_wicket=True, wicket_type='bowled', dismissed_player_id=ids[0])]),
+    ]:
+        match_id = MatchService.create_match(team_1_id=1, team_2_id=2, over_limit=20, match_date=datetime(year, 4, 1)).id
+        innings_id = InningsService.start_innings(match_id, 1, 2, 1).id
+        for delivery in deliveries:
+            BallService.record_ball(innings_id=innings_id, **plain, **delivery)
+
+
+def test_export_writes_one_partition_per_season(app, seasons, tmp_path):
+    assert ColumnarStore.export(str(tmp_path)) == {2025: 2, 2026: 4}
+    assert ColumnarStore.seasons(str(tmp_path)) == [2025, 2026]
+    assert ColumnarStore.seasons(str(tmp_path / 'missing')) == []
+
+
+def test_columns_round_trip(app, seasons, tmp_path):
+    ColumnarStore.export(str(tmp_path))
+    [rows] = list(ExportService.ball_batches(MatchService.query_matches(date_from=datetime(2026, 1, 1))))
+    arrays = ColumnarStore.load(str(tmp_path), 2026)
+
+    for name, (_, dtype) in ColumnarStore.COLUMNS.items():
+        assert isinstance(arrays[name], np.memmap) and not arrays[name].flags.writeable
+        assert arrays[name].dtype == np.dtype(dtype)
+    assert arrays['ball_id'].tolist() == [row['id'] for row in rows]
+    assert arrays['runs_scored'].tolist() == [2, 0, 0, 0]
+    assert arrays['extra_runs'].tolist() == [0, 1, 2, 0]
+    assert arrays['is_legal_delivery'].tolist() == [True, False, True, True]
+    assert arrays['match_date'].tolist() == [datetime(2026, 4, 1).date()] * 4
+    assert arrays['dismissed_player_id'].tolist() == [-1, -1, -1, app.player_ids[0]]
+
+    assert arrays['_dictionaries'] == {'wicket_type': ['bowled'], 'extra_type': ['bye', 'wide']}
+    assert ColumnarStore.decode(arrays, 'extra_type').tolist() == [None, 'wide', 'bye', None]
+    assert ColumnarStore.decode(arrays, 'wicket_type').tolist() == [None, None, None, 'bowled']
+
+
+def test_load_maps_only_the_requested_columns(app, seasons, tmp_path):
+    ColumnarStore.export(str(tmp_path))
+    arrays = ColumnarStore.load(str(tmp_path), 2025, columns=['batsman_id', 'runs_scored'])
+    assert set(arrays) == {'batsman_id', 'runs_scored', '_dictionaries'}
+    assert int(arrays['runs_scored'].sum()) == 5
+
+
+def test_command_exports_one_season(app, seasons, tmp_path):
+    result = app.test_cli_runner().invoke(args=['export-columnar', '-o', str(tmp_path), '--season', '2026'])
+    assert result.output == 'season=2026: 4 balls\n'
+    assert ColumnarStore.seasons(str(tmp_path)) == [2026]
+    assert sorted(path.name for path in (tmp_path / 'season=2026').iterdir()) == sorted(
+        ['meta.json'] + [f'{name}.npy' for name in ColumnarStore.COLUMNS])
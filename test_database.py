@@ -0,0 +1,67 @@
+# test_database.py
+# SQLITE_PRAGMAS applied on every pooled SQLite connection (app/database.py).
+# Run with: python -m pytest -q test_database.py
+
+import types
+
+import pytest
+from sqlalchemy import text
+
+from app import create_app, database
+from app.config import TestingConfig
+from app.extensions import db
+
+
+def pragma(name, bind=None):
+    with db.engines[bind].connect() as connection:
+        return connection.execute(text(f'PRAGMA {name}')).scalar()
+
+
+@pytest.fixture
+def file_app(tmp_path, monkeypatch):
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f'sqlite:///{tmp_path / "cricket.db"}')
+    app = create_app('testing')
+    with app.app_context():
+        yield app
+        db.engine.dispose()
+
+
+def test_file_database_gets_the_profile(file_app):
+    assert pragma('journal_mode') == 'wal'
+    assert pragma('synchronous') == 1   # NORMAL
+    assert pragma('busy_timeout') == 5000
+    assert pragma('cache_size') == -32768
+    assert pragma('temp_store') == 2    # MEMORY
+
+
+def test_every_pooled_connection_is_tuned(file_app):
+    with db.engine.connect() as first, db.engine.connect() as second:
+        assert [c.execute(text('PRAGMA busy_timeout')).scalar() for c in (first, second)] == [5000, 5000]
+
+
+def test_memory_database_keeps_its_journal(app):
+    assert pragma('journal_mode') == 'memory'
+    assert pragma('busy_timeout') == 5000
+    assert pragma('cache_size') == -32768
+
+
+def test_empty_profile_leaves_sqlite_defaults(tmp_path, monkeypatch):
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f'sqlite:///{tmp_path / "cricket.db"}')
+    monkeypatch.setattr(TestingConfig, 'SQLITE_PRAGMAS', {})
+    with create_app('testing').app_context():
+        assert (pragma('journal_mode'), pragma('cache_size')) == ('delete', -2000)
+        db.engine.dispose()
+
+
+def test_other_dialects_are_left_alone(monkeypatch):
+    # No MySQL driver or server needed: the engine is only created, never connected
+    driver = types.ModuleType('driver')
+    driver.paramstyle = 'format'
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_BINDS', {
+        'warehouse': {'url': 'mysql+pymysql://cricket@localhost/warehouse', 'module': driver}}, raising=False)
+    hooked = []
+    monkeypatch.setattr(database, 'event', types.SimpleNamespace(
+        listen=lambda engine, name, fn: hooked.append((engine.dialect.name, name))))
+    with create_app('testing').app_context():
+        assert db.engines['warehouse'].dialect.name == 'mysql'
+    assert hooked == [('sqlite', 'connect')]
@@ -0,0 +1,74 @@
+# test_export.py
+# Ball-by-ball NDJSON export (ExportService, GET /api/v1/matches/export/balls,
+# `flask export-balls`).
+# Run with: python -m pytest -q test_export.py
+
+import gzip
+import json
+
+import pytest
+
+from app.services import BallService, ExportService, InningsService, MatchService
+
+
+@pytest.fixture
+def balls(app):
+    """Ball ids of two matches: {match_id: [ball ids]} (7 and 3 balls)."""
+    ids = app.player_ids
+    recorded = {}
+    for count in (7, 3):
+        match_id = MatchService.create_match(team_1_id=1, team_2_id=2, over_limit=20).id
+        innings_id = InningsService.start_innings(match_id, 1, 2, 1).id
+        recorded[match_id] = [
+            BallService.record_ball(innings_id=innings_id, striker_id=ids[0], non_striker_id=ids[1],
+                                    bowler_id=ids[12], runs=runs % 5).id
+            for runs in range(count)
+        ]
+    return recorded
+
+
+def lines(data: bytes):
+    assert data.endswith(b'\n')
+    return [json.loads(line) for line in data.decode().split('\n')[:-1]]
+
+
+def test_every_ball_is_one_line_across_batches(app, balls):
+    chunks = list(ExportService.ndjson(batch_size=3))
+    assert len(chunks) == 4   # 10 balls in batches of 3
+    rows = lines(b''.join(chunks))
+    assert [row['id'] for row in rows] == sorted(sum(balls.values(), []))
+    first = rows[0]
+    assert first['match_id'] == next(iter(balls))
+    assert (first['innings_number'], first['batting_team_id'], first['over_number'], first['ball_number']) == (1, 1, 0, 1)
+    assert isinstance(first['match_date'], str) and isinstance(first['created_at'], str)
+
+
+def test_endpoint_streams_ndjson(app, client, balls, monkeypatch):
+    monkeypatch.setattr(ExportService, 'BATCH_SIZE', 2)
+    response = client.get('/api/v1/matches/export/balls')
+    assert response.is_streamed
+    assert response.mimetype == 'application/x-ndjson'
+    assert response.headers['Content-Disposition'] == 'attachment; filename="balls.ndjson"'
+    assert len(lines(response.get_data())) == 10
+
+    match_id, ball_ids = list(balls.items())[1]
+    response = client.get('/api/v1/matches/export/balls', query_string={'match_id': match_id})
+    assert [row['id'] for row in lines(response.get_data())] == ball_ids
+
+
+def test_gzip_is_one_valid_stream(app, client, balls, monkeypatch):
+    monkeypatch.setattr(ExportService, 'BATCH_SIZE', 2)
+    plain = client.get('/api/v1/matches/export/balls').get_data()
+    response = client.get('/api/v1/matches/export/balls', query_string={'gzip': 1})
+    assert response.mimetype == 'application/gzip'
+    assert response.headers['Content-Disposition'] == 'attachment; filename="balls.ndjson.gz"'
+    data = response.get_data()
+    assert data[:2] == b'\x1f\x8b'
+    assert gzip.decompress(data) == plain
+
+
+def test_command_writes_the_same_stream(app, balls, tmp_path):
+    plain = b''.join(ExportService.ndjson())
+    result = app.test_cli_runner().invoke(args=['export-balls', '--gzip', '-o', str(tmp_path / 'balls.ndjson.gz')])
+    assert result.exit_code == 0, result.output
+    assert gzip.decompress((tmp_path / 'balls.ndjson.gz').read_bytes()) == plain
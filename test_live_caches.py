@@ -0,0 +1,112 @@
+# test_live_caches.py
+# Per-match state a socket worker keeps in memory (join snapshots, frame
+# scheduling, compact deltas) and when it is dropped.
+# Run with: python -m pytest -q test_live_caches.py
+
+import msgpack
+import pytest
+
+from app.extensions import socketio
+from app.middleware.query_counter import count_queries
+from app.services import MatchService
+from app.websockets import compact
+from app.websockets.match_socket import emit_innings_complete, emit_match_status_change
+from app.websockets.snapshots import MatchSnapshots
+
+
+@pytest.fixture
+def match_id(app, client):
+    match_id = MatchService.create_match(team_1_id=1, team_2_id=2, over_limit=20).id
+    innings_id = client.post('/api/v1/balls/innings/start', json={
+        'match_id': match_id, 'batting_team_id': 1, 'bowling_team_id': 2, 'inning_number': 1,
+    }).json['innings']['id']
+    ids = app.player_ids
+    client.post('/api/v1/balls/record', json={
+        'innings_id': innings_id, 'striker_id': ids[0], 'non_striker_id': ids[1], 'bowler_id': ids[12], 'runs': 4,
+    })
+    socketio.test_client(app).emit('join_match', {'match_id': match_id})   # warm snapshot and feed
+    return match_id
+
+
+def record(app, client, match_id, runs=1):
+    innings_id = MatchService.get_match_summary(match_id)['innings'][0]['id']
+    ids = app.player_ids
+    client.post('/api/v1/balls/record', json={
+        'innings_id': innings_id, 'striker_id': ids[0], 'non_striker_id': ids[1], 'bowler_id': ids[12], 'runs': runs,
+    })
+
+
+def compact_viewer(app, match_id):
+    viewer = socketio.test_client(app, auth={'protocol': compact.PROTOCOL})
+    viewer.emit('join_match', {'match_id': match_id})
+    viewer.get_received()
+    return viewer
+
+
+def frames(viewer):
+    """match_update frames received since the last call, decoded."""
+    return [msgpack.unpackb(p['args'][0]) for p in viewer.get_received() if p['name'] == 'match_update']
+
+
+def score(frame):
+    [data] = [data for event, data in frame['events'] if event == 'score_update']
+    return data
+
+
+def is_held(match_id):
+    """Whether the worker still serves this match from memory (feed warm, no queries)."""
+    with count_queries() as stats:
+        snapshot = MatchSnapshots.get(match_id)
+    assert snapshot['match_id'] == match_id
+    return MatchSnapshots.since(match_id, 0) is not None and stats.count == 0
+
+
+def test_finished_match_is_dropped(app, match_id):
+    assert is_held(match_id)
+    emit_match_status_change(socketio, match_id, 'completed', 'Mumbai Indians won by 4 runs')
+    assert MatchSnapshots.since(match_id, 0) is None
+    assert not is_held(match_id)   # the next join rebuilds it
+
+
+def test_match_is_kept_until_its_last_innings_ends(app, match_id):
+    emit_innings_complete(socketio, match_id, 1, {'runs': 4, 'wickets': 0, 'overs': 0.1})
+    assert MatchSnapshots.since(match_id, 0) is not None
+    emit_innings_complete(socketio, match_id, 2, {'runs': 3, 'wickets': 0, 'overs': 0.1})
+    assert MatchSnapshots.since(match_id, 0) is None
+
+
+def test_finished_match_restarts_compact_sequence_and_base(app, client, match_id):
+    viewer = compact_viewer(app, match_id)
+    record(app, client, match_id)
+    record(app, client, match_id)
+    assert [(frame['seq'], 'base' in score(frame)) for frame in frames(viewer)] == [(1, False), (2, True)]
+
+    emit_match_status_change(socketio, match_id, 'abandoned')
+    assert [frame['seq'] for frame in frames(viewer)] == [3]
+    emit_match_status_change(socketio, match_id, 'live')   # corrected by hand
+    record(app, client, match_id)
+    status, ball = frames(viewer)
+    assert (status['seq'], ball['seq']) == (1, 2)
+    assert 'base' not in score(ball)   # a full score: the old base went with the match
+
+
+def test_finished_match_leaves_no_frame_schedule(app, match_id):
+    viewer = socketio.test_client(app)
+    viewer.emit('join_match', {'match_id': match_id})
+    emit_innings_complete(socketio, match_id, 2, {'runs': 3, 'wickets': 0, 'overs': 0.1})
+    viewer.get_received()
+
+    # A frame just went out, yet the next one is not held back for the interval
+    app.config['MATCH_EMIT_INTERVAL'] = 60
+    emit_match_status_change(socketio, match_id, 'live')
+    [packet] = [p for p in viewer.get_received() if p['name'] == 'match_update']
+    assert packet['args'][0]['events'][0]['event'] == 'match_status'
+
+
+def test_compact_frames_are_only_encoded_for_compact_viewers(app, client, match_id):
+    record(app, client, match_id)   # JSON viewers only so far
+    viewer = compact_viewer(app, match_id)
+    record(app, client, match_id)
+    [frame] = frames(viewer)
+    assert frame['seq'] == 1
+    assert 'base' not in score(frame)   # first score in full: earlier ones went nowhere
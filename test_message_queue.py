@@ -0,0 +1,117 @@
+# test_message_queue.py
+# Two workers on the in-process queue (SOCKETIO_MESSAGE_QUEUE = memory://,
+# app/websockets/message_queue.py): an emit on one reaches the rooms of the
+# other, and the other's join snapshot and ticker follow it.
+# Run with: python -m pytest -q test_message_queue.py
+
+import copy
+
+import eventlet
+import pytest
+
+from app import create_app
+from app.config import TestingConfig, config
+from app.extensions import db, socketio
+from app.middleware.query_counter import assert_max_queries
+from app.models import Inning, Player, Team
+from app.services import BallService, InningsService, MatchService
+from app.websockets.live_matches import LiveMatches, TICKER_ROOM
+from app.websockets.match_socket import coalesce, emit_ball_update, emit_score_update
+from app.websockets.snapshots import MatchSnapshots
+
+
+class Worker:
+    """One app and its Socket.IO server. The SocketIO extension is shared,
+    so each worker keeps a copy bound to its own server."""
+
+    def __init__(self, config_name):
+        self.app = create_app(config_name)
+        self.socketio = copy.copy(socketio)
+        self.server = self.socketio.server
+        self.server.manager.initialize()
+        self.sent = []   # (eio_sid, event, data) sent to this worker's viewers
+
+    def record(self, eio_sid, eio_packet):
+        packet = self.server.packet_class(encoded_packet=eio_packet.data)
+        self.sent.append((eio_sid, *packet.data))
+
+    def viewer(self, room):
+        eio_sid = f'viewer-{len(self.server.manager.rooms.get("/", {}).get(room, {}))}-{room}'
+        sid = self.server.manager.connect(eio_sid, '/')
+        self.server.manager.enter_room(sid, '/', room, eio_sid=eio_sid)
+        return eio_sid
+
+    def received(self, eio_sid, event):
+        return [data for sid, name, data in self.sent if sid == eio_sid and name == event]
+
+
+@pytest.fixture
+def workers(tmp_path, monkeypatch):
+    config['testing_queue'] = type('QueueTestingConfig', (TestingConfig,), {
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'cricket.db'}",   # shared by both
+        'SOCKETIO_MESSAGE_QUEUE': 'memory://',
+        'SOCKETIO_CHANNEL': f'cricket-live-{tmp_path.name}',
+    })
+    scorer, other = Worker('testing_queue'), Worker('testing_queue')
+    for worker in (scorer, other):
+        # No engine.io sockets behind the fake viewers: record what would be sent
+        monkeypatch.setattr(worker.server, '_send_eio_packet', worker.record)
+    with scorer.app.app_context():
+        db.create_all()
+        db.session.add_all([Team(name='Mumbai Indians', short_name='MI'), Team(name='Chennai Super Kings', short_name='CSK')])
+        db.session.add_all([Player(name=f'Player {i}', jersey_number=i, role='batsman', team_id=1 if i < 11 else 2)
+                            for i in range(22)])
+        db.session.commit()
+        match_id = MatchService.create_match(team_1_id=1, team_2_id=2, over_limit=20).id
+        innings_id = InningsService.start_innings(match_id, 1, 2, 1).id
+    yield scorer, other, match_id, innings_id
+    with scorer.app.app_context():
+        db.session.remove()
+    config.pop('testing_queue')
+
+
+def score_ball(worker, innings_id, runs):
+    """What POST /balls/record does, on `worker`."""
+    with worker.app.app_context():
+        ball = BallService.record_ball(innings_id=innings_id, striker_id=1, non_striker_id=2, bowler_id=13, runs=runs)
+        inning = db.session.get(Inning, innings_id)
+        with coalesce(worker.socketio, inning.match_id):
+            emit_ball_update(worker.socketio, inning.match_id, ball)
+            emit_score_update(worker.socketio, inning.match_id, inning)
+        return ball.id
+
+
+def test_emit_reaches_the_rooms_of_another_worker(workers):
+    scorer, other, match_id, innings_id = workers
+    fan = other.viewer(f'match_{match_id}')
+    ticker = other.viewer(TICKER_ROOM)
+    with other.app.app_context():
+        LiveMatches.lines()
+
+    ball_id = score_ball(scorer, innings_id, 4)
+    eventlet.sleep(0.1)   # let the listener deliver
+
+    [frame] = other.received(fan, 'match_update')
+    assert [item['event'] for item in frame['events']] == ['ball_update', 'score_update']
+    assert frame['events'][0]['data']['id'] == ball_id
+    [line] = other.received(ticker, 'ticker_update')
+    assert (line['match_id'], line['runs'], line['overs']) == (match_id, 4, 0.1)
+
+
+def test_remote_emit_updates_the_other_workers_caches(workers):
+    scorer, other, match_id, innings_id = workers
+    with other.app.app_context():
+        MatchSnapshots.get(match_id)   # warm: header and feed cached before the ball
+        LiveMatches.lines()
+
+    ball_id = score_ball(scorer, innings_id, 6)
+    eventlet.sleep(0.1)
+
+    with other.app.app_context():
+        with assert_max_queries(0, 'join snapshot after a remote ball'):
+            snapshot = MatchSnapshots.get(match_id)
+            lines = LiveMatches.lines()
+    assert snapshot['recent_balls'][-1]['id'] == ball_id
+    assert snapshot['current_innings']['total_runs'] == 6
+    [line] = lines
+    assert (line['runs'], line['overs']) == (6, 0.1)
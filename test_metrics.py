@@ -0,0 +1,88 @@
+# test_metrics.py
+# The process-local Prometheus registry (app/metrics.py) and its scrape
+# endpoint, GET /metrics.
+# Run with: python -m pytest -q test_metrics.py
+
+import pytest
+
+from app import metrics
+from app.metrics import Counter, Histogram
+from app.services import BallService, InningsService, MatchService
+
+
+@pytest.fixture
+def scratch():
+    """Metrics registered by the test, dropped from the registry afterwards."""
+    created = []
+
+    def make(kind, *args, **kwargs):
+        created.append(kind(*args, **kwargs))
+        return created[-1]
+
+    yield make
+    for metric in created:
+        metrics._registry.remove(metric)
+
+
+def scrape(client):
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == 'text/plain; version=0.0.4; charset=utf-8'
+    text = response.get_data(as_text=True)
+    assert text.endswith('\n')
+    return text.splitlines()
+
+
+def sample(lines, name):
+    [value] = [line.rsplit(' ', 1)[1] for line in lines if line.rsplit(' ', 1)[0] == name]
+    return float(value)
+
+
+def test_counter_family_has_help_type_and_total(client, scratch):
+    counter = scratch(Counter, 'test_events', 'Events seen')
+    lines = scrape(client)
+    family = lines.index('# HELP test_events_total Events seen')
+    assert lines[family + 1:family + 3] == ['# TYPE test_events_total counter', 'test_events_total 0']
+
+    counter.inc()
+    counter.inc(2.5)
+    assert sample(scrape(client), 'test_events_total') == 3.5
+
+
+def test_label_values_are_escaped(client, scratch):
+    counter = scratch(Counter, 'test_labelled', 'Labelled events', ('path', 'note'))
+    counter.labels('C:\\tmp', 'say "hi"\nbye').inc()
+    assert r'test_labelled_total{path="C:\\tmp",note="say \"hi\"\nbye"} 1' in scrape(client)
+
+
+def test_histogram_buckets_are_cumulative(client, scratch):
+    histogram = scratch(Histogram, 'test_seconds', 'Durations', buckets=(0.1, 1, 5))
+    for value in (0.05, 0.1, 0.7, 3, 9):
+        histogram.observe(value)
+    lines = scrape(client)
+    family = lines.index('# HELP test_seconds Durations')
+    assert lines[family + 1:family + 8] == [
+        '# TYPE test_seconds histogram',
+        'test_seconds_bucket{le="0.1"} 2',   # le is inclusive
+        'test_seconds_bucket{le="1"} 3',
+        'test_seconds_bucket{le="5"} 4',
+        'test_seconds_bucket{le="+Inf"} 5',
+        'test_seconds_sum 12.85',
+        'test_seconds_count 5',
+    ]
+
+
+def test_recorded_ball_moves_deliveries_and_latency(app, client):
+    match_id = MatchService.create_match(team_1_id=1, team_2_id=2, over_limit=20).id
+    innings_id = InningsService.start_innings(match_id, 1, 2, 1).id
+    ids = app.player_ids
+    before = scrape(client)
+
+    BallService.record_balls(innings_id, [
+        dict(striker_id=ids[0], non_striker_id=ids[1], bowler_id=ids[12], runs=runs) for runs in (1, 4)])
+    after = scrape(client)
+    assert sample(after, 'cricket_deliveries_total') - sample(before, 'cricket_deliveries_total') == 2
+    count = 'cricket_ball_record_seconds_count'
+    assert sample(after, count) - sample(before, count) == 1
+    assert sample(after, 'cricket_ball_record_seconds_sum') > sample(before, 'cricket_ball_record_seconds_sum')
+    assert sample(after, 'cricket_ball_record_seconds_bucket{le="+Inf"}') == sample(after, count)
@@ -0,0 +1,102 @@
+# test_pagination.py
+# Keyset pages and filters of the list endpoints (KeysetPaginator,
+# GET /api/v1/matches, /teams, /players).
+# Run with: python -m pytest -q test_pagination.py
+
+from datetime import datetime
+
+import pytest
+
+from app.extensions import db
+from app.models import Team
+from app.services import KeysetPaginator, MatchService
+
+
+def pages(client, url, key, **params):
+    """Every page of `url` in order, following next_cursor."""
+    result, cursor = [], None
+    while True:
+        response = client.get(url, query_string=dict(params, **({'cursor': cursor} if cursor else {})))
+        assert response.status_code == 200
+        result.append([row['id'] for row in response.json[key]])
+        cursor = response.json['next_cursor']
+        if cursor is None:
+            return result
+
+
+@pytest.fixture
+def matches(app):
+    """Match ids by (team, day, status); team 3 only plays match 'away'."""
+    db.session.add(Team(name='Delhi Capitals', short_name='DC'))
+    db.session.commit()
+    created = {}
+    for name, team_2_id, day, hour, status in [
+        ('first', 2, 1, 10, 'completed'), ('second', 2, 2, 10, 'completed'), ('evening', 2, 2, 18, 'live'),
+        ('away', 3, 3, 10, 'scheduled'), ('last', 2, 4, 10, 'scheduled'),
+    ]:
+        match = MatchService.create_match(team_1_id=1, team_2_id=team_2_id, over_limit=20,
+                                          match_date=datetime(2026, 3, day, hour))
+        match.status = status
+        created[name] = match.id
+    db.session.commit()
+    return created
+
+
+def test_matches_page_newest_first(client, matches):
+    expected = [matches[name] for name in ('last', 'away', 'evening', 'second', 'first')]
+    assert pages(client, '/api/v1/matches', 'matches', limit=2) == [expected[:2], expected[2:4], expected[4:]]
+
+
+def test_teams_and_players_page_by_name(app, client):
+    teams = pages(client, '/api/v1/teams', 'teams', limit=1)
+    assert [len(page) for page in teams] == [1, 1]
+    assert [team['name'] for team in client.get('/api/v1/teams').json['teams']] == [
+        'Chennai Super Kings', 'Mumbai Indians']
+
+    players = sum(pages(client, '/api/v1/players', 'players', limit=5), [])
+    assert players == [app.player_ids[i] for i in sorted(range(22), key=lambda i: f'Player {i}')]
+
+
+def test_last_page_has_no_cursor(client, matches):
+    response = client.get('/api/v1/matches', query_string={'limit': 5})
+    assert (response.json['count'], response.json['next_cursor']) == (5, None)
+
+
+def test_limit_is_clamped(app, client):
+    app.config['ITEMS_PER_PAGE'] = 10
+    assert client.get('/api/v1/players', query_string={'limit': 500}).json['count'] == 10
+    assert client.get('/api/v1/players', query_string={'limit': 0}).json['count'] == 1
+    assert KeysetPaginator.limit() == 10
+
+
+@pytest.mark.parametrize('params, error', [
+    ({'cursor': 'not-a-cursor'}, 'Invalid cursor'),
+    ({'cursor': KeysetPaginator.encode_cursor(['Player 3', 4])}, 'Invalid cursor'),   # a players cursor
+    ({'cursor': KeysetPaginator.encode_cursor([1])}, 'Invalid cursor'),
+    ({'date_from': 'yesterday'}, 'date_from must be an ISO date or datetime'),
+    ({'date_to': '2026-13-01'}, 'date_to must be an ISO date or datetime'),
+])
+def test_bad_cursor_or_date_is_a_400(client, matches, params, error):
+    response = client.get('/api/v1/matches', query_string=params)
+    assert (response.status_code, response.json['error']) == (400, error)
+
+
+@pytest.mark.parametrize('params, expected', [
+    ({'status': 'completed'}, ['second', 'first']),
+    ({'status': 'live'}, ['evening']),
+    ({'team_id': 3}, ['away']),
+    ({'team_id': 2, 'status': 'scheduled'}, ['last']),
+    ({'date_from': '2026-03-03'}, ['last', 'away']),
+    ({'date_to': '2026-03-02'}, ['evening', 'second', 'first']),   # a bare date includes that day
+    ({'date_to': '2026-03-02T18:00:00'}, ['second', 'first']),    # a datetime is exclusive
+    ({'date_from': '2026-03-02', 'date_to': '2026-03-03'}, ['away', 'evening', 'second']),
+])
+def test_match_filters(client, matches, params, expected):
+    response = client.get('/api/v1/matches', query_string=params)
+    assert [match['id'] for match in response.json['matches']] == [matches[name] for name in expected]
+    assert response.json['next_cursor'] is None
+
+
+def test_filters_apply_to_every_page(client, matches):
+    assert pages(client, '/api/v1/matches', 'matches', limit=1, team_id=2, date_to='2026-03-02') == [
+        [matches['evening']], [matches['second']], [matches['first']]]
@@ -0,0 +1,97 @@
+# test_query_budget.py
+# Query budgets of the hot paths (app/middleware/query_counter.py).
+# A budget going up means a new query per ball/viewer/page view: find out
+# why before raising it.
+# Run with: python -m pytest -q test_query_budget.py
+
+import pytest
+
+from app.extensions import db, socketio
+from app.middleware.query_counter import assert_max_queries, count_queries
+from app.services import BallService, MatchService
+
+
+@pytest.fixture
+def innings(app, client):
+    match_id = MatchService.create_match(team_1_id=1, team_2_id=2, over_limit=20).id
+    innings_id = client.post('/api/v1/balls/innings/start', json={
+        'match_id': match_id, 'batting_team_id': 1, 'bowling_team_id': 2, 'inning_number': 1,
+    }).json['innings']['id']
+    return match_id, innings_id
+
+
+def record_ball(app, innings_id, runs=1):
+    ids = app.player_ids
+    return BallService.record_ball(innings_id=innings_id, striker_id=ids[0], non_striker_id=ids[1],
+                                   bowler_id=ids[12], runs=runs)
+
+
+def test_record_ball_budget(app, innings):
+    _, innings_id = innings
+    # + one ball-log aggregate per player without a career row (once per player, ever)
+    with assert_max_queries(12, 'first ball'):
+        record_ball(app, innings_id)
+    for runs in range(12):
+        with assert_max_queries(8, 'ball'):
+            record_ball(app, innings_id, runs % 5)
+
+
+def test_record_ball_cost_does_not_grow_with_innings(app, innings):
+    _, innings_id = innings
+    record_ball(app, innings_id)
+    with count_queries() as early:
+        record_ball(app, innings_id)
+    for _ in range(60):
+        record_ball(app, innings_id)
+    with count_queries() as late:
+        record_ball(app, innings_id)
+    assert late.count == early.count
+
+
+def test_join_match_budget(app, innings):
+    match_id, innings_id = innings
+    record_ball(app, innings_id, 4)
+    first = socketio.test_client(app)
+    with assert_max_queries(3, 'join_match (cold)'):
+        first.emit('join_match', {'match_id': match_id})
+    second = socketio.test_client(app)
+    with assert_max_queries(0, 'join_match (snapshot cached)'):
+        second.emit('join_match', {'match_id': match_id})
+
+
+@pytest.mark.parametrize('path, budget', [
+    ('/', 4),
+    ('/teams', 1),
+    ('/players', 1),
+    ('/matches', 1),
+    ('/match/{match_id}', 5),
+])
+def test_page_budget(app, client, innings, path, budget):
+    match_id, innings_id = innings
+    record_ball(app, innings_id)
+    with assert_max_queries(budget, path):
+        response = client.get(path.format(match_id=match_id))
+    assert response.status_code == 200
+
+
+def test_requests_report_their_queries(app, client, innings):
+    response = client.get('/teams')
+    assert response.headers['Server-Timing'].startswith('db;dur=')
+    assert 'desc="1 queries"' in response.headers['Server-Timing']
+
+
+def test_request_over_threshold_is_logged(app, client, caplog):
+    app.config['QUERY_COUNT_WARN'] = 1
+    client.get('/teams')
+    assert not caplog.records
+    client.get('/')
+    [record] = caplog.records
+    assert record.getMessage().startswith('GET pages.home: more than 1 queries. 4 queries')
+
+
+def test_fingerprint_groups_repeated_statements(app):
+    with count_queries() as stats:
+        for i in range(3):
+            db.session.execute(db.text(f"SELECT id FROM player WHERE id IN ({', '.join(['1'] * (i + 1))})"))
+    assert stats.count == 3
+    assert stats.most_repeated() == ('SELECT id FROM player WHERE id IN (?)', 3)
@@ -0,0 +1,80 @@
+# test_resume.py
+# Reconnect backfill: join_match with last_ball_id gets match_resumed with
+# only the missed deliveries, or match_joined when the in-memory feed can't
+# prove it holds all of them (MatchSnapshots.since).
+# Run with: python -m pytest -q test_resume.py
+
+import pytest
+
+from app.extensions import socketio
+from app.services import MatchService
+from app.websockets.snapshots import MatchSnapshots
+
+
+@pytest.fixture
+def live(app, client):
+    """A live match on a feed of 5 deliveries; ball(runs) scores one and returns its id."""
+    app.config['LIVE_FEED_SIZE'] = 5
+    match_id = MatchService.create_match(team_1_id=1, team_2_id=2, over_limit=20).id
+    innings_id = client.post('/api/v1/balls/innings/start', json={
+        'match_id': match_id, 'batting_team_id': 1, 'bowling_team_id': 2, 'inning_number': 1,
+    }).json['innings']['id']
+    ids = app.player_ids
+
+    def ball(runs=1):
+        return client.post('/api/v1/balls/record', json={
+            'innings_id': innings_id, 'striker_id': ids[0], 'non_striker_id': ids[1], 'bowler_id': ids[12],
+            'runs': runs,
+        }).json['ball']['id']
+
+    return match_id, ball
+
+
+def rejoin(app, match_id, last_ball_id):
+    viewer = socketio.test_client(app)
+    viewer.emit('join_match', {'match_id': match_id, 'last_ball_id': last_ball_id})
+    [packet] = [p for p in viewer.get_received() if p['name'] in ('match_joined', 'match_resumed')]
+    return packet['name'], packet['args'][0]
+
+
+def test_gap_within_the_feed_sends_only_the_missed_balls(app, live):
+    match_id, ball = live
+    MatchSnapshots.get(match_id)   # warm feed, filled by the emits below
+    ball_ids = [ball(runs) for runs in (1, 2, 3)]
+
+    name, payload = rejoin(app, match_id, ball_ids[0])
+    assert name == 'match_resumed'
+    assert [b['id'] for b in payload['missed_balls']] == ball_ids[1:]
+    assert payload['current_innings']['total_runs'] == 6
+
+    name, payload = rejoin(app, match_id, ball_ids[-1])
+    assert (name, payload['missed_balls']) == ('match_resumed', [])
+
+
+def test_gap_older_than_a_full_feed_gets_the_snapshot(app, live):
+    match_id, ball = live
+    MatchSnapshots.get(match_id)
+    ball_ids = [ball() for _ in range(8)]   # the feed keeps the last 5
+
+    name, payload = rejoin(app, match_id, ball_ids[1])
+    assert name == 'match_joined'
+    assert [b['id'] for b in payload['recent_balls']] == ball_ids[3:]
+    # The client holds the oldest ball still in the feed: nothing can be missing
+    name, payload = rejoin(app, match_id, ball_ids[3])
+    assert (name, [b['id'] for b in payload['missed_balls']]) == ('match_resumed', ball_ids[4:])
+
+
+def test_cold_feed_is_read_before_resuming(app, live):
+    match_id, ball = live
+    ball_ids = [ball() for _ in range(3)]
+    app.extensions.pop('match_snapshots', None)   # worker restart
+    assert MatchSnapshots.since(match_id, ball_ids[0]) is None
+
+    name, payload = rejoin(app, match_id, ball_ids[0])
+    assert (name, [b['id'] for b in payload['missed_balls']]) == ('match_resumed', ball_ids[1:])
+
+
+def test_last_ball_id_must_be_an_int(app, live):
+    match_id, ball = live
+    ball_id = ball()
+    assert rejoin(app, match_id, str(ball_id))[0] == 'match_joined'
@@ -0,0 +1,96 @@
+# test_slow_viewers.py
+# Room frames held back from viewers whose socket queue is full, and the
+# catch-up once it drains (app/websockets/match_socket.py, SLOW CONSUMERS).
+# Run with: python -m pytest -q test_slow_viewers.py
+
+import pytest
+
+from app.extensions import socketio
+from app.services import MatchService
+from app.websockets import match_socket
+
+
+@pytest.fixture
+def live(app, client, monkeypatch):
+    """A live match with a fast and a slow viewer; `lagging` holds the eio sids whose queue is full."""
+    match_id = MatchService.create_match(team_1_id=1, team_2_id=2, over_limit=20).id
+    innings_id = client.post('/api/v1/balls/innings/start', json={
+        'match_id': match_id, 'batting_team_id': 1, 'bowling_team_id': 2, 'inning_number': 1,
+    }).json['innings']['id']
+    match_socket._forget_match(match_id)   # ids restart with each test database
+    fast, slow = socketio.test_client(app), socketio.test_client(app)
+    for viewer in (fast, slow):
+        viewer.emit('join_match', {'match_id': match_id})
+        viewer.get_received()
+
+    lagging, checked = {slow.eio_sid}, []
+
+    def queue_depth(server, eio_sid):
+        checked.append(eio_sid)
+        return 100 if eio_sid in lagging else 0
+
+    monkeypatch.setattr(match_socket, '_queue_depth', queue_depth)
+    ids = app.player_ids
+
+    def ball(runs=1):
+        checked.clear()
+        client.post('/api/v1/balls/record', json={
+            'innings_id': innings_id, 'striker_id': ids[0], 'non_striker_id': ids[1], 'bowler_id': ids[12],
+            'runs': runs,
+        })
+
+    yield type('Live', (), dict(fast=fast, slow=slow, lagging=lagging, checked=checked, ball=staticmethod(ball)))
+    for viewer in (fast, slow):
+        viewer.disconnect()
+    match_socket._forget_match(match_id)
+
+
+def frames(viewer):
+    return [packet for packet in viewer.get_received() if packet['name'] == 'match_update']
+
+
+def runs_of(frame):
+    return [item['data']['runs_scored'] for item in frame['args'][0]['events'] if item['event'] == 'ball_update']
+
+
+def test_slow_viewer_is_caught_up_once_it_drains(app, live):
+    for runs in (1, 2, 3):
+        live.ball(runs)
+    assert len(frames(live.fast)) == 3 and frames(live.slow) == []
+
+    live.lagging.clear()
+    live.ball(4)
+    backlog, frame = frames(live.slow)
+    assert runs_of(backlog) == [1, 2, 3] and runs_of(frame) == [4]
+
+
+def test_overflowing_backlog_is_replaced_by_a_snapshot(app, live):
+    app.config['WS_CLIENT_BACKLOG_LIMIT'] = 2
+    for runs in (1, 2, 3):
+        live.ball(runs)
+    live.lagging.clear()
+    live.ball(4)
+    assert [packet['name'] for packet in live.slow.get_received()] == ['match_joined', 'match_update']
+
+
+def test_frames_between_scans_only_check_known_slow_viewers(app, live):
+    app.config['WS_SLOW_SCAN_INTERVAL'] = 3600
+    live.ball()
+    assert set(live.checked) == {live.fast.eio_sid, live.slow.eio_sid}   # first frame: the whole room
+
+    live.ball()
+    assert live.checked == [live.slow.eio_sid]
+    live.lagging.add(live.fast.eio_sid)   # not noticed until the next scan
+    live.ball()
+    assert len(frames(live.fast)) == 3
+
+
+def test_stats_count_every_connection(app, live):
+    live.ball()
+    stats = match_socket.live_socket_stats(socketio.server)
+    assert stats['connections'] == 2 and stats['queue_depth_max'] == 100
+    assert stats['slow_viewers'] == 1 and stats['frames_held_back'] >= 1
+
+
+def test_queue_depth_without_engineio_internals_is_zero(app):
+    assert match_socket._queue_depth(object(), 'eio-sid') == 0